@@ -1,5 +1,6 @@
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
+import hmac
 import sqlite3
 import os
 from datetime import datetime, timedelta
@@ -8,30 +9,192 @@ import sys
 # Adicionar diretório pai ao path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from config import API_CONFIG, CACHE_CONFIG, ETL_CONFIG, MONITORING_CONFIG, SECURITY_CONFIG
+from api.cache_respostas import CacheRespostas
+from api.coalescencia import CoalescedorRequisicoes
+from api.compressao import CompressorRespostas, EstaticosComprimidos
+from api.exportacao import FORMATOS as FORMATOS_EXPORTACAO, resposta_exportacao
+from api.limite_requisicoes import LimitadorRequisicoes, LimiteConcorrencia, resposta_limite_taxa
+from api.metricas import TIPO_CONTEUDO as TIPO_CONTEUDO_METRICAS, RegistroMetricas, instrumentar_db
+from api.saude import VerificadorSaude
+from api.versao_dados import VersaoDados
+from api.stream_eventos import StreamEventos
+from etl.barramento_eventos import barramento
 from etl.database_manager import DatabaseManager
+from etl.categorizador import CategorizadorEventos
+from etl.categorizacao_proposicoes import CategorizadorProposicoes
 from etl.sample_data import get_sample_statistics
 
 app = Flask(__name__, static_folder='../web', static_url_path='')
 CORS(app)
 
+# Métricas de /api/metrics, registradas antes da compressão para que a latência a inclua
+metricas = RegistroMetricas() if MONITORING_CONFIG['metrics_enabled'] else None
+if metricas is not None:
+    metricas.instrumentar_app(app)
+
+# web/ comprimido uma vez na inicialização; respostas JSON comprimidas acima do limiar
+estaticos = EstaticosComprimidos(app.static_folder, max_age=API_CONFIG['static_max_age'],
+                                 limiar=API_CONFIG['compressao_limiar'])
+estaticos.precomprimir()
+app.view_functions['static'] = estaticos.servir
+app.after_request(CompressorRespostas(limiar=API_CONFIG['compressao_limiar']).aplicar)
+
 # Inicializar gerenciador de banco
 db_manager = DatabaseManager()
 
+# Modelo de palavras-chave residente, compartilhado pelas requisições
+categorizador = CategorizadorEventos(db_manager)
+categorizador_proposicoes = CategorizadorProposicoes(db_manager, categorizador)
+
+# Versão dos dados (contadores de alteração mantidos por triggers): ETags e cache
+versao_dados = VersaoDados(db_manager.db_path)
+
+# Cache de respostas GET, invalidado pelos contadores de alteração das tabelas
+cache_respostas = CacheRespostas(
+    versao_dados.versoes,
+    max_size=CACHE_CONFIG['max_size'],
+    ttl=CACHE_CONFIG['ttl'],
+    enabled=CACHE_CONFIG['enabled']
+)
+
+# Falhas de cache simultâneas das agregações: uma execução, resposta compartilhada
+coalescedor = CoalescedorRequisicoes(versao_dados.versoes)
+
+# Alterações de eventos para os clientes de /api/eventos/stream
+stream_eventos = StreamEventos(db_manager, versao_dados.versoes, barramento,
+                               intervalo=API_CONFIG['stream_intervalo'],
+                               keepalive=API_CONFIG['stream_keepalive'])
+
+# Saúde do banco e do ETL para /api/health, recalculada no máximo a cada health_cache_ttl segundos
+verificador_saude = VerificadorSaude(
+    db_manager,
+    intervalo_etl=ETL_CONFIG['update_interval'],
+    ttl=MONITORING_CONFIG['health_cache_ttl'],
+    intervalo_integridade=MONITORING_CONFIG['health_check_interval'],
+    latencia_max_ms=MONITORING_CONFIG['health_latencia_max_ms'],
+    wal_max_bytes=MONITORING_CONFIG['health_wal_max_mb'] * 1024 * 1024,
+    bloqueios_max=MONITORING_CONFIG['health_bloqueios_max'],
+    janela_bloqueios=MONITORING_CONFIG['health_check_interval']
+)
+
+# Limite de taxa por cliente e de execuções simultâneas das rotas pesadas
+limitador = LimitadorRequisicoes(
+    SECURITY_CONFIG['rate_limit']['requests_per_minute'],
+    SECURITY_CONFIG['rate_limit']['burst']
+) if SECURITY_CONFIG['rate_limit']['enabled'] else None
+limite_pesadas = LimiteConcorrencia(SECURITY_CONFIG['max_concorrentes_pesadas'])
+
+# Rotas /api sem chave nem limite de taxa (verificações de monitoramento)
+ROTAS_LIVRES = ('/api/health', '/api/metrics')
+
+def coletar_metricas_aplicacao():
+    """Cache, coalescência, limites, stream e ETL, lidos a cada coleta de /api/metrics"""
+    cache = cache_respostas.estatisticas()
+    yield ('cache_respostas_consultas_total', 'counter', 'Consultas ao cache de respostas por resultado',
+           [({'resultado': 'acerto'}, cache['acertos']), ({'resultado': 'falha'}, cache['falhas'])])
+    yield ('cache_respostas_remocoes_total', 'counter', 'Entradas removidas do cache de respostas por motivo',
+           [({'motivo': 'despejo'}, cache['despejos']), ({'motivo': 'expiracao'}, cache['expiracoes']),
+            ({'motivo': 'invalidacao'}, cache['invalidacoes'])])
+    yield ('cache_respostas_entradas', 'gauge', 'Entradas no cache de respostas', [({}, cache['tamanho'])])
+    if cache['taxa_acertos'] is not None:
+        yield ('cache_respostas_taxa_acertos', 'gauge', 'Acertos / consultas do cache de respostas',
+               [({}, cache['taxa_acertos'])])
+    
+    consultas = categorizador.cache_acertos + categorizador.cache_falhas
+    yield ('cache_categorizacao_consultas_total', 'counter', 'Consultas ao cache de categorização por resultado',
+           [({'resultado': 'acerto'}, categorizador.cache_acertos),
+            ({'resultado': 'falha'}, categorizador.cache_falhas)])
+    if consultas:
+        yield ('cache_categorizacao_taxa_acertos', 'gauge', 'Acertos / consultas do cache de categorização',
+               [({}, round(categorizador.cache_acertos / consultas, 4))])
+    
+    coalescencia = coalescedor.estatisticas()
+    yield ('coalescencia_requisicoes_total', 'counter', 'Requisições de agregações executadas ou coalescidas',
+           [({'tipo': 'execucao'}, coalescencia['execucoes']), ({'tipo': 'coalescida'}, coalescencia['coalescidas'])])
+    if limitador is not None:
+        limite = limitador.estatisticas()
+        yield ('limite_taxa_requisicoes_total', 'counter', 'Requisições permitidas ou rejeitadas (429) pelo limite de taxa',
+               [({'resultado': 'permitida'}, limite['permitidas']), ({'resultado': 'rejeitada'}, limite['rejeitadas'])])
+    pesadas = limite_pesadas.estatisticas()
+    yield ('rotas_pesadas_em_execucao', 'gauge', 'Rotas pesadas em execução', [({}, pesadas['em_execucao'])])
+    yield ('rotas_pesadas_rejeitadas_total', 'counter', 'Rotas pesadas rejeitadas (503) pelo limite de concorrência',
+           [({}, pesadas['rejeitadas'])])
+    yield ('stream_clientes_conectados', 'gauge', 'Clientes conectados a /api/eventos/stream',
+           [({}, barramento.assinantes)])
+    
+    yield ('db_falhas_bloqueio_total', 'counter', 'Falhas por banco ocupado/travado (SQLITE_BUSY / SQLITE_LOCKED)',
+           [({}, db_manager.falhas_bloqueio_total)])
+    
+    ultima = db_manager.get_ultima_atualizacao()
+    if ultima is not None:
+        yield ('etl_ultima_execucao_sucesso_idade_segundos', 'gauge', 'Segundos desde a última execução do ETL com sucesso',
+               [({}, round(ultima['idade_segundos'], 1))])
+        yield ('etl_ultima_execucao_eventos', 'gauge', 'Eventos processados na última execução do ETL com sucesso',
+               [({'tipo': 'novos'}, ultima['eventos_novos'] or 0),
+                ({'tipo': 'atualizados'}, ultima['eventos_atualizados'] or 0)])
+
+if metricas is not None:
+    instrumentar_db(db_manager, metricas)
+    metricas.coletor(coletar_metricas_aplicacao)
+
+def registrar_alteracao(*tabelas):
+    """Libera já as entradas do cache afetadas por uma escrita da API e avisa o stream.
+    
+    Os demais processos percebem a alteração pelos contadores, que os
+    triggers incrementam.
+    """
+    cache_respostas.invalidar(*tabelas)
+    if 'eventos' in tabelas:
+        barramento.sinalizar()
+
+def chave_api_valida(chave):
+    """Se a chave está entre SECURITY_CONFIG['api_keys'] (comparação em tempo constante)"""
+    return bool(chave) and any(hmac.compare_digest(chave, valida) for valida in SECURITY_CONFIG['api_keys'])
+
+@app.before_request
+def verificar_acesso():
+    """Chave de API (se exigida) e limite de taxa por cliente nas rotas /api"""
+    if not request.path.startswith('/api/') or request.path in ROTAS_LIVRES or request.method == 'OPTIONS':
+        return None
+    
+    chave = request.headers.get(SECURITY_CONFIG['api_key_header'])
+    chave_valida = chave_api_valida(chave)
+    if SECURITY_CONFIG['api_key_required'] and not chave_valida:
+        return jsonify({'error': 'Chave de API ausente ou inválida'}), 401
+    
+    if limitador is not None:
+        # Chaves não cadastradas não identificam o cliente: trocar de chave não renova o limite
+        cliente = f"chave:{chave}" if chave_valida else f"ip:{request.remote_addr}"
+        espera = limitador.consumir(cliente)
+        if espera:
+            return resposta_limite_taxa(espera)
+    return None
+
 @app.route('/')
 def index():
     """Serve a página principal do dashboard"""
-    return send_from_directory('../web', 'index.html')
+    return estaticos.servir('index.html')
 
 @app.route('/api/health')
 def health_check():
-    """Endpoint de verificação de saúde da API"""
-    return jsonify({
-        'status': 'healthy',
-        'timestamp': datetime.now().isoformat(),
-        'database': 'connected'
-    })
+    """Endpoint de verificação de saúde da API.
+    
+    200 para healthy e degraded (a API ainda responde), 503 para unhealthy;
+    com estrito=true, degraded também retorna 503.
+    """
+    saude = verificador_saude.verificar()
+    estrito = request.args.get('estrito', 'false').lower() == 'true'
+    falhou = saude['status'] == 'unhealthy' or (estrito and saude['status'] == 'degraded')
+    resposta = jsonify(saude)
+    resposta.status_code = 503 if falhou else 200
+    resposta.headers['X-Health-Status'] = saude['status']
+    resposta.headers['Cache-Control'] = 'no-store'
+    return resposta
 
 @app.route('/api/areas')
+@versao_dados.condicional('areas_tecnicas')
+@cache_respostas.em_cache('areas_tecnicas')
 def get_areas():
     """Retorna todas as áreas técnicas"""
     try:
@@ -41,18 +204,25 @@ def get_areas():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/eventos')
+@versao_dados.condicional('eventos')
+@cache_respostas.em_cache('eventos')
 def get_eventos():
-    """Retorna eventos, opcionalmente filtrados por área e período"""
+    """Retorna eventos canônicos, opcionalmente filtrados por área e período"""
     try:
         area = request.args.get('area')
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
         limit = request.args.get('limit', 100, type=int)
-        
-        if area:
-            eventos = db_manager.get_eventos_por_area(area, limit)
+        expandir_duplicados = request.args.get('expandir_duplicados', 'false').lower() == 'true'
+        min_score = request.args.get('min_score', type=float)
+        
+        if area and min_score is not None:
+            # Inclui eventos em que a área é secundária (top-k de scores por evento)
+            eventos = db_manager.get_eventos_por_score(area, min_score, limit, expandir_duplicados)
+        elif area:
+            eventos = db_manager.get_eventos_por_area(area, limit, expandir_duplicados)
         else:
-            eventos = db_manager.get_eventos_por_area(limit=limit)
+            eventos = db_manager.get_eventos_por_area(limit=limit, expandir_duplicados=expandir_duplicados)
         
         # Filtrar por período se fornecido
         if start_date or end_date:
@@ -63,6 +233,7 @@ def get_eventos():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/eventos/nao-categorizados')
+@versao_dados.condicional('eventos')
 def get_eventos_nao_categorizados():
     """Retorna eventos não categorizados"""
     try:
@@ -81,6 +252,7 @@ def get_eventos_nao_categorizados():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/eventos/novos')
+@versao_dados.condicional('eventos', janela=60)
 def get_eventos_novos():
     """Retorna eventos criados nas últimas 24 horas"""
     try:
@@ -90,7 +262,7 @@ def get_eventos_novos():
         with sqlite3.connect(db_manager.db_path) as conn:
             cursor = conn.execute("""
                 SELECT * FROM eventos 
-                WHERE data_criacao >= ?
+                WHERE data_criacao >= ? AND evento_canonico IS NULL
                 ORDER BY data_criacao DESC
             """, (yesterday.isoformat(),))
             
@@ -102,7 +274,30 @@ def get_eventos_novos():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/eventos/stream')
+def stream_alteracoes_eventos():
+    """Stream SSE de eventos novos, atualizados e removidos.
+    
+    Reconexões retomam do cabeçalho Last-Event-ID (ou do parâmetro
+    ultimo_id); sem ele, só alterações posteriores à conexão são enviadas.
+    """
+    ultimo_id = request.headers.get('Last-Event-ID') or request.args.get('ultimo_id')
+    try:
+        ultimo_id = int(ultimo_id) if ultimo_id is not None else None
+    except ValueError:
+        return jsonify({'error': 'Last-Event-ID inválido'}), 400
+    
+    return Response(
+        stream_with_context(stream_eventos.gerar(ultimo_id)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/estatisticas')
+@versao_dados.condicional('proposicoes', 'areas_tecnicas')
+@cache_respostas.em_cache('proposicoes', 'areas_tecnicas')
+@coalescedor.coalescer('proposicoes', 'areas_tecnicas')
+@limite_pesadas.limitar
 def get_estatisticas():
     """Retorna estatísticas de proposições por área técnica"""
     try:
@@ -120,6 +315,8 @@ def get_estatisticas():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/proposicoes')
+@versao_dados.condicional('proposicoes')
+@cache_respostas.em_cache('proposicoes')
 def get_proposicoes():
     """Retorna proposições por área técnica"""
     try:
@@ -142,17 +339,27 @@ def add_proposicao():
         # Validar dados obrigatórios
         required_fields = ['numero_projeto', 'ementa', 'casa_iniciadora', 'forma_apreciacao', 
                           'situacao', 'cabe_analise', 'analise_realizada', 'posicionamento_cnm', 
-                          'prioridade', 'area_tecnica']
+                          'prioridade']
         
         for field in required_fields:
             if not data.get(field):
                 return jsonify({'error': f'Campo {field} é obrigatório'}), 400
         
+        # Sugerir área pela ementa; sem área informada, vale a sugestão
+        sugestao = categorizador_proposicoes.sugerir(data)
+        if not data.get('area_tecnica') and not sugestao['area_tecnica']:
+            return jsonify({'error': 'Campo area_tecnica é obrigatório (nenhuma área sugerida para a ementa)'}), 400
+        
         # Inserir proposição
-        proposicao_id = insert_proposicao(data)
+        proposicao_id = insert_proposicao(data, sugestao)
+        registrar_alteracao('proposicoes')
         
         return jsonify({
             'id': proposicao_id,
+            'area_tecnica': data.get('area_tecnica') or sugestao['area_tecnica'],
+            'area_sugerida': sugestao['area_tecnica'],
+            'score_sugerido': sugestao['score'],
+            'areas_sugeridas': sugestao['areas'],
             'message': 'Proposição adicionada com sucesso'
         }), 201
     except Exception as e:
@@ -164,10 +371,11 @@ def update_proposicao(proposicao_id):
     try:
         data = request.json
         
-        # Atualizar proposição
-        success = update_proposicao_by_id(proposicao_id, data)
+        # Atualizar proposição (a sugestão acompanha a ementa)
+        success = update_proposicao_by_id(proposicao_id, data, categorizador_proposicoes.sugerir(data))
         
         if success:
+            registrar_alteracao('proposicoes')
             return jsonify({'message': 'Proposição atualizada com sucesso'})
         else:
             return jsonify({'error': 'Proposição não encontrada'}), 404
@@ -181,6 +389,7 @@ def delete_proposicao(proposicao_id):
         success = delete_proposicao_by_id(proposicao_id)
         
         if success:
+            registrar_alteracao('proposicoes')
             return jsonify({'message': 'Proposição excluída com sucesso'})
         else:
             return jsonify({'error': 'Proposição não encontrada'}), 404
@@ -188,6 +397,9 @@ def delete_proposicao(proposicao_id):
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/areas/contadores')
+@versao_dados.condicional('eventos', 'areas_tecnicas')
+@cache_respostas.em_cache('eventos', 'areas_tecnicas')
+@coalescedor.coalescer('eventos', 'areas_tecnicas')
 def get_contadores_areas():
     """Retorna contadores de eventos por área técnica"""
     try:
@@ -206,6 +418,45 @@ def get_contadores_areas():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Partes do painel de uma área; o parâmetro campos escolhe quais retornar
+CAMPOS_DASHBOARD = ('eventos', 'estatisticas', 'proposicoes', 'contadores')
+
+@app.route('/api/areas/<nome>/dashboard')
+@versao_dados.condicional('eventos', 'proposicoes')
+@cache_respostas.em_cache('eventos', 'proposicoes')
+@limite_pesadas.limitar
+def get_dashboard_area(nome):
+    """Retorna eventos, estatísticas, proposições e contadores de uma área em uma só resposta.
+    
+    Todas as partes são lidas na mesma transação, de um mesmo estado do banco.
+    """
+    try:
+        campos = request.args.get('campos')
+        campos = [campo.strip() for campo in campos.split(',') if campo.strip()] if campos else CAMPOS_DASHBOARD
+        invalidos = sorted(set(campos) - set(CAMPOS_DASHBOARD))
+        if invalidos:
+            return jsonify({'error': f"Campos inválidos: {', '.join(invalidos)}"}), 400
+        limit = request.args.get('limit', 100, type=int)
+        
+        dashboard = {'area': nome}
+        with db_manager.leitura_consistente() as conn:
+            if 'eventos' in campos:
+                dashboard['eventos'] = db_manager.get_eventos_por_area(nome, limit, conn=conn)
+            if 'estatisticas' in campos:
+                dashboard['estatisticas'] = get_estatisticas_por_area(nome, conn)
+            if 'proposicoes' in campos:
+                dashboard['proposicoes'] = get_proposicoes_por_area(nome, conn)
+            if 'contadores' in campos:
+                contadores = db_manager.get_contadores_eventos_area(nome, conn)
+                contadores['proposicoes'] = conn.execute(
+                    "SELECT COUNT(*) FROM proposicoes WHERE area_tecnica = ?", (nome,)
+                ).fetchone()[0]
+                dashboard['contadores'] = contadores
+        
+        return jsonify(dashboard)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/eventos/<evento_id>/categorizar', methods=['POST'])
 def categorizar_evento(evento_id):
     """Categoriza um evento em uma área técnica"""
@@ -219,12 +470,50 @@ def categorizar_evento(evento_id):
         success = db_manager.update_evento_area_tecnica(evento_id, area_tecnica)
         
         if success:
+            registrar_alteracao('eventos')
             return jsonify({'message': 'Evento categorizado com sucesso'})
         else:
             return jsonify({'error': 'Evento não encontrado'}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/categorizar/preview', methods=['POST'])
+def preview_categorizacao():
+    """Sugere a área técnica de um texto ou de eventos sem gravar nada.
+    
+    Aceita {"texto": ...}, {"evento": {...}} ou, em lote, {"textos": [...]} /
+    {"eventos": [...]} com até API_CONFIG['preview_max_itens'] itens.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        
+        if 'texto' in data or 'evento' in data:
+            itens, lote = [data.get('evento') or {'tema': data.get('texto')}], False
+        else:
+            itens, lote = data.get('eventos') or [{'tema': texto} for texto in data.get('textos') or []], True
+        
+        if not itens or not all(isinstance(item, dict) for item in itens):
+            return jsonify({'error': 'Informe texto, textos, evento ou eventos'}), 400
+        if len(itens) > API_CONFIG['preview_max_itens']:
+            return jsonify({'error': f"Máximo de {API_CONFIG['preview_max_itens']} itens por chamada"}), 400
+        
+        # Uma única versão do modelo residente atende toda a requisição
+        modelo = categorizador.recarregar_modelo()
+        resultados = []
+        for item in itens:
+            evento = {campo: str(valor) for campo, valor in item.items() if valor is not None}
+            resultado = categorizador.pre_visualizar(evento, modelo)
+            if 'evento_id_externo' in evento:
+                resultado['evento_id_externo'] = evento['evento_id_externo']
+            resultados.append(resultado)
+        
+        if not lote:
+            resultados[0]['versao_palavras_chave'] = modelo.versao
+            return jsonify(resultados[0])
+        return jsonify({'versao_palavras_chave': modelo.versao, 'resultados': resultados})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/eventos/<evento_id>', methods=['PUT'])
 def update_evento(evento_id):
     """Atualiza um evento específico"""
@@ -234,6 +523,7 @@ def update_evento(evento_id):
         success = db_manager.update_evento(evento_id, data)
         
         if success:
+            registrar_alteracao('eventos')
             return jsonify({'message': 'Evento atualizado com sucesso'})
         else:
             return jsonify({'error': 'Evento não encontrado'}), 404
@@ -241,6 +531,8 @@ def update_evento(evento_id):
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/eventos/buscar')
+@versao_dados.condicional('eventos')
+@limite_pesadas.limitar
 def buscar_eventos():
     """Busca eventos por termo"""
     try:
@@ -255,6 +547,7 @@ def buscar_eventos():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/logs')
+@versao_dados.condicional('logs_atualizacao')
 def get_logs():
     """Retorna logs de atualização"""
     try:
@@ -273,6 +566,72 @@ def get_logs():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/cache')
+def get_cache_estatisticas():
+    """Retorna métricas do cache de respostas (acertos, falhas, despejos) e da coalescência"""
+    metricas = cache_respostas.estatisticas()
+    metricas['coalescencia'] = coalescedor.estatisticas()
+    return jsonify(metricas)
+
+@app.route('/api/metrics')
+def get_metricas():
+    """Métricas no formato de exposição de texto do Prometheus"""
+    if metricas is None:
+        return jsonify({'error': 'Métricas desativadas (METRICS_ENABLED=false)'}), 404
+    return Response(metricas.exportar(), content_type=TIPO_CONTEUDO_METRICAS)
+
+@app.route('/api/rejeitados')
+@versao_dados.condicional('registros_rejeitados')
+def get_rejeitados():
+    """Retorna registros rejeitados pelas extrações (dead-letter)"""
+    try:
+        fonte = request.args.get('fonte')
+        incluir_reprocessados = request.args.get('incluir_reprocessados', 'false').lower() == 'true'
+        limit = request.args.get('limit', 100, type=int)
+
+        registros = db_manager.get_registros_rejeitados(fonte, incluir_reprocessados, limit)
+        return jsonify(registros)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Exportações em streaming: sem limite de registros, fora do cache e da compressão das respostas JSON
+@app.route('/api/export/eventos')
+@limite_pesadas.limitar
+def exportar_eventos():
+    """Exporta eventos (NDJSON ou CSV), filtrados por área, fonte, situação e período"""
+    formato = request.args.get('formato', 'ndjson')
+    if formato not in FORMATOS_EXPORTACAO:
+        return jsonify({'error': f"Formato inválido: {formato} (use {', '.join(FORMATOS_EXPORTACAO)})"}), 400
+    start_date = request.args.get('start_date')
+    end_date = request.args.get('end_date')
+    
+    lotes = db_manager.iterar_eventos_exportacao(
+        area_tecnica=request.args.get('area'),
+        fonte=request.args.get('fonte'),
+        situacao=request.args.get('situacao'),
+        incluir_duplicados=request.args.get('incluir_duplicados', 'false').lower() == 'true'
+    )
+    if start_date or end_date:
+        # data_inicio é texto "dd/mm/aaaa às hh:mm": o período é filtrado a cada lote
+        lotes = (filter_events_by_date(lote, start_date, end_date) for lote in lotes)
+    return resposta_exportacao('eventos', lotes, formato)
+
+@app.route('/api/export/proposicoes')
+@limite_pesadas.limitar
+def exportar_proposicoes():
+    """Exporta proposições (NDJSON ou CSV), filtradas por área, situação, casa e prioridade"""
+    formato = request.args.get('formato', 'ndjson')
+    if formato not in FORMATOS_EXPORTACAO:
+        return jsonify({'error': f"Formato inválido: {formato} (use {', '.join(FORMATOS_EXPORTACAO)})"}), 400
+    
+    lotes = db_manager.iterar_proposicoes_exportacao(
+        area_tecnica=request.args.get('area'),
+        situacao=request.args.get('situacao'),
+        casa_iniciadora=request.args.get('casa_iniciadora'),
+        prioridade=request.args.get('prioridade')
+    )
+    return resposta_exportacao('proposicoes', lotes, formato)
+
 # Funções auxiliares
 
 def filter_events_by_date(eventos, start_date, end_date):
@@ -308,46 +667,49 @@ def filter_events_by_date(eventos, start_date, end_date):
     
     return filtered
 
-def get_estatisticas_por_area(area_tecnica):
-    """Retorna estatísticas específicas de uma área técnica"""
+def get_estatisticas_por_area(area_tecnica, conn=None):
+    """Retorna estatísticas específicas de uma área técnica (na conexão informada, se houver)"""
     try:
-        with sqlite3.connect(db_manager.db_path) as conn:
-            cursor = conn.execute("""
-                SELECT 
-                    SUM(CASE WHEN posicionamento_cnm = 'FAVORÁVEL' THEN 1 ELSE 0 END) as cnm_favoravel,
-                    SUM(CASE WHEN posicionamento_cnm = 'DESFAVORÁVEL' THEN 1 ELSE 0 END) as cnm_desfavoravel,
-                    SUM(CASE WHEN posicionamento_cnm = 'NEUTRO' THEN 1 ELSE 0 END) as cnm_neutro,
-                    SUM(CASE WHEN posicionamento_cnm = 'FAVORÁVEL' AND aprovacao_camara = 'APROVADO' THEN 1 ELSE 0 END) as camara_cnm_favoravel,
-                    SUM(CASE WHEN posicionamento_cnm = 'DESFAVORÁVEL' AND aprovacao_camara = 'APROVADO' THEN 1 ELSE 0 END) as camara_cnm_desfavoravel,
-                    SUM(CASE WHEN posicionamento_cnm = 'NEUTRO' AND aprovacao_camara = 'APROVADO' THEN 1 ELSE 0 END) as camara_cnm_neutro,
-                    SUM(CASE WHEN posicionamento_cnm = 'FAVORÁVEL' AND aprovacao_senado = 'APROVADO' THEN 1 ELSE 0 END) as senado_cnm_favoravel,
-                    SUM(CASE WHEN posicionamento_cnm = 'DESFAVORÁVEL' AND aprovacao_senado = 'APROVADO' THEN 1 ELSE 0 END) as senado_cnm_desfavoravel,
-                    SUM(CASE WHEN posicionamento_cnm = 'NEUTRO' AND aprovacao_senado = 'APROVADO' THEN 1 ELSE 0 END) as senado_cnm_neutro,
-                    SUM(CASE WHEN posicionamento_cnm = 'FAVORÁVEL' AND sancionado_presidencia = 'SIM' THEN 1 ELSE 0 END) as presidencia_cnm_favoravel,
-                    SUM(CASE WHEN posicionamento_cnm = 'DESFAVORÁVEL' AND sancionado_presidencia = 'SIM' THEN 1 ELSE 0 END) as presidencia_cnm_desfavoravel,
-                    SUM(CASE WHEN posicionamento_cnm = 'NEUTRO' AND sancionado_presidencia = 'SIM' THEN 1 ELSE 0 END) as presidencia_cnm_neutro
-                FROM proposicoes 
-                WHERE area_tecnica = ?
-            """, (area_tecnica,))
-            
-            row = cursor.fetchone()
-            if row:
-                return {
-                    'cnm_favoravel': row[0] or 0,
-                    'cnm_desfavoravel': row[1] or 0,
-                    'cnm_neutro': row[2] or 0,
-                    'camara_cnm_favoravel': row[3] or 0,
-                    'camara_cnm_desfavoravel': row[4] or 0,
-                    'camara_cnm_neutro': row[5] or 0,
-                    'senado_cnm_favoravel': row[6] or 0,
-                    'senado_cnm_desfavoravel': row[7] or 0,
-                    'senado_cnm_neutro': row[8] or 0,
-                    'presidencia_cnm_favoravel': row[9] or 0,
-                    'presidencia_cnm_desfavoravel': row[10] or 0,
-                    'presidencia_cnm_neutro': row[11] or 0
-                }
-            else:
-                return get_sample_statistics(area_tecnica)
+        if conn is None:
+            with sqlite3.connect(db_manager.db_path) as conn:
+                return get_estatisticas_por_area(area_tecnica, conn)
+        
+        cursor = conn.execute("""
+            SELECT 
+                SUM(CASE WHEN posicionamento_cnm = 'FAVORÁVEL' THEN 1 ELSE 0 END) as cnm_favoravel,
+                SUM(CASE WHEN posicionamento_cnm = 'DESFAVORÁVEL' THEN 1 ELSE 0 END) as cnm_desfavoravel,
+                SUM(CASE WHEN posicionamento_cnm = 'NEUTRO' THEN 1 ELSE 0 END) as cnm_neutro,
+                SUM(CASE WHEN posicionamento_cnm = 'FAVORÁVEL' AND aprovacao_camara = 'APROVADO' THEN 1 ELSE 0 END) as camara_cnm_favoravel,
+                SUM(CASE WHEN posicionamento_cnm = 'DESFAVORÁVEL' AND aprovacao_camara = 'APROVADO' THEN 1 ELSE 0 END) as camara_cnm_desfavoravel,
+                SUM(CASE WHEN posicionamento_cnm = 'NEUTRO' AND aprovacao_camara = 'APROVADO' THEN 1 ELSE 0 END) as camara_cnm_neutro,
+                SUM(CASE WHEN posicionamento_cnm = 'FAVORÁVEL' AND aprovacao_senado = 'APROVADO' THEN 1 ELSE 0 END) as senado_cnm_favoravel,
+                SUM(CASE WHEN posicionamento_cnm = 'DESFAVORÁVEL' AND aprovacao_senado = 'APROVADO' THEN 1 ELSE 0 END) as senado_cnm_desfavoravel,
+                SUM(CASE WHEN posicionamento_cnm = 'NEUTRO' AND aprovacao_senado = 'APROVADO' THEN 1 ELSE 0 END) as senado_cnm_neutro,
+                SUM(CASE WHEN posicionamento_cnm = 'FAVORÁVEL' AND sancionado_presidencia = 'SIM' THEN 1 ELSE 0 END) as presidencia_cnm_favoravel,
+                SUM(CASE WHEN posicionamento_cnm = 'DESFAVORÁVEL' AND sancionado_presidencia = 'SIM' THEN 1 ELSE 0 END) as presidencia_cnm_desfavoravel,
+                SUM(CASE WHEN posicionamento_cnm = 'NEUTRO' AND sancionado_presidencia = 'SIM' THEN 1 ELSE 0 END) as presidencia_cnm_neutro
+            FROM proposicoes 
+            WHERE area_tecnica = ?
+        """, (area_tecnica,))
+        
+        row = cursor.fetchone()
+        if row:
+            return {
+                'cnm_favoravel': row[0] or 0,
+                'cnm_desfavoravel': row[1] or 0,
+                'cnm_neutro': row[2] or 0,
+                'camara_cnm_favoravel': row[3] or 0,
+                'camara_cnm_desfavoravel': row[4] or 0,
+                'camara_cnm_neutro': row[5] or 0,
+                'senado_cnm_favoravel': row[6] or 0,
+                'senado_cnm_desfavoravel': row[7] or 0,
+                'senado_cnm_neutro': row[8] or 0,
+                'presidencia_cnm_favoravel': row[9] or 0,
+                'presidencia_cnm_desfavoravel': row[10] or 0,
+                'presidencia_cnm_neutro': row[11] or 0
+            }
+        else:
+            return get_sample_statistics(area_tecnica)
     except:
         # Se houver erro, retornar dados de exemplo
         return get_sample_statistics(area_tecnica)
@@ -365,27 +727,30 @@ def get_estatisticas_gerais():
     except Exception as e:
         return get_sample_statistics()
 
-def get_proposicoes_por_area(area_tecnica):
-    """Retorna proposições de uma área técnica específica"""
+def get_proposicoes_por_area(area_tecnica, conn=None):
+    """Retorna proposições de uma área técnica específica (na conexão informada, se houver)"""
     try:
-        with sqlite3.connect(db_manager.db_path) as conn:
-            cursor = conn.execute("""
-                SELECT * FROM proposicoes 
-                WHERE area_tecnica = ?
-                ORDER BY data_criacao DESC
-            """, (area_tecnica,))
-            
-            proposicoes = []
-            for row in cursor.fetchall():
-                proposicoes.append(dict(zip([col[0] for col in cursor.description], row)))
+        if conn is None:
+            with sqlite3.connect(db_manager.db_path) as conn:
+                return get_proposicoes_por_area(area_tecnica, conn)
+        
+        cursor = conn.execute("""
+            SELECT * FROM proposicoes 
+            WHERE area_tecnica = ?
+            ORDER BY data_criacao DESC
+        """, (area_tecnica,))
+        
+        proposicoes = []
+        for row in cursor.fetchall():
+            proposicoes.append(dict(zip([col[0] for col in cursor.description], row)))
         
         return proposicoes
     except:
         # Se a tabela não existir, retornar lista vazia
         return []
 
-def insert_proposicao(data):
-    """Insere uma nova proposição no banco"""
+def insert_proposicao(data, sugestao):
+    """Insere uma nova proposição no banco com a área sugerida pela ementa"""
     try:
         with sqlite3.connect(db_manager.db_path) as conn:
             cursor = conn.execute("""
@@ -393,8 +758,9 @@ def insert_proposicao(data):
                     numero_projeto, ementa, casa_iniciadora, forma_apreciacao,
                     eixo_tematico, situacao, cabe_analise, prazo_analise,
                     analise_realizada, documento_analise, posicionamento_cnm,
-                    prioridade, observacao, area_tecnica, data_criacao
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    prioridade, observacao, area_tecnica, data_criacao,
+                    area_sugerida, score_sugerido, hash_sugestao
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 data['numero_projeto'],
                 data['ementa'],
@@ -409,8 +775,11 @@ def insert_proposicao(data):
                 data['posicionamento_cnm'],
                 data['prioridade'],
                 data.get('observacao', ''),
-                data['area_tecnica'],
-                datetime.now().isoformat()
+                data.get('area_tecnica') or sugestao['area_tecnica'],
+                datetime.now().isoformat(),
+                sugestao['area_tecnica'],
+                sugestao['score'],
+                sugestao['hash_sugestao']
             ))
             
             conn.commit()
@@ -418,8 +787,8 @@ def insert_proposicao(data):
     except Exception as e:
         raise Exception(f"Erro ao inserir proposição: {str(e)}")
 
-def update_proposicao_by_id(proposicao_id, data):
-    """Atualiza uma proposição existente"""
+def update_proposicao_by_id(proposicao_id, data, sugestao):
+    """Atualiza uma proposição existente e a área sugerida pela ementa"""
     try:
         with sqlite3.connect(db_manager.db_path) as conn:
             cursor = conn.execute("""
@@ -427,7 +796,8 @@ def update_proposicao_by_id(proposicao_id, data):
                     numero_projeto = ?, ementa = ?, casa_iniciadora = ?, forma_apreciacao = ?,
                     eixo_tematico = ?, situacao = ?, cabe_analise = ?, prazo_analise = ?,
                     analise_realizada = ?, documento_analise = ?, posicionamento_cnm = ?,
-                    prioridade = ?, observacao = ?, data_atualizacao = ?
+                    prioridade = ?, observacao = ?, data_atualizacao = ?,
+                    area_sugerida = ?, score_sugerido = ?, hash_sugestao = ?
                 WHERE id = ?
             """, (
                 data.get('numero_projeto', ''),
@@ -444,6 +814,9 @@ def update_proposicao_by_id(proposicao_id, data):
                 data.get('prioridade', ''),
                 data.get('observacao', ''),
                 datetime.now().isoformat(),
+                sugestao['area_tecnica'],
+                sugestao['score'],
+                sugestao['hash_sugestao'],
                 proposicao_id
             ))
             
@@ -494,4 +867,5 @@ if __name__ == '__main__':
     except Exception as e:
         print(f"Erro ao criar tabela de proposições: {e}")
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Servidor de desenvolvimento; em produção use api/servidor.py
+    app.run(debug=API_CONFIG['debug'], host=API_CONFIG['host'], port=API_CONFIG['port'])
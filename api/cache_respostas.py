@@ -0,0 +1,124 @@
+"""
+Cache de respostas da API em memória (LRU com expiração), configurado por CACHE_CONFIG
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Dict, Optional, Tuple
+
+from flask import Response, make_response, request
+
+
+class CacheRespostas:
+    """Respostas GET por rota e parâmetros normalizados, com despejo LRU e TTL.
+
+    Cada entrada guarda a versão (contadores_alteracao) das tabelas de que
+    depende. Se outro processo, como o ETL, alterou uma delas, a entrada é
+    descartada na leitura; as escritas feitas pela própria API removem na hora
+    as entradas das tabelas afetadas.
+    """
+
+    def __init__(self, obter_versoes: Callable[[], Optional[Dict[str, int]]], max_size: int = 1000,
+                 ttl: int = 300, enabled: bool = True):
+        self.obter_versoes = obter_versoes
+        self.max_size = max_size
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entradas: "OrderedDict[Tuple, Tuple[float, Dict[str, int], bytes, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._metricas = {'acertos': 0, 'falhas': 0, 'despejos': 0, 'expiracoes': 0, 'invalidacoes': 0}
+
+    @staticmethod
+    def chave(rota: str, args) -> Tuple:
+        """Rota e parâmetros ordenados, sem parâmetros vazios"""
+        return (rota, tuple(sorted((nome, valor) for nome, valor in args.items(multi=True) if valor != '')))
+
+    def obter(self, chave: Tuple, versoes: Dict[str, int]) -> Optional[Tuple[bytes, str]]:
+        """(corpo, mimetype) em cache, se ainda válido para as versões atuais das tabelas"""
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                self._metricas['falhas'] += 1
+                return None
+
+            expira_em, versoes_entrada, corpo, mimetype = entrada
+            if expira_em <= time.monotonic():
+                del self._entradas[chave]
+                self._metricas['expiracoes'] += 1
+                self._metricas['falhas'] += 1
+                return None
+            if versoes_entrada != versoes:
+                del self._entradas[chave]
+                self._metricas['invalidacoes'] += 1
+                self._metricas['falhas'] += 1
+                return None
+
+            self._entradas.move_to_end(chave)
+            self._metricas['acertos'] += 1
+            return corpo, mimetype
+
+    def guardar(self, chave: Tuple, versoes: Dict[str, int], corpo: bytes, mimetype: str):
+        """Grava a resposta, despejando as menos usadas acima de max_size"""
+        with self._lock:
+            self._entradas[chave] = (time.monotonic() + self.ttl, versoes, corpo, mimetype)
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.max_size:
+                self._entradas.popitem(last=False)
+                self._metricas['despejos'] += 1
+
+    def invalidar(self, *tabelas: str) -> int:
+        """Remove as entradas que dependem de alguma das tabelas"""
+        with self._lock:
+            chaves = [chave for chave, (_, versoes, _, _) in self._entradas.items()
+                      if any(tabela in versoes for tabela in tabelas)]
+            for chave in chaves:
+                del self._entradas[chave]
+            self._metricas['invalidacoes'] += len(chaves)
+            return len(chaves)
+
+    def limpar(self):
+        """Remove todas as entradas"""
+        with self._lock:
+            self._entradas.clear()
+
+    def estatisticas(self) -> Dict:
+        """Acertos, falhas, despejos, expirações, invalidações e ocupação"""
+        with self._lock:
+            metricas = dict(self._metricas)
+            metricas['tamanho'] = len(self._entradas)
+        consultas = metricas['acertos'] + metricas['falhas']
+        metricas['taxa_acertos'] = round(metricas['acertos'] / consultas, 4) if consultas else None
+        metricas.update({'enabled': self.enabled, 'max_size': self.max_size, 'ttl': self.ttl})
+        return metricas
+
+    def em_cache(self, *tabelas: str):
+        """Decorator de rota GET cujo resultado depende das tabelas informadas"""
+        def decorador(funcao):
+            @wraps(funcao)
+            def rota(*args, **kwargs):
+                if not self.enabled or request.method != 'GET':
+                    return funcao(*args, **kwargs)
+
+                todas = self.obter_versoes()
+                if todas is None:
+                    return funcao(*args, **kwargs)
+                versoes = {tabela: todas.get(tabela, 0) for tabela in tabelas}
+                chave = self.chave(request.path, request.args)
+
+                em_cache = self.obter(chave, versoes)
+                if em_cache is not None:
+                    corpo, mimetype = em_cache
+                    resposta = Response(corpo, mimetype=mimetype)
+                    resposta.headers['X-Cache'] = 'HIT'
+                    return resposta
+
+                # Versões lidas antes da consulta: uma escrita concorrente invalida a entrada
+                resposta = make_response(funcao(*args, **kwargs))
+                if resposta.status_code == 200:
+                    self.guardar(chave, versoes, resposta.get_data(), resposta.mimetype)
+                resposta.headers['X-Cache'] = 'MISS'
+                return resposta
+            return rota
+        return decorador
@@ -0,0 +1,86 @@
+"""
+Coalescência (single-flight) de requisições GET idênticas e simultâneas
+"""
+
+import threading
+from functools import wraps
+from typing import Callable, Dict, Optional, Tuple
+
+from flask import Response, make_response, request
+
+from api.cache_respostas import CacheRespostas
+
+
+class Execucao:
+    """Uma execução em andamento, aguardada pelas requisições idênticas"""
+
+    def __init__(self):
+        self.concluida = threading.Event()
+        self.resposta: Optional[Tuple[bytes, int, list]] = None
+
+
+class CoalescedorRequisicoes:
+    """Requisições idênticas que chegam enquanto uma está em execução esperam por ela.
+
+    A primeira requisição de uma chave (rota, parâmetros e versões das
+    tabelas) executa a rota; as que chegam até ela terminar recebem uma
+    cópia da mesma resposta. Com as versões na chave, quem chega depois de
+    uma alteração dos dados não recebe um resultado anterior a ela. Fica por
+    dentro do cache: só coalesce as falhas de cache, por exemplo logo depois
+    de o ETL invalidar as respostas.
+    """
+
+    def __init__(self, obter_versoes: Callable[[], Optional[Dict[str, int]]]):
+        self.obter_versoes = obter_versoes
+        self._execucoes: Dict[Tuple, Execucao] = {}
+        self._lock = threading.Lock()
+        self._metricas = {'execucoes': 0, 'coalescidas': 0}
+
+    def coalescer(self, *tabelas: str):
+        """Decorator de rota GET cujo resultado depende das tabelas informadas"""
+        def decorador(funcao):
+            @wraps(funcao)
+            def rota(*args, **kwargs):
+                if request.method != 'GET':
+                    return funcao(*args, **kwargs)
+
+                todas = self.obter_versoes() or {}
+                chave = (CacheRespostas.chave(request.path, request.args),
+                         tuple(todas.get(tabela, 0) for tabela in tabelas))
+                with self._lock:
+                    execucao = self._execucoes.get(chave)
+                    lider = execucao is None
+                    if lider:
+                        execucao = self._execucoes[chave] = Execucao()
+                        self._metricas['execucoes'] += 1
+                    else:
+                        self._metricas['coalescidas'] += 1
+
+                if not lider:
+                    execucao.concluida.wait()
+                    if execucao.resposta is None:
+                        # A execução compartilhada falhou com exceção: executar por conta própria
+                        return funcao(*args, **kwargs)
+                    corpo, status, cabecalhos = execucao.resposta
+                    return Response(corpo, status=status, headers=cabecalhos)
+
+                try:
+                    resposta = make_response(funcao(*args, **kwargs))
+                    if not resposta.is_streamed:
+                        execucao.resposta = (resposta.get_data(), resposta.status_code, list(resposta.headers))
+                    return resposta
+                finally:
+                    with self._lock:
+                        del self._execucoes[chave]
+                    execucao.concluida.set()
+            return rota
+        return decorador
+
+    def estatisticas(self) -> Dict:
+        """Execuções, requisições coalescidas e execuções em andamento"""
+        with self._lock:
+            metricas = dict(self._metricas)
+            metricas['em_andamento'] = len(self._execucoes)
+        total = metricas['execucoes'] + metricas['coalescidas']
+        metricas['taxa_coalescencia'] = round(metricas['coalescidas'] / total, 4) if total else None
+        return metricas
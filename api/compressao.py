@@ -0,0 +1,177 @@
+"""
+Compressão das respostas da API (gzip e, se instalado, brotli) e dos arquivos estáticos
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from flask import Response, abort, request, send_from_directory
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional; sem ele só há gzip
+    brotli = None
+
+# Em ordem de preferência do servidor
+CODIFICACOES: Tuple[str, ...] = ('br', 'gzip') if brotli else ('gzip',)
+
+TIPOS_COMPRIMIVEIS = ('text/', 'application/json', 'application/javascript', 'image/svg+xml')
+
+
+def comprimivel(mimetype: Optional[str]) -> bool:
+    """Se o tipo de conteúdo se beneficia de compressão"""
+    return bool(mimetype) and mimetype.startswith(TIPOS_COMPRIMIVEIS)
+
+
+def comprimir(dados: bytes, codificacao: str, nivel_gzip: int = 6, nivel_brotli: int = 5) -> bytes:
+    """Comprime os dados; gzip sem data no cabeçalho, para o resultado ser determinístico"""
+    if codificacao == 'br':
+        return brotli.compress(dados, quality=nivel_brotli)
+    return gzip.compress(dados, compresslevel=nivel_gzip, mtime=0)
+
+
+def codificacao_aceita() -> Optional[str]:
+    """Melhor codificação aceita pelo cliente (Accept-Encoding) entre as disponíveis"""
+    aceitas = [codificacao for codificacao in CODIFICACOES if request.accept_encodings[codificacao]]
+    if not aceitas:
+        return None
+    # Preferência do cliente (qualidade) e, no empate, a do servidor
+    return max(aceitas, key=lambda codificacao: request.accept_encodings[codificacao])
+
+
+def etags_variantes(etag: str) -> List[str]:
+    """ETag da resposta sem compressão e de cada variante comprimida"""
+    return [etag] + [f"{etag}-{codificacao}" for codificacao in CODIFICACOES]
+
+
+class CompressorRespostas:
+    """Comprime respostas da API acima de um limiar, conforme Accept-Encoding.
+
+    Respostas com ETag (os dados de uma versão do banco) são comprimidas uma
+    vez: o resultado fica em memória por (ETag, codificação). A variante
+    comprimida recebe uma ETag própria (sufixo -gzip / -br), pois os bytes
+    diferem. Respostas em streaming não são tocadas.
+    """
+
+    def __init__(self, limiar: int = 1024, nivel_gzip: int = 6, nivel_brotli: int = 5, max_memo: int = 256):
+        self.limiar = limiar
+        self.nivel_gzip = nivel_gzip
+        self.nivel_brotli = nivel_brotli
+        self.max_memo = max_memo
+        self._memo: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def aplicar(self, resposta: Response) -> Response:
+        """after_request: comprime a resposta quando vale a pena"""
+        if not comprimivel(resposta.mimetype) or resposta.direct_passthrough or resposta.is_streamed:
+            return resposta
+        resposta.vary.add('Accept-Encoding')
+
+        if (resposta.status_code != 200 or 'Content-Encoding' in resposta.headers
+                or (resposta.content_length or 0) < self.limiar):
+            return resposta
+        codificacao = codificacao_aceita()
+        if codificacao is None:
+            return resposta
+
+        etag, _ = resposta.get_etag()
+        chave = (etag, codificacao) if etag else None
+        with self._lock:
+            comprimido = self._memo.get(chave) if chave else None
+            if comprimido is not None:
+                self._memo.move_to_end(chave)
+        if comprimido is None:
+            comprimido = comprimir(resposta.get_data(), codificacao, self.nivel_gzip, self.nivel_brotli)
+            if chave:
+                with self._lock:
+                    self._memo[chave] = comprimido
+                    while len(self._memo) > self.max_memo:
+                        self._memo.popitem(last=False)
+
+        resposta.set_data(comprimido)
+        resposta.headers['Content-Encoding'] = codificacao
+        if etag:
+            resposta.set_etag(f"{etag}-{codificacao}")
+        return resposta
+
+
+class EstaticosComprimidos:
+    """Arquivos de web/ comprimidos uma vez na inicialização e servidos conforme Accept-Encoding.
+
+    As versões comprimidas ficam em memória (web/ é pequeno) e são refeitas se
+    o arquivo mudar em disco. Arquivos não comprimíveis, ou clientes sem
+    suporte, seguem por send_from_directory.
+    """
+
+    def __init__(self, diretorio: str, max_age: int = 300, limiar: int = 1024):
+        self.diretorio = os.path.abspath(diretorio)
+        self.max_age = max_age
+        self.limiar = limiar
+        self._arquivos: Dict[str, Tuple[float, str, Dict[str, bytes]]] = {}
+        self._lock = threading.Lock()
+
+    def precomprimir(self) -> int:
+        """Comprime todos os arquivos comprimíveis do diretório; retorna quantos"""
+        total = 0
+        for raiz, _, nomes in os.walk(self.diretorio):
+            for nome in nomes:
+                caminho = os.path.join(raiz, nome)
+                if self._variantes(caminho) is not None:
+                    total += 1
+        return total
+
+    def _variantes(self, caminho: str) -> Optional[Tuple[float, str, Dict[str, bytes]]]:
+        """(mtime, hash, {codificação: bytes}) do arquivo; None se não vale comprimir"""
+        tipo, _ = mimetypes.guess_type(caminho)
+        if not comprimivel(tipo):
+            return None
+        try:
+            mtime = os.path.getmtime(caminho)
+        except OSError:
+            return None
+
+        with self._lock:
+            atual = self._arquivos.get(caminho)
+        if atual is not None and atual[0] == mtime:
+            return atual
+
+        with open(caminho, 'rb') as arquivo:
+            dados = arquivo.read()
+        if len(dados) < self.limiar:
+            return None
+        variantes = (mtime, hashlib.sha1(dados).hexdigest()[:20],
+                     {codificacao: comprimir(dados, codificacao, 9, 11) for codificacao in CODIFICACOES})
+        with self._lock:
+            self._arquivos[caminho] = variantes
+        return variantes
+
+    def servir(self, filename: str) -> Response:
+        """View de arquivos estáticos"""
+        caminho = safe_join(self.diretorio, filename)
+        if caminho is None or not os.path.isfile(caminho):
+            abort(404)
+
+        variantes = self._variantes(caminho)
+        codificacao = codificacao_aceita() if variantes else None
+        if codificacao is None:
+            resposta = send_from_directory(self.diretorio, filename, max_age=self.max_age)
+            if variantes:
+                resposta.vary.add('Accept-Encoding')
+            return resposta
+
+        mtime, hash_arquivo, comprimidos = variantes
+        resposta = Response(comprimidos[codificacao], mimetype=mimetypes.guess_type(caminho)[0])
+        resposta.headers['Content-Encoding'] = codificacao
+        resposta.vary.add('Accept-Encoding')
+        resposta.set_etag(f"{hash_arquivo}-{codificacao}")
+        resposta.last_modified = datetime.fromtimestamp(int(mtime), tz=timezone.utc)
+        resposta.cache_control.public = True
+        resposta.cache_control.max_age = self.max_age
+        return resposta.make_conditional(request)
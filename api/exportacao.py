@@ -0,0 +1,67 @@
+"""
+Exportação em streaming (NDJSON ou CSV, com gzip se o cliente aceitar) de lotes de linhas do banco
+"""
+
+import csv
+import io
+import json
+import zlib
+from typing import Dict, Iterable, Iterator, List
+
+from flask import Response, request, stream_with_context
+
+FORMATOS = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+
+def partes_ndjson(lotes: Iterable[List[Dict]]) -> Iterator[str]:
+    """Uma linha JSON por registro; uma parte por lote"""
+    for lote in lotes:
+        if lote:
+            yield ''.join(json.dumps(linha, ensure_ascii=False, default=str) + '\n' for linha in lote)
+
+
+def partes_csv(lotes: Iterable[List[Dict]]) -> Iterator[str]:
+    """CSV com cabeçalho (colunas do primeiro registro); uma parte por lote"""
+    buffer = io.StringIO()
+    escritor = None
+    for lote in lotes:
+        if not lote:
+            continue
+        if escritor is None:
+            escritor = csv.DictWriter(buffer, fieldnames=list(lote[0]), extrasaction='ignore')
+            escritor.writeheader()
+        escritor.writerows(lote)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def comprimir_gzip(partes: Iterable[bytes], nivel: int = 6) -> Iterator[bytes]:
+    """gzip incremental: comprime cada parte sem reter o conteúdo já enviado"""
+    compressor = zlib.compressobj(nivel, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for parte in partes:
+        dados = compressor.compress(parte)
+        if dados:
+            yield dados
+    yield compressor.flush()
+
+
+def resposta_exportacao(nome: str, lotes: Iterable[List[Dict]], formato: str) -> Response:
+    """Resposta em streaming (chunked) do formato pedido.
+
+    Fica fora do cache e do CompressorRespostas: o corpo nunca existe
+    inteiro em memória. O gzip é feito aqui, parte a parte.
+    """
+    partes = partes_ndjson(lotes) if formato == 'ndjson' else partes_csv(lotes)
+    corpo = (parte.encode('utf-8') for parte in partes)
+    cabecalhos = {
+        'Content-Disposition': f'attachment; filename="{nome}.{formato}"',
+        'Cache-Control': 'no-store'
+    }
+    if request.accept_encodings['gzip']:
+        corpo = comprimir_gzip(corpo)
+        cabecalhos['Content-Encoding'] = 'gzip'
+
+    resposta = Response(stream_with_context(corpo), mimetype=FORMATOS[formato], headers=cabecalhos)
+    resposta.vary.add('Accept-Encoding')
+    return resposta
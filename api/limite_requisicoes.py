@@ -0,0 +1,119 @@
+"""
+Limite de taxa (token bucket por cliente) e de concorrência das rotas pesadas, configurados por SECURITY_CONFIG
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Dict, List
+
+from flask import jsonify, make_response
+
+
+class LimitadorRequisicoes:
+    """Token bucket por cliente (chave de API ou IP).
+
+    Cada cliente tem até `rajada` fichas, repostas à taxa de
+    requisicoes_por_minuto; cada requisição consome uma. Um balde cheio
+    equivale a um cliente sem registro, então os clientes inativos há mais
+    tempo são descartados acima de max_clientes. Os baldes são do processo:
+    com N workers, um cliente pode chegar a N vezes a taxa configurada.
+    """
+
+    def __init__(self, requisicoes_por_minuto: int, rajada: int, max_clientes: int = 10000):
+        self.taxa = requisicoes_por_minuto / 60.0
+        self.rajada = max(1, rajada)
+        self.max_clientes = max_clientes
+        self._baldes: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._metricas = {'permitidas': 0, 'rejeitadas': 0}
+
+    def consumir(self, cliente: str) -> float:
+        """Consome uma ficha do cliente; retorna 0 se permitido, senão os segundos até a próxima ficha"""
+        agora = time.monotonic()
+        with self._lock:
+            balde = self._baldes.get(cliente)
+            if balde is None:
+                balde = self._baldes[cliente] = [float(self.rajada), agora]
+                while len(self._baldes) > self.max_clientes:
+                    self._baldes.popitem(last=False)
+            else:
+                self._baldes.move_to_end(cliente)
+                balde[0] = min(self.rajada, balde[0] + (agora - balde[1]) * self.taxa)
+                balde[1] = agora
+
+            if balde[0] >= 1:
+                balde[0] -= 1
+                self._metricas['permitidas'] += 1
+                return 0.0
+            self._metricas['rejeitadas'] += 1
+            return (1 - balde[0]) / self.taxa if self.taxa > 0 else 60.0
+
+    def estatisticas(self) -> Dict:
+        with self._lock:
+            metricas = dict(self._metricas)
+            metricas['clientes'] = len(self._baldes)
+        metricas.update({'requisicoes_por_minuto': round(self.taxa * 60), 'rajada': self.rajada})
+        return metricas
+
+
+class LimiteConcorrencia:
+    """Máximo de execuções simultâneas das rotas pesadas (estatísticas, busca, exportação).
+
+    Acima do limite a requisição recebe 503 na hora, em vez de esperar e
+    acumular leitores concorrentes no SQLite. Respostas em streaming ocupam
+    a vaga até o fim do envio. Aplicado por dentro do cache: acertos e 304
+    não contam.
+    """
+
+    def __init__(self, maximo: int, retry_after: int = 1):
+        self.maximo = maximo
+        self.retry_after = retry_after
+        self._vagas = threading.BoundedSemaphore(maximo)
+        self._lock = threading.Lock()
+        self._metricas = {'em_execucao': 0, 'rejeitadas': 0}
+
+    def _liberar(self):
+        with self._lock:
+            self._metricas['em_execucao'] -= 1
+        self._vagas.release()
+
+    def limitar(self, funcao):
+        """Decorator de rota pesada"""
+        @wraps(funcao)
+        def rota(*args, **kwargs):
+            if not self._vagas.acquire(blocking=False):
+                with self._lock:
+                    self._metricas['rejeitadas'] += 1
+                resposta = make_response(jsonify({'error': 'Servidor ocupado, tente novamente'}), 503)
+                resposta.headers['Retry-After'] = str(self.retry_after)
+                return resposta
+            with self._lock:
+                self._metricas['em_execucao'] += 1
+
+            try:
+                resposta = make_response(funcao(*args, **kwargs))
+            except BaseException:
+                self._liberar()
+                raise
+            if resposta.is_streamed:
+                resposta.call_on_close(self._liberar)
+            else:
+                self._liberar()
+            return resposta
+        return rota
+
+    def estatisticas(self) -> Dict:
+        with self._lock:
+            metricas = dict(self._metricas)
+        metricas['maximo'] = self.maximo
+        return metricas
+
+
+def resposta_limite_taxa(espera: float):
+    """429 com Retry-After em segundos inteiros"""
+    resposta = make_response(jsonify({'error': 'Limite de requisições excedido'}), 429)
+    resposta.headers['Retry-After'] = str(max(1, math.ceil(espera)))
+    return resposta
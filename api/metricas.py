@@ -0,0 +1,194 @@
+"""
+Métricas da API no formato de exposição de texto do Prometheus (/api/metrics)
+"""
+
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from flask import g, request
+
+# Limites (segundos) dos histogramas de latência
+BUCKETS_REQUISICAO = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_CONSULTA = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+TIPO_CONTEUDO = 'text/plain; version=0.0.4; charset=utf-8'
+
+# (nome, tipo, ajuda, [(rótulos, valor)]) de uma métrica calculada na coleta
+Familia = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+class Histograma:
+    """Contagens por faixa, soma e total de observações"""
+
+    __slots__ = ('limites', 'contagens', 'soma', 'total')
+
+    def __init__(self, limites: Tuple[float, ...]):
+        self.limites = limites
+        self.contagens = [0] * (len(limites) + 1)
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor: float):
+        self.contagens[bisect_left(self.limites, valor)] += 1
+        self.soma += valor
+        self.total += 1
+
+
+def _rotulos(rotulos) -> str:
+    if not rotulos:
+        return ''
+    pares = ','.join('{}="{}"'.format(nome, str(valor).replace('\\', '\\\\').replace('"', '\\"')
+                                       .replace('\n', '\\n'))
+                     for nome, valor in rotulos)
+    return '{' + pares + '}'
+
+
+def _valor(valor: float) -> str:
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class RegistroMetricas:
+    """Contadores e histogramas atualizados nas requisições, e métricas calculadas na coleta.
+
+    Cada observação custa um lock e algumas somas; o texto de exposição só
+    é montado quando /api/metrics é consultada. Os valores são do processo.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._familias: Dict[str, Tuple[str, str, Tuple[float, ...]]] = {}
+        self._contadores: Dict[Tuple[str, Tuple], float] = {}
+        self._histogramas: Dict[Tuple[str, Tuple], Histograma] = {}
+        self._coletores: List[Callable[[], Iterable[Familia]]] = []
+
+    def registrar(self, nome: str, tipo: str, ajuda: str, limites: Tuple[float, ...] = None):
+        self._familias[nome] = (tipo, ajuda, limites)
+
+    def incrementar(self, nome: str, rotulos: Tuple = (), valor: float = 1):
+        chave = (nome, rotulos)
+        with self._lock:
+            self._contadores[chave] = self._contadores.get(chave, 0) + valor
+
+    def observar(self, nome: str, rotulos: Tuple, valor: float):
+        chave = (nome, rotulos)
+        with self._lock:
+            histograma = self._histogramas.get(chave)
+            if histograma is None:
+                histograma = self._histogramas[chave] = Histograma(self._familias[nome][2])
+            histograma.observar(valor)
+
+    def coletor(self, funcao: Callable[[], Iterable[Familia]]):
+        """Registra uma função chamada a cada coleta (gauges e contadores de outros componentes)"""
+        self._coletores.append(funcao)
+        return funcao
+
+    def exportar(self) -> str:
+        """Texto de exposição do Prometheus"""
+        with self._lock:
+            contadores = sorted(self._contadores.items())
+            histogramas = sorted(((chave, (list(h.contagens), h.soma, h.total))
+                                  for chave, h in self._histogramas.items()), key=lambda item: item[0])
+
+        linhas = []
+        for nome, (tipo, ajuda, limites) in sorted(self._familias.items()):
+            linhas.append(f"# HELP {nome} {ajuda}")
+            linhas.append(f"# TYPE {nome} {tipo}")
+            if tipo == 'histogram':
+                for (nome_h, rotulos), (contagens, soma, total) in histogramas:
+                    if nome_h != nome:
+                        continue
+                    acumulado = 0
+                    for limite, contagem in zip(limites + (float('inf'),), contagens):
+                        acumulado += contagem
+                        le = '+Inf' if limite == float('inf') else repr(limite)
+                        linhas.append(f"{nome}_bucket{_rotulos(rotulos + (('le', le),))} {acumulado}")
+                    linhas.append(f"{nome}_sum{_rotulos(rotulos)} {soma!r}")
+                    linhas.append(f"{nome}_count{_rotulos(rotulos)} {total}")
+            else:
+                for (nome_c, rotulos), valor in contadores:
+                    if nome_c == nome:
+                        linhas.append(f"{nome}{_rotulos(rotulos)} {_valor(valor)}")
+
+        for coletor in self._coletores:
+            for nome, tipo, ajuda, amostras in coletor():
+                linhas.append(f"# HELP {nome} {ajuda}")
+                linhas.append(f"# TYPE {nome} {tipo}")
+                for rotulos, valor in amostras:
+                    linhas.append(f"{nome}{_rotulos(tuple(sorted(rotulos.items())))} {_valor(valor)}")
+        return '\n'.join(linhas) + '\n'
+
+    def instrumentar_app(self, app):
+        """Contagem e latência por rota (regra de URL, não o caminho: cardinalidade limitada).
+
+        Registrar antes dos demais after_request: o Flask os executa em ordem
+        inversa, e assim a latência inclui, por exemplo, a compressão.
+        """
+        self.registrar('api_requisicoes_total', 'counter', 'Requisições por rota, método e status')
+        self.registrar('api_requisicao_duracao_segundos', 'histogram',
+                       'Latência das requisições por rota (até o envio dos cabeçalhos em streaming)',
+                       BUCKETS_REQUISICAO)
+
+        @app.before_request
+        def iniciar_medicao():
+            g.inicio_requisicao = time.perf_counter()
+
+        @app.after_request
+        def registrar_requisicao(resposta):
+            inicio = g.pop('inicio_requisicao', None)
+            if inicio is not None:
+                rota = request.url_rule.rule if request.url_rule is not None else 'sem_rota'
+                self.incrementar('api_requisicoes_total',
+                                 (('metodo', request.method), ('rota', rota), ('status', str(resposta.status_code))))
+                self.observar('api_requisicao_duracao_segundos', (('rota', rota),),
+                              time.perf_counter() - inicio)
+            return resposta
+
+
+def instrumentar_db(db_manager, registro: RegistroMetricas):
+    """Mede o tempo de cada método público do DatabaseManager e quantos estão em execução.
+
+    Cada chamada abre a própria conexão, então as chamadas em execução
+    equivalem às conexões em uso. Chamadas aninhadas (um método que chama
+    outro) contam uma vez, pela mais externa.
+    """
+    registro.registrar('db_consulta_duracao_segundos', 'histogram',
+                       'Tempo das chamadas ao DatabaseManager por método', BUCKETS_CONSULTA)
+    local = threading.local()
+    em_execucao = [0]
+    lock = threading.Lock()
+
+    def medir(nome, metodo):
+        rotulos = (('metodo', nome),)
+
+        @wraps(metodo)
+        def medido(*args, **kwargs):
+            if getattr(local, 'profundidade', 0):
+                return metodo(*args, **kwargs)
+            local.profundidade = 1
+            with lock:
+                em_execucao[0] += 1
+            inicio = time.perf_counter()
+            try:
+                return metodo(*args, **kwargs)
+            finally:
+                registro.observar('db_consulta_duracao_segundos', rotulos, time.perf_counter() - inicio)
+                with lock:
+                    em_execucao[0] -= 1
+                local.profundidade = 0
+        return medido
+
+    for nome, metodo in inspect.getmembers(db_manager, inspect.ismethod):
+        # Geradores rodam depois do retorno: o tempo medido seria só o da criação
+        if nome.startswith('_') or inspect.isgeneratorfunction(inspect.unwrap(metodo)):
+            continue
+        setattr(db_manager, nome, medir(nome, metodo))
+
+    @registro.coletor
+    def coletar():
+        yield ('db_chamadas_em_execucao', 'gauge',
+               'Chamadas ao DatabaseManager em execução (conexões SQLite abertas pela API)',
+               [({}, em_execucao[0])])
@@ -0,0 +1,113 @@
+"""
+Verificação de saúde da API (/api/health): banco, integridade, atualização do ETL e bloqueios
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from etl.database_manager import DatabaseManager
+
+# Do melhor para o pior
+NIVEIS = ('healthy', 'degraded', 'unhealthy')
+
+
+class VerificadorSaude:
+    """Estado da API para balanceadores de carga e monitoramento.
+
+    - unhealthy: o banco não pode ser lido, ou o quick_check achou problemas
+    - degraded: leitura lenta ou travada, ETL atrasado (mais de duas vezes
+      o intervalo de atualização sem sucesso), WAL grande ou muitas falhas
+      por banco ocupado/travado na janela recente
+
+    O resultado fica em cache por ttl segundos: com o balanceador
+    consultando várias vezes por segundo, o banco é verificado uma vez por
+    intervalo. O PRAGMA quick_check lê o arquivo inteiro e roda no máximo a
+    cada intervalo_integridade segundos; entre execuções vale o último resultado.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, intervalo_etl: int, ttl: float = 5,
+                 intervalo_integridade: float = 300, latencia_max_ms: float = 500,
+                 wal_max_bytes: int = 64 * 1024 * 1024, bloqueios_max: int = 5, janela_bloqueios: float = 300):
+        self.db_manager = db_manager
+        self.intervalo_etl = intervalo_etl
+        self.ttl = ttl
+        self.intervalo_integridade = intervalo_integridade
+        self.latencia_max_ms = latencia_max_ms
+        self.wal_max_bytes = wal_max_bytes
+        self.bloqueios_max = bloqueios_max
+        self.janela_bloqueios = janela_bloqueios
+        self._lock = threading.Lock()
+        self._resultado: Optional[Dict] = None
+        self._expira_em = 0.0
+        self._integridade: Optional[Dict] = None
+        self._proxima_integridade = 0.0
+
+    def verificar(self) -> Dict:
+        """Resultado da última verificação, refeita se passou do ttl (uma por vez)"""
+        with self._lock:
+            if self._resultado is None or time.monotonic() >= self._expira_em:
+                self._resultado = self._calcular()
+                self._expira_em = time.monotonic() + self.ttl
+            return self._resultado
+
+    def _calcular(self) -> Dict:
+        problemas: List[Tuple[str, str]] = []
+
+        verificar_integridade = time.monotonic() >= self._proxima_integridade
+        banco = self.db_manager.verificar_saude(integridade=verificar_integridade)
+        if 'integridade' in banco:
+            self._integridade = {
+                'resultado': banco.pop('integridade'),
+                'duracao_ms': banco.pop('integridade_ms'),
+                'verificado_em': datetime.now().isoformat()
+            }
+            self._proxima_integridade = time.monotonic() + self.intervalo_integridade
+
+        if not banco['ok']:
+            if banco.get('bloqueado'):
+                problemas.append(('degraded', f"Banco travado na leitura: {banco['erro']}"))
+            else:
+                problemas.append(('unhealthy', f"Banco inacessível: {banco['erro']}"))
+        elif banco['leitura_ms'] > self.latencia_max_ms:
+            problemas.append(('degraded', f"Leitura lenta: {banco['leitura_ms']} ms"))
+        if self._integridade and self._integridade['resultado'] != 'ok':
+            problemas.append(('unhealthy', f"quick_check: {self._integridade['resultado']}"))
+        if banco['wal_bytes'] > self.wal_max_bytes:
+            problemas.append(('degraded', f"WAL com {banco['wal_bytes']} bytes"))
+
+        etl = {'intervalo_segundos': self.intervalo_etl}
+        ultima = self.db_manager.get_ultima_atualizacao() if banco['ok'] else None
+        if ultima is not None:
+            etl.update({
+                'ultima_execucao_sucesso': ultima['data_atualizacao'],
+                'idade_segundos': round(ultima['idade_segundos'], 1),
+                'eventos_novos': ultima['eventos_novos'],
+                'eventos_atualizados': ultima['eventos_atualizados']
+            })
+            # Tolera uma execução perdida
+            if ultima['idade_segundos'] > 2 * self.intervalo_etl:
+                problemas.append(('degraded', f"ETL sem sucesso há {int(ultima['idade_segundos'])} s"))
+        elif banco['ok']:
+            problemas.append(('degraded', 'ETL nunca executado com sucesso'))
+
+        bloqueios = {
+            'recentes': self.db_manager.falhas_bloqueio_recentes(self.janela_bloqueios),
+            'janela_segundos': self.janela_bloqueios,
+            'total': self.db_manager.falhas_bloqueio_total
+        }
+        if bloqueios['recentes'] > self.bloqueios_max:
+            problemas.append(('degraded', f"{bloqueios['recentes']} falhas por banco ocupado/travado"))
+
+        status = max((nivel for nivel, _ in problemas), key=NIVEIS.index, default='healthy')
+        return {
+            'status': status,
+            'timestamp': datetime.now().isoformat(),
+            'database': 'connected' if banco['ok'] else 'error',
+            'problemas': [mensagem for _, mensagem in problemas],
+            'banco': banco,
+            'integridade': self._integridade,
+            'etl': etl,
+            'bloqueios': bloqueios
+        }
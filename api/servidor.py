@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Servidor de produção da API: workers pré-criados por fork (prefork) ou um processo com threads
+
+Uso: python api/servidor.py [--workers N] [--host HOST] [--port PORTA]
+
+Sem --workers, usa API_CONFIG['workers'] (API_WORKERS). Mesmo com 1 worker
+há um mestre, para que SIGHUP recarregue sem derrubar o servidor. Em
+plataformas sem fork, atende em um único processo com threads. Com
+API_DEBUG=true, usa o servidor de desenvolvimento do Flask (debugger e
+reloader), que não deve ser exposto.
+
+Sinais do processo mestre:
+    SIGHUP   recarrega o modelo de palavras-chave e os estáticos e troca os
+             workers; os antigos terminam as requisições em curso
+    SIGTERM  encerra (SIGINT / Ctrl+C também)
+"""
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+# Adicionar diretório pai ao path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.serving import make_server
+
+from config import API_CONFIG
+
+
+class ServidorPrefork:
+    """Mestre que abre o socket, carrega a aplicação e cria os workers por fork.
+
+    A aplicação, com o modelo de palavras-chave compilado e os arquivos de
+    web/ já comprimidos, é carregada uma vez no mestre antes do fork: cada
+    worker começa pronto e compartilha essas páginas de memória com os demais
+    (copy-on-write). Os workers aceitam conexões do mesmo socket e atendem
+    cada requisição em uma thread. Um worker que morre é substituído.
+    """
+
+    def __init__(self, app, host: str, port: int, workers: int, timeout_encerramento: float = 30,
+                 preparar: Optional[Callable[[], None]] = None):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.timeout_encerramento = timeout_encerramento
+        self.preparar = preparar
+        self.socket: Optional[socket.socket] = None
+        self._geracao = 0
+        self._workers: Dict[int, int] = {}  # pid -> geração
+        self._prazos: Dict[int, float] = {}  # pid em encerramento -> prazo para SIGKILL
+        self._recarregar = False
+        self._parar = False
+
+    def executar(self):
+        """Abre o socket, cria os workers e os supervisiona até SIGTERM/SIGINT"""
+        familia = socket.AF_INET6 if ':' in self.host else socket.AF_INET
+        self.socket = socket.create_server((self.host, self.port), family=familia, backlog=2048)
+        self.socket.set_inheritable(True)
+
+        signal.signal(signal.SIGHUP, self._sinal_recarregar)
+        signal.signal(signal.SIGTERM, self._sinal_parar)
+        signal.signal(signal.SIGINT, self._sinal_parar)
+
+        print(f"Servidor da API em http://{self.host}:{self.port} (mestre {os.getpid()}, {self.workers} workers)")
+        self._preparar()
+        for _ in range(self.workers):
+            self._criar_worker()
+
+        try:
+            while not self._parar:
+                time.sleep(0.5)
+                self._recolher_workers()
+                if self._recarregar:
+                    self._recarregar = False
+                    self._trocar_workers()
+                self._forcar_encerramento()
+        finally:
+            self._encerrar()
+
+    def _sinal_recarregar(self, signum, frame):
+        self._recarregar = True
+
+    def _sinal_parar(self, signum, frame):
+        self._parar = True
+
+    def _preparar(self):
+        """Carrega no mestre o que os workers vão herdar prontos"""
+        if self.preparar:
+            self.preparar()
+        # Objetos já carregados ficam fora das coletas: menos páginas copiadas nos workers
+        gc.collect()
+        gc.freeze()
+
+    def _criar_worker(self):
+        pid = os.fork()
+        if pid == 0:
+            codigo = 0
+            try:
+                self._executar_worker()
+            except BaseException as e:
+                print(f"Erro no worker {os.getpid()}: {e}")
+                codigo = 1
+            finally:
+                os._exit(codigo)
+        self._workers[pid] = self._geracao
+
+    def _executar_worker(self):
+        """Atende requisições até SIGTERM; então termina as que estão em curso"""
+        parar = threading.Event()
+        signal.signal(signal.SIGTERM, lambda signum, frame: parar.set())
+        # Ctrl+C e SIGHUP chegam ao grupo de processos; quem decide é o mestre
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+
+        servidor = make_server(self.host, self.port, self.app, threaded=True, fd=self.socket.fileno())
+        # server_close() aguarda as threads das requisições em curso
+        servidor.daemon_threads = False
+        servidor.block_on_close = True
+        threading.Thread(target=servidor.serve_forever, name='servidor-worker', daemon=True).start()
+
+        while not parar.wait(1):
+            if os.getppid() == 1:
+                # Mestre morreu sem encerrar os workers
+                break
+        servidor.shutdown()
+        servidor.server_close()
+
+    def _recolher_workers(self):
+        """Recolhe workers encerrados e repõe os da geração atual"""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            geracao = self._workers.pop(pid, None)
+            self._prazos.pop(pid, None)
+            if geracao == self._geracao and not self._parar:
+                print(f"Worker {pid} terminou (status {status}); criando outro")
+                self._criar_worker()
+
+    def _trocar_workers(self):
+        """SIGHUP: nova geração de workers; a anterior termina o que está em curso"""
+        antigos = list(self._workers)
+        self._geracao += 1
+        print(f"Recarregando: geração {self._geracao} de workers")
+        try:
+            self._preparar()
+        except Exception as e:
+            print(f"Erro ao recarregar; workers atuais mantidos: {e}")
+            self._geracao -= 1
+            return
+        for _ in range(self.workers):
+            self._criar_worker()
+        self._sinalizar_encerramento(antigos)
+
+    def _sinalizar_encerramento(self, pids):
+        prazo = time.monotonic() + self.timeout_encerramento
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                self._prazos[pid] = prazo
+            except ProcessLookupError:
+                pass
+
+    def _forcar_encerramento(self):
+        """SIGKILL em workers que passaram do prazo (ex.: streams SSE abertos)"""
+        agora = time.monotonic()
+        for pid, prazo in list(self._prazos.items()):
+            if prazo <= agora:
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                del self._prazos[pid]
+
+    def _encerrar(self):
+        self._parar = True
+        print("Encerrando workers...")
+        self._sinalizar_encerramento([pid for pid in self._workers if pid not in self._prazos])
+        while self._workers:
+            self._recolher_workers()
+            self._forcar_encerramento()
+            time.sleep(0.1)
+        self.socket.close()
+        print("Servidor encerrado")
+
+
+def servir_com_threads(app, host: str, port: int):
+    """Um processo, uma thread por requisição (plataformas sem fork; sem recarga por SIGHUP)"""
+    servidor = make_server(host, port, app, threaded=True)
+    print(f"Servidor da API em http://{host}:{port} (processo {os.getpid()}, threads)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor de produção da API')
+    parser.add_argument('--host', default=API_CONFIG['host'])
+    parser.add_argument('--port', type=int, default=API_CONFIG['port'])
+    parser.add_argument('--workers', type=int, default=API_CONFIG['workers'])
+    args = parser.parse_args()
+
+    # Carregada no mestre, antes do fork dos workers
+    from api.app import app, categorizador, estaticos
+
+    if API_CONFIG['debug']:
+        print("API_DEBUG=true: usando o servidor de desenvolvimento (não exponha em produção)")
+        app.run(debug=True, host=args.host, port=args.port)
+        return
+
+    if not hasattr(os, 'fork'):
+        servir_com_threads(app, args.host, args.port)
+        return
+
+    def preparar():
+        categorizador.recarregar_modelo()
+        estaticos.precomprimir()
+
+    ServidorPrefork(app, args.host, args.port, max(1, args.workers),
+                    timeout_encerramento=API_CONFIG['timeout_encerramento'],
+                    preparar=preparar).executar()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Stream (Server-Sent Events) das alterações de eventos, alimentado pelo journal
+"""
+
+import json
+import os
+import queue
+import threading
+from typing import Iterator, Optional
+
+from etl.barramento_eventos import BarramentoEventos
+from etl.database_manager import DatabaseManager
+
+TIPOS_MENSAGEM = {'INSERT': 'novo', 'UPDATE': 'atualizado', 'DELETE': 'removido'}
+
+
+def formatar_mensagem(alteracao: dict) -> str:
+    """Mensagem SSE de uma alteração do journal"""
+    dados = json.dumps({
+        'evento_id_externo': alteracao['evento_id_externo'],
+        'evento': alteracao['evento']
+    }, ensure_ascii=False, default=str)
+    return f"id: {alteracao['id']}\nevent: {TIPOS_MENSAGEM[alteracao['operacao']]}\ndata: {dados}\n\n"
+
+
+class StreamEventos:
+    """Lê journal_eventos e publica as alterações no barramento para os clientes SSE.
+
+    Uma única thread por processo consulta o banco, e só quando o contador de
+    alteração de eventos muda (verificado via PRAGMA data_version) ou quando
+    uma gravação no próprio processo sinaliza o barramento. Entre alterações,
+    clientes conectados não geram consultas.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, obter_versoes, barramento: BarramentoEventos,
+                 intervalo: float = 1.0, keepalive: float = 15.0, max_reenvio: int = 1000):
+        self.db_manager = db_manager
+        self.obter_versoes = obter_versoes
+        self.barramento = barramento
+        self.intervalo = intervalo
+        self.keepalive = keepalive
+        self.max_reenvio = max_reenvio
+        self._lock = threading.Lock()
+        self._pid = None
+        self._ultimo_id = 0
+
+    def _garantir_leitor(self):
+        """Inicia a thread leitora no processo atual (também após fork)"""
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._ultimo_id = self.db_manager.get_limites_journal_eventos()[1]
+            threading.Thread(target=self._ler_journal, name='leitor-journal-eventos', daemon=True).start()
+
+    def _ler_journal(self):
+        versao_eventos = None
+        while True:
+            sinalizado = self.barramento.aguardar_sinal(self.intervalo)
+            versoes = self.obter_versoes() or {}
+            if not sinalizado and versoes.get('eventos') == versao_eventos:
+                continue
+            versao_eventos = versoes.get('eventos')
+
+            while True:
+                alteracoes = self.db_manager.get_journal_eventos(self._ultimo_id)
+                if not alteracoes:
+                    break
+                self.barramento.publicar([(alteracao['id'], formatar_mensagem(alteracao))
+                                          for alteracao in alteracoes])
+                self._ultimo_id = alteracoes[-1]['id']
+
+    def gerar(self, ultimo_id_cliente: Optional[int]) -> Iterator[str]:
+        """Mensagens SSE para um cliente, retomando após ultimo_id_cliente se informado"""
+        self._garantir_leitor()
+        # Assina antes de ler o journal: nada publicado entre as duas etapas se perde
+        assinatura = self.barramento.assinar()
+        try:
+            yield f"retry: {int(self.intervalo * 5000)}\n\n"
+
+            minimo, maximo = self.db_manager.get_limites_journal_eventos()
+            enviado = maximo
+            if ultimo_id_cliente is not None and ultimo_id_cliente < maximo:
+                if ultimo_id_cliente < minimo - 1 or maximo - ultimo_id_cliente > self.max_reenvio:
+                    # Alterações já podadas do journal, ou atraso grande: recarregar tudo
+                    yield f"id: {maximo}\nevent: reset\ndata: {{}}\n\n"
+                else:
+                    enviado = ultimo_id_cliente
+                    while enviado < maximo:
+                        alteracoes = self.db_manager.get_journal_eventos(enviado)
+                        if not alteracoes:
+                            break
+                        for alteracao in alteracoes:
+                            yield formatar_mensagem(alteracao)
+                        enviado = alteracoes[-1]['id']
+
+            while not assinatura.atrasada:
+                try:
+                    journal_id, mensagem = assinatura.fila.get(timeout=self.keepalive)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                if journal_id > enviado:
+                    enviado = journal_id
+                    yield mensagem
+
+            yield f"event: reset\ndata: {{}}\n\n"
+        finally:
+            self.barramento.cancelar(assinatura)
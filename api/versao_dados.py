@@ -0,0 +1,116 @@
+"""
+Versão dos dados do banco para ETags e requisições condicionais (304)
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Dict, Optional, Tuple
+
+from flask import Response, make_response, request
+
+from api.compressao import etags_variantes
+
+
+class VersaoDados:
+    """Contadores de alteração das tabelas, relidos só quando o banco muda.
+
+    Uma conexão dedicada consulta PRAGMA data_version, que muda quando outra
+    conexão (de qualquer processo) grava no banco. Enquanto não muda, as
+    versões lidas de contadores_alteracao continuam valendo e a verificação
+    custa uma consulta sem E/S.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = None
+        self._data_version = None
+        self._versoes: Dict[str, int] = {}
+        self._datas: Dict[str, str] = {}
+
+    def _conexao(self) -> sqlite3.Connection:
+        """Conexão do processo atual (recriada após fork)"""
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._pid = os.getpid()
+            self._data_version = None
+        return self._conn
+
+    def atual(self) -> Optional[Tuple[Dict[str, int], Dict[str, str]]]:
+        """(versão, data da última alteração) por tabela; None se o banco não pôde ser lido"""
+        with self._lock:
+            try:
+                conn = self._conexao()
+                data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+                if data_version != self._data_version:
+                    linhas = conn.execute(
+                        "SELECT tabela, versao, data_alteracao FROM contadores_alteracao"
+                    ).fetchall()
+                    self._versoes = {tabela: versao for tabela, versao, _ in linhas}
+                    self._datas = {tabela: data for tabela, _, data in linhas if data}
+                    self._data_version = data_version
+                return self._versoes, self._datas
+            except sqlite3.Error as e:
+                print(f"Erro ao ler versão dos dados: {e}")
+                self._conn = None
+                return None
+
+    def versoes(self) -> Optional[Dict[str, int]]:
+        """Versão de cada tabela monitorada"""
+        atual = self.atual()
+        return atual[0] if atual else None
+
+    def condicional(self, *tabelas: str, janela: int = None):
+        """Decorator de rota GET: ETag forte, Last-Modified e 304 sem executar a consulta.
+
+        A ETag combina rota, parâmetros e versões das tabelas. Rotas que
+        dependem do relógio (ex.: últimas 24 horas) informam uma janela em
+        segundos, que também entra na ETag; nelas não há Last-Modified.
+        """
+        def decorador(funcao):
+            @wraps(funcao)
+            def rota(*args, **kwargs):
+                atual = self.atual() if request.method == 'GET' else None
+                if atual is None:
+                    return funcao(*args, **kwargs)
+
+                versoes, datas = atual
+                parametros = sorted((nome, valor) for nome, valor in request.args.items(multi=True) if valor != '')
+                chave = [request.path, parametros, [(tabela, versoes.get(tabela, 0)) for tabela in tabelas]]
+                if janela:
+                    chave.append(int(time.time() // janela))
+                etag = hashlib.sha1(repr(chave).encode('utf-8')).hexdigest()[:20]
+
+                ultima_alteracao = None
+                if not janela and all(tabela in datas for tabela in tabelas):
+                    ultima_alteracao = max(
+                        datetime.strptime(datas[tabela], '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
+                        for tabela in tabelas
+                    )
+
+                if request.if_none_match:
+                    # O cliente pode ter guardado a variante comprimida (ETag com sufixo)
+                    etag_cliente = next((variante for variante in etags_variantes(etag)
+                                         if request.if_none_match.contains(variante)), None)
+                    inalterado = etag_cliente is not None
+                else:
+                    etag_cliente = None
+                    inalterado = (ultima_alteracao is not None and request.if_modified_since is not None
+                                  and ultima_alteracao <= request.if_modified_since)
+
+                resposta = Response(status=304) if inalterado else make_response(funcao(*args, **kwargs))
+                if resposta.status_code in (200, 304):
+                    resposta.set_etag(etag_cliente or etag)
+                    if ultima_alteracao is not None:
+                        resposta.last_modified = ultima_alteracao
+                    # Revalidar a cada uso: a resposta muda assim que o ETL grava
+                    resposta.headers['Cache-Control'] = 'no-cache'
+                return resposta
+            return rota
+        return decorador
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Benchmark de desempenho e acurácia da categorização sobre corpus sintético
+
+Para cada escala e índice de palavras-chave ('tokens', 'substring') mede
+categorizar_evento e categorizar_lote (eventos/s), o pico de memória
+alocada (tracemalloc, em uma amostra) e a concordância com os rótulos do
+corpus sintético e dos exemplos de sample_data. O resultado vai para um JSON
+com o commit atual, para comparação entre versões.
+
+Uso: python benchmarks/benchmark_categorizacao.py [--escalas 10000,100000,1000000]
+     [--indices tokens,substring] [--saida resultados.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from itertools import islice
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl.database_manager import DatabaseManager
+from etl.categorizador import CategorizadorEventos
+from benchmarks.corpus_sintetico import gerar_corpus, gold_set_exemplos
+
+
+def commit_atual() -> str:
+    """Hash do commit do repositório, quando disponível"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return 'desconhecido'
+
+
+def lotes(eventos, tamanho: int):
+    """Divide um iterador de eventos em listas de até tamanho itens"""
+    while True:
+        lote = list(islice(eventos, tamanho))
+        if not lote:
+            return
+        yield lote
+
+
+def concordancia(eventos) -> dict:
+    """Acurácia e cobertura da área atribuída em relação a area_gold"""
+    total = acertos = categorizados = 0
+    erros = Counter()
+    for evento in eventos:
+        total += 1
+        area = evento.get('area_tecnica')
+        if area:
+            categorizados += 1
+        if area == evento['area_gold']:
+            acertos += 1
+        else:
+            erros[f"{evento['area_gold']} -> {area}"] += 1
+    return {
+        'eventos': total,
+        'acuracia': round(acertos / total, 4) if total else None,
+        'cobertura': round(categorizados / total, 4) if total else None,
+        'erros_mais_comuns': dict(erros.most_common(5))
+    }
+
+
+def medir_indice(indice: str, quantidade: int, args) -> dict:
+    """Mede um índice em uma escala, com banco (e cache de categorização) vazio"""
+    with tempfile.TemporaryDirectory() as diretorio:
+        categorizador = CategorizadorEventos(DatabaseManager(os.path.join(diretorio, 'bench.db')), indice=indice)
+
+        # categorizar_lote em lotes do tamanho usado pelo ETL
+        tempo_lote = 0.0
+        avaliados = []
+        for lote in lotes(gerar_corpus(quantidade, args.semente), args.tamanho_lote):
+            inicio = time.perf_counter()
+            categorizador.categorizar_lote(lote)
+            tempo_lote += time.perf_counter() - inicio
+            avaliados.extend({'area_tecnica': e.get('area_tecnica'), 'area_gold': e['area_gold']} for e in lote)
+
+        # categorizar_evento em uma amostra (custo linear por evento)
+        amostra = list(gerar_corpus(min(quantidade, args.max_por_evento), args.semente + 1))
+        inicio = time.perf_counter()
+        for evento in amostra:
+            categorizador.categorizar_evento(evento)
+        tempo_evento = time.perf_counter() - inicio
+
+        # Alocações medidas à parte: tracemalloc desacelera a execução
+        amostra_alocacao = list(gerar_corpus(min(quantidade, args.amostra_alocacao), args.semente + 2))
+        tracemalloc.start()
+        categorizador.categorizar_lote(amostra_alocacao)
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        exemplos = gold_set_exemplos()
+        categorizador.categorizar_lote(exemplos)
+
+    return {
+        'categorizar_lote': {
+            'eventos': quantidade,
+            'segundos': round(tempo_lote, 3),
+            'eventos_por_segundo': round(quantidade / tempo_lote, 1) if tempo_lote else None
+        },
+        'categorizar_evento': {
+            'eventos': len(amostra),
+            'segundos': round(tempo_evento, 3),
+            'eventos_por_segundo': round(len(amostra) / tempo_evento, 1) if tempo_evento else None
+        },
+        'alocacao': {
+            'eventos': len(amostra_alocacao),
+            'pico_bytes': pico,
+            'pico_bytes_por_evento': round(pico / len(amostra_alocacao), 1) if amostra_alocacao else None
+        },
+        'concordancia': {
+            'sintetico': concordancia(avaliados),
+            'sample_data': concordancia(exemplos)
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--escalas', default='10000,100000,1000000')
+    parser.add_argument('--indices', default='tokens,substring')
+    parser.add_argument('--tamanho-lote', type=int, default=50000)
+    parser.add_argument('--max-por-evento', type=int, default=100000)
+    parser.add_argument('--amostra-alocacao', type=int, default=5000)
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--saida', default=None,
+                        help='arquivo JSON (padrão: benchmark_categorizacao_<commit>.json)')
+    args = parser.parse_args()
+
+    commit = commit_atual()
+    resultado = {
+        'commit': commit,
+        'data': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'parametros': vars(args),
+        'escalas': []
+    }
+
+    for quantidade in (int(valor) for valor in args.escalas.split(',')):
+        escala = {'eventos': quantidade, 'indices': {}}
+        for indice in args.indices.split(','):
+            medida = medir_indice(indice, quantidade, args)
+            escala['indices'][indice] = medida
+            print(f"{quantidade:>9} eventos | {indice:<9} | "
+                  f"lote {medida['categorizar_lote']['eventos_por_segundo']:>10,.0f}/s | "
+                  f"evento {medida['categorizar_evento']['eventos_por_segundo']:>10,.0f}/s | "
+                  f"pico {medida['alocacao']['pico_bytes_por_evento']:>8,.0f} B/evento | "
+                  f"acurácia {medida['concordancia']['sintetico']['acuracia']:.3f} "
+                  f"(exemplos {medida['concordancia']['sample_data']['acuracia']:.2f})")
+        resultado['escalas'].append(escala)
+
+    saida = args.saida or f"benchmark_categorizacao_{commit}.json"
+    with open(saida, 'w', encoding='utf-8') as arquivo:
+        json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+    print(f"Resultados gravados em {saida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
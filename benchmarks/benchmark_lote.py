@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Benchmark da categorização em lote (motor vetorizado) contra categorizar_evento por evento
+
+Uso: python benchmarks/benchmark_lote.py [--eventos 100000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl.database_manager import DatabaseManager
+from etl.categorizador import CategorizadorEventos
+from benchmarks.benchmark_matcher import gerar_eventos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--eventos', type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        categorizador = CategorizadorEventos(DatabaseManager(os.path.join(diretorio, 'bench.db')))
+        eventos = gerar_eventos(args.eventos)
+
+        inicio = time.perf_counter()
+        individual = [categorizador.categorizar_evento(evento) for evento in eventos]
+        tempo_individual = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        lote = [area for area, _, _ in categorizador.categorizar_com_scores(eventos)]
+        tempo_lote = time.perf_counter() - inicio
+
+    divergencias = sum(1 for a, b in zip(individual, lote) if a != b)
+    print(f"Eventos: {len(eventos)}")
+    print(f"Por evento: {tempo_individual:.2f}s ({len(eventos) / tempo_individual:,.0f} eventos/s)")
+    print(f"Lote vetorizado: {tempo_lote:.2f}s ({len(eventos) / tempo_lote:,.0f} eventos/s)")
+    print(f"Speedup: {tempo_individual / tempo_lote:.1f}x")
+    print(f"Divergências de área: {divergencias}")
+    return 1 if divergencias else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
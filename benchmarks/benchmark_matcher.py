@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos índices de palavras-chave contra a busca por substring original
+
+O índice 'substring' (Aho-Corasick) deve reproduzir exatamente os scores da
+implementação de referência; o índice 'tokens' (radicais RSLP) muda a
+semântica, então são reportadas as áreas que mudaram.
+
+Uso: python benchmarks/benchmark_matcher.py [--eventos 100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl.database_manager import DatabaseManager
+from etl.categorizador import CategorizadorEventos, SCORE_MINIMO
+from etl.sample_data import get_sample_eventos
+
+
+def gerar_eventos(quantidade: int, semente: int = 42):
+    """Gera eventos variando os exemplos com palavras-chave das áreas"""
+    aleatorio = random.Random(semente)
+    base = get_sample_eventos()
+    palavras = ['saúde', 'educação', 'orçamento', 'saneamento', 'transporte', 'turismo',
+                'previdência', 'habitação', 'cultura', 'consórcio', 'emergência']
+    eventos = []
+    for i in range(quantidade):
+        evento = dict(aleatorio.choice(base))
+        evento['evento_id_externo'] = f"bench::{i}"
+        evento['nome'] = f"{evento['nome']} nº {i}"
+        evento['tema'] = f"{evento['tema']} {aleatorio.choice(palavras)}"
+        eventos.append(evento)
+    return eventos
+
+
+def scores_referencia(categorizador, texto):
+    """Scores pela implementação de referência (substring)"""
+    return [(area['nome'], categorizador._calcular_score_area(texto, area))
+            for area in categorizador.areas_tecnicas]
+
+
+def melhor_area(scores):
+    """Área de maior score, ou None quando nenhuma atinge o score mínimo"""
+    nome, score = max(scores, key=lambda item: item[1], default=(None, 0))
+    return nome if score >= SCORE_MINIMO and score > 0 else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--eventos', type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        db_manager = DatabaseManager(os.path.join(diretorio, 'bench.db'))
+        substring = CategorizadorEventos(db_manager, indice='substring')
+        tokens = CategorizadorEventos(db_manager, indice='tokens')
+        textos = [substring._preparar_texto_analise(e) for e in gerar_eventos(args.eventos)]
+
+        inicio = time.perf_counter()
+        referencia = [scores_referencia(substring, texto) for texto in textos]
+        tempo_referencia = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        compilado = [substring._calcular_scores_areas(texto) for texto in textos]
+        tempo_compilado = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        por_tokens = [tokens._calcular_scores_areas(texto) for texto in textos]
+        tempo_tokens = time.perf_counter() - inicio
+
+    divergencias = sum(1 for a, b in zip(referencia, compilado) if a != b)
+    areas_alteradas = sum(1 for a, b in zip(referencia, por_tokens) if melhor_area(a) != melhor_area(b))
+    print(f"Eventos: {len(textos)}")
+    print(f"Substring: {tempo_referencia:.2f}s ({len(textos) / tempo_referencia:,.0f} eventos/s)")
+    print(f"Aho-Corasick: {tempo_compilado:.2f}s ({len(textos) / tempo_compilado:,.0f} eventos/s)")
+    print(f"Tokens/radicais: {tempo_tokens:.2f}s ({len(textos) / tempo_tokens:,.0f} eventos/s)")
+    print(f"Speedup Aho-Corasick: {tempo_referencia / tempo_compilado:.1f}x")
+    print(f"Speedup tokens: {tempo_referencia / tempo_tokens:.1f}x")
+    print(f"Divergências de score (Aho-Corasick): {divergencias}")
+    print(f"Área de maior score alterada (tokens): {areas_alteradas}")
+    return 1 if divergencias else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
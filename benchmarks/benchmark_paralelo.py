@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark da categorização paralela (pool de processos) de 1 a N processos
+
+Com 1 processo a avaliação ocorre no próprio processo (linha de base).
+
+Uso: python benchmarks/benchmark_paralelo.py [--eventos 200000] [--max-workers N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl.database_manager import DatabaseManager
+from etl.categorizador import CategorizadorEventos
+from etl.categorizacao_paralela import AvaliadorParalelo
+from benchmarks.benchmark_matcher import gerar_eventos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--eventos', type=int, default=200000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        categorizador = CategorizadorEventos(DatabaseManager(os.path.join(diretorio, 'bench.db')))
+        modelo = categorizador.modelo
+        textos = list(dict.fromkeys(
+            categorizador._preparar_texto_analise(e) for e in gerar_eventos(args.eventos)
+        ))
+
+        print(f"Textos distintos: {len(textos)} | núcleos disponíveis: {os.cpu_count()}")
+        referencia = None
+        tempo_base = None
+        for workers in range(1, args.max_workers + 1):
+            avaliador = AvaliadorParalelo(workers=workers, limiar=0)
+            # Pool iniciado (e modelo enviado) fora da medição
+            avaliador.avaliar(modelo, textos[:workers])
+
+            inicio = time.perf_counter()
+            resultado = avaliador.avaliar(modelo, textos)
+            tempo = time.perf_counter() - inicio
+            avaliador.fechar()
+
+            if referencia is None:
+                referencia, tempo_base = resultado, tempo
+            divergencias = sum(1 for a, b in zip(referencia, resultado) if a != b)
+            print(f"{workers:>2} processo(s): {tempo:.2f}s ({len(textos) / tempo:,.0f} textos/s) "
+                  f"speedup {tempo_base / tempo:.2f}x, divergências {divergencias}")
+            if divergencias:
+                return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark de vazão da API: servidor de desenvolvimento (python api/app.py) contra api/servidor.py
+
+Cada servidor sobe em um diretório temporário com um banco populado por
+eventos sintéticos. Clientes concorrentes (um processo cada, uma conexão por
+requisição) percorrem as rotas durante o tempo indicado. Mede requisições/s,
+latências p50/p99 e erros. Clientes e servidor dividem os núcleos da máquina:
+informe o número de núcleos junto com os resultados.
+
+Uso: python benchmarks/benchmark_servidor.py [--workers 1,4] [--clientes 16] [--duracao 10]
+     [--eventos 2000] [--rotas /api/areas,/api/eventos] [--sem-cache]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RAIZ)
+
+from etl.database_manager import DatabaseManager
+from benchmarks.benchmark_matcher import gerar_eventos
+
+ROTAS_PADRAO = '/api/areas,/api/eventos?limit=100,/api/estatisticas,/api/areas/contadores'
+
+
+def popular_banco(diretorio: str, quantidade: int):
+    """Banco em diretorio/database/, no caminho relativo padrão da API"""
+    db_manager = DatabaseManager(os.path.join(diretorio, 'database', 'agenda_congresso.db'))
+    for evento in gerar_eventos(quantidade):
+        db_manager.insert_evento(evento)
+
+
+def aguardar_servidor(url_base: str, processo: subprocess.Popen, timeout: float = 30) -> bool:
+    prazo = time.monotonic() + timeout
+    while time.monotonic() < prazo:
+        if processo.poll() is not None:
+            return False
+        try:
+            urllib.request.urlopen(f"{url_base}/api/health", timeout=1).read()
+            return True
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.2)
+    return False
+
+
+def cliente(url_base: str, rotas, duracao: float, deslocamento: int):
+    """Requisições sequenciais até o fim da duração; retorna (latências, erros)"""
+    latencias = []
+    erros = 0
+    i = deslocamento
+    fim = time.monotonic() + duracao
+    while time.monotonic() < fim:
+        rota = rotas[i % len(rotas)]
+        i += 1
+        inicio = time.perf_counter()
+        try:
+            with urllib.request.urlopen(url_base + rota, timeout=30) as resposta:
+                resposta.read()
+            latencias.append(time.perf_counter() - inicio)
+        except (urllib.error.URLError, ConnectionError, OSError):
+            erros += 1
+    return latencias, erros
+
+
+def percentil(valores, p: float) -> float:
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+def medir(nome: str, comando, diretorio: str, porta: int, args) -> dict:
+    """Sobe o servidor, aplica a carga e o encerra"""
+    # Todos os clientes vêm do mesmo IP: sem limite de taxa nem de concorrência
+    ambiente = dict(os.environ, API_PORT=str(porta), API_HOST='127.0.0.1', API_DEBUG='false',
+                    RATE_LIMIT_ENABLED='false', API_MAX_CONCORRENTES_PESADAS='1000')
+    if args.sem_cache:
+        ambiente['CACHE_ENABLED'] = 'false'
+    url_base = f"http://127.0.0.1:{porta}"
+    processo = subprocess.Popen(comando, cwd=diretorio, env=ambiente,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        if not aguardar_servidor(url_base, processo):
+            raise RuntimeError(f"{nome}: servidor não respondeu")
+        rotas = args.rotas.split(',')
+        # Aquecimento: primeira resposta de cada rota (cache vazio) fora da medição
+        cliente(url_base, rotas, 1.0, 0)
+
+        inicio = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=args.clientes) as executor:
+            resultados = list(executor.map(cliente, [url_base] * args.clientes, [rotas] * args.clientes,
+                                           [args.duracao] * args.clientes, range(args.clientes)))
+        tempo = time.perf_counter() - inicio
+    finally:
+        processo.terminate()
+        processo.wait(timeout=60)
+
+    latencias = [latencia for parcial, _ in resultados for latencia in parcial]
+    return {
+        'servidor': nome,
+        'requisicoes': len(latencias),
+        'erros': sum(erros for _, erros in resultados),
+        'req_por_segundo': len(latencias) / tempo,
+        'p50_ms': percentil(latencias, 0.50) * 1000,
+        'p99_ms': percentil(latencias, 0.99) * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', default=f"1,{os.cpu_count() or 1}",
+                        help='quantidades de workers de api/servidor.py a medir')
+    parser.add_argument('--clientes', type=int, default=16)
+    parser.add_argument('--duracao', type=float, default=10.0)
+    parser.add_argument('--eventos', type=int, default=2000)
+    parser.add_argument('--rotas', default=ROTAS_PADRAO)
+    parser.add_argument('--sem-cache', action='store_true', help='desativa o cache de respostas (CACHE_ENABLED=false)')
+    parser.add_argument('--porta', type=int, default=5099)
+    args = parser.parse_args()
+
+    servidores = [('desenvolvimento', [sys.executable, os.path.join(RAIZ, 'api', 'app.py')])]
+    for workers in dict.fromkeys(int(w) for w in args.workers.split(',')):
+        servidores.append((f"servidor.py --workers {workers}",
+                           [sys.executable, os.path.join(RAIZ, 'api', 'servidor.py'), '--workers', str(workers)]))
+
+    print(f"Núcleos: {os.cpu_count()} | clientes: {args.clientes} | duração: {args.duracao}s | "
+          f"eventos: {args.eventos} | cache: {'não' if args.sem_cache else 'sim'}")
+    with tempfile.TemporaryDirectory() as diretorio:
+        popular_banco(diretorio, args.eventos)
+        base = None
+        for nome, comando in servidores:
+            resultado = medir(nome, comando, diretorio, args.porta, args)
+            base = base or resultado['req_por_segundo']
+            print(f"{resultado['servidor']:<28} {resultado['req_por_segundo']:>8.1f} req/s "
+                  f"({resultado['req_por_segundo'] / base:.2f}x)  p50 {resultado['p50_ms']:.1f} ms  "
+                  f"p99 {resultado['p99_ms']:.1f} ms  erros {resultado['erros']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
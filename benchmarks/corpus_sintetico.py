@@ -0,0 +1,115 @@
+"""
+Gerador de corpus sintético de eventos rotulados para benchmarks de categorização
+
+Os eventos seguem a estrutura dos exemplos de etl/sample_data.py (tipo,
+local, fonte e comissão) e recebem no tema e na finalidade palavras-chave de
+uma área de palavras_chave_areas.md, que é o rótulo esperado (area_gold).
+Parte das palavras é flexionada (plural, sem acento, maiúsculas) e parte dos
+eventos recebe uma palavra-chave de outra área como distrator.
+"""
+
+import os
+import random
+import re
+from typing import Dict, Iterator, List
+
+from etl.sample_data import get_sample_eventos
+from etl.texto import remover_acentos
+
+ARQUIVO_PALAVRAS_CHAVE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'palavras_chave_areas.md'
+)
+
+TEMPLATES_TEMA = [
+    "Debate sobre {0} nos municípios",
+    "Audiência pública para discutir {0} e {1}",
+    "Votação de projetos de lei sobre {0}",
+    "Impacto de {0} na gestão municipal",
+    "Financiamento de {0} e {1} pelos entes federados",
+    "Propostas para {0} em pequenos municípios",
+]
+
+TEMPLATES_FINALIDADE = [
+    "Análise de proposições relacionadas a {0}, com participação de prefeitos.",
+    "Instruir o PL {2}/2025, que trata de {0} e de {1}.",
+    "Discutir os desafios de {1} no contexto de {0}.",
+    "Apreciação de requerimentos sobre {0}.",
+]
+
+TIPOS_REUNIAO = ["Reunião Ordinária", "Reunião Extraordinária", "Audiência Pública", "Reunião Deliberativa"]
+
+
+def carregar_palavras_chave_areas(caminho: str = ARQUIVO_PALAVRAS_CHAVE) -> Dict[str, List[str]]:
+    """Lê as áreas e suas palavras-chave do markdown de documentação"""
+    areas = {}
+    area_atual = None
+    with open(caminho, encoding='utf-8') as arquivo:
+        for linha in arquivo:
+            titulo = re.match(r'##\s+\d+\.\s+(.+)', linha)
+            if titulo:
+                area_atual = titulo.group(1).strip()
+                continue
+            palavras = re.match(r'\*\*Palavras-chave:\*\*\s*(.+)', linha)
+            if palavras and area_atual:
+                areas[area_atual] = [p.strip() for p in palavras.group(1).split(',') if p.strip()]
+                area_atual = None
+    return areas
+
+
+def _flexionar(palavra: str, aleatorio: random.Random) -> str:
+    """Aplica uma variação de escrita realista à palavra-chave"""
+    sorteio = aleatorio.random()
+    if sorteio < 0.15 and ' ' not in palavra and not palavra.endswith('s'):
+        return palavra + ('es' if palavra.endswith(('r', 'z')) else 's')
+    if sorteio < 0.25:
+        return remover_acentos(palavra)
+    if sorteio < 0.35:
+        return palavra.capitalize()
+    return palavra
+
+
+def gerar_corpus(quantidade: int, semente: int = 42, proporcao_distrator: float = 0.2,
+                 areas: Dict[str, List[str]] = None) -> Iterator[Dict]:
+    """Gera eventos sintéticos com o rótulo esperado em 'area_gold'"""
+    aleatorio = random.Random(semente)
+    areas = areas or carregar_palavras_chave_areas()
+    nomes_areas = sorted(areas)
+    modelos = get_sample_eventos()
+
+    for i in range(quantidade):
+        area = aleatorio.choice(nomes_areas)
+        palavras = areas[area]
+        principal, secundaria = (aleatorio.sample(palavras, 2) if len(palavras) > 1
+                                 else (palavras[0], palavras[0]))
+        modelo = aleatorio.choice(modelos)
+
+        tema_extra = ''
+        if aleatorio.random() < proporcao_distrator:
+            outra = aleatorio.choice([nome for nome in nomes_areas if nome != area])
+            tema_extra = f" e {aleatorio.choice(areas[outra])}"
+
+        valores = (_flexionar(principal, aleatorio), _flexionar(secundaria, aleatorio), 1000 + i % 9000)
+        yield {
+            'evento_id_externo': f"sintetico::{semente}::{i}",
+            'nome': f"{aleatorio.randint(1, 60)}ª {aleatorio.choice(TIPOS_REUNIAO)} nº {i}",
+            'data_inicio': modelo['data_inicio'],
+            'data_fim': modelo['data_fim'],
+            'situacao': modelo['situacao'],
+            'tema': aleatorio.choice(TEMPLATES_TEMA).format(*valores) + tema_extra,
+            'tipo_evento': modelo['tipo_evento'],
+            'local_evento': modelo['local_evento'],
+            'link_evento': modelo['link_evento'],
+            'fonte': modelo['fonte'],
+            'finalidade': aleatorio.choice(TEMPLATES_FINALIDADE).format(*valores),
+            'area_gold': area
+        }
+
+
+def gold_set_exemplos() -> List[Dict]:
+    """Eventos de exemplo rotulados manualmente (area_tecnica de sample_data)"""
+    eventos = []
+    for evento in get_sample_eventos():
+        evento = dict(evento)
+        evento['area_gold'] = evento.pop('area_tecnica')
+        eventos.append(evento)
+    return eventos
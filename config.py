@@ -25,7 +25,20 @@ API_CONFIG = {
     'host': os.getenv('API_HOST', '0.0.0.0'),
     'port': int(os.getenv('API_PORT', 5000)),
     'debug': os.getenv('API_DEBUG', 'False').lower() == 'true',
-    'cors_origins': ['http://localhost:3000', 'http://localhost:8000', 'http://127.0.0.1:8000']
+    'cors_origins': ['http://localhost:3000', 'http://localhost:8000', 'http://127.0.0.1:8000'],
+    # Máximo de textos/eventos por chamada a /api/categorizar/preview
+    'preview_max_itens': int(os.getenv('API_PREVIEW_MAX_ITENS', 100)),
+    # Respostas menores que isso (bytes) não são comprimidas
+    'compressao_limiar': int(os.getenv('API_COMPRESSAO_LIMIAR', 1024)),
+    # Cache-Control max-age (segundos) dos arquivos de web/
+    'static_max_age': int(os.getenv('API_STATIC_MAX_AGE', 300)),
+    # Intervalo (s) de verificação do journal de eventos e do keepalive do stream SSE
+    'stream_intervalo': float(os.getenv('API_STREAM_INTERVALO', 1.0)),
+    'stream_keepalive': float(os.getenv('API_STREAM_KEEPALIVE', 15.0)),
+    # Processos do servidor de produção (api/servidor.py); 1 = um processo com threads
+    'workers': int(os.getenv('API_WORKERS', os.cpu_count() or 1)),
+    # Segundos para os workers antigos terminarem as requisições em curso (SIGHUP/SIGTERM)
+    'timeout_encerramento': float(os.getenv('API_TIMEOUT_ENCERRAMENTO', 30))
 }
 
 # Configurações do ETL
@@ -41,7 +54,9 @@ EXTERNAL_APIS = {
     'camara': {
         'base_url': 'https://dadosabertos.camara.leg.br/api/v2',
         'timeout': 30,
-        'user_agent': 'ETL-Agenda-Congresso/1.0'
+        'user_agent': 'ETL-Agenda-Congresso/1.0',
+        'detalhes_workers': int(os.getenv('CAMARA_DETALHES_WORKERS', 8)),
+        'max_conexoes_por_host': int(os.getenv('CAMARA_MAX_CONEXOES_HOST', 4))
     },
     'senado': {
         'base_url': 'https://www12.senado.leg.br/dados-abertos',
@@ -53,6 +68,14 @@ EXTERNAL_APIS = {
 # Configurações de categorização
 CATEGORIZACAO_CONFIG = {
     'score_minimo': float(os.getenv('CATEGORIZACAO_SCORE_MINIMO', 0.3)),
+    # 'tokens' (radicais RSLP em fronteira de palavra) ou 'substring' (busca original)
+    'indice': os.getenv('CATEGORIZACAO_INDICE', 'tokens'),
+    # Quantas áreas de maior score são guardadas por evento (consultas com min_score)
+    'top_k_areas': int(os.getenv('CATEGORIZACAO_TOP_K_AREAS', 3)),
+    # Processos para categorizar lotes grandes (1 desativa; 0 usa todos os núcleos)
+    'workers': int(os.getenv('CATEGORIZACAO_WORKERS', 1)),
+    # Lotes com menos textos distintos que isso são categorizados no próprio processo
+    'limiar_paralelo': int(os.getenv('CATEGORIZACAO_LIMIAR_PARALELO', 20000)),
     'palavras_chave_peso': {
         'exata': 1.0,
         'variacao': 0.8,
@@ -79,15 +102,25 @@ LOGGING_CONFIG = {
 SECURITY_CONFIG = {
     'api_key_required': os.getenv('API_KEY_REQUIRED', 'False').lower() == 'true',
     'api_key_header': 'X-API-Key',
+    # Chaves aceitas, separadas por vírgula
+    'api_keys': [chave.strip() for chave in os.getenv('API_KEYS', '').split(',') if chave.strip()],
     'rate_limit': {
+        'enabled': os.getenv('RATE_LIMIT_ENABLED', 'True').lower() == 'true',
         'requests_per_minute': int(os.getenv('RATE_LIMIT_RPM', 60)),
         'burst': int(os.getenv('RATE_LIMIT_BURST', 100))
-    }
+    },
+    # Execuções simultâneas (por processo) de estatísticas, busca e exportação; acima disso, 503
+    'max_concorrentes_pesadas': int(os.getenv('API_MAX_CONCORRENTES_PESADAS', 4))
 }
 
 # Configurações de monitoramento
 MONITORING_CONFIG = {
     'health_check_interval': int(os.getenv('HEALTH_CHECK_INTERVAL', 300)),  # segundos
+    # /api/health: cache do resultado, limites para "degraded" (o quick_check roda a cada health_check_interval)
+    'health_cache_ttl': float(os.getenv('HEALTH_CACHE_TTL', 5)),  # segundos
+    'health_latencia_max_ms': float(os.getenv('HEALTH_LATENCIA_MAX_MS', 500)),
+    'health_wal_max_mb': int(os.getenv('HEALTH_WAL_MAX_MB', 64)),
+    'health_bloqueios_max': int(os.getenv('HEALTH_BLOQUEIOS_MAX', 5)),  # falhas por health_check_interval
     'metrics_enabled': os.getenv('METRICS_ENABLED', 'True').lower() == 'true',
     'alert_email': os.getenv('ALERT_EMAIL', '')
 }
@@ -177,6 +210,9 @@ def validate_config():
     if not (0 <= CATEGORIZACAO_CONFIG['score_minimo'] <= 1):
         errors.append("Score mínimo deve estar entre 0 e 1")
     
+    if CATEGORIZACAO_CONFIG['indice'] not in ('tokens', 'substring'):
+        errors.append("Índice de categorização deve ser 'tokens' ou 'substring'")
+    
     if errors:
         raise ValueError(f"Configurações inválidas:\n" + "\n".join(errors))
     
@@ -0,0 +1,66 @@
+"""
+Autômato de Aho-Corasick para busca simultânea de vários padrões em um texto
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class AhoCorasick:
+    """Encontra todas as ocorrências de um conjunto de padrões em uma única passada"""
+
+    def __init__(self, padroes: Iterable[str]):
+        self._transicoes: List[Dict[str, int]] = [{}]
+        self._falha: List[int] = [0]
+        self._saida: List[Tuple[int, ...]] = [()]
+
+        for indice, padrao in enumerate(padroes):
+            self._adicionar(padrao, indice)
+        self._construir_falhas()
+
+    def _adicionar(self, padrao: str, indice: int):
+        """Insere um padrão na trie"""
+        if not padrao:
+            return
+
+        estado = 0
+        for caractere in padrao:
+            proximo = self._transicoes[estado].get(caractere)
+            if proximo is None:
+                proximo = len(self._transicoes)
+                self._transicoes[estado][caractere] = proximo
+                self._transicoes.append({})
+                self._falha.append(0)
+                self._saida.append(())
+            estado = proximo
+        self._saida[estado] += (indice,)
+
+    def _construir_falhas(self):
+        """Calcula os links de falha em largura, propaga as saídas e monta o DFA"""
+        # No DFA cada estado já contém as transições herdadas pelos links de falha
+        self._delta: List[Dict[str, int]] = [dict(self._transicoes[0])] + [None] * (len(self._transicoes) - 1)
+
+        fila = deque(self._transicoes[0].values())
+        while fila:
+            estado = fila.popleft()
+            for caractere, proximo in self._transicoes[estado].items():
+                fila.append(proximo)
+                falha = self._falha[estado]
+                while falha and caractere not in self._transicoes[falha]:
+                    falha = self._falha[falha]
+                destino = self._transicoes[falha].get(caractere, 0)
+                self._falha[proximo] = destino if destino != proximo else 0
+                self._saida[proximo] += self._saida[self._falha[proximo]]
+            self._delta[estado] = {**self._delta[self._falha[estado]], **self._transicoes[estado]}
+
+    def buscar(self, texto: str) -> Iterator[Tuple[int, int]]:
+        """Gera (posição final, índice do padrão) para cada ocorrência no texto"""
+        delta = self._delta
+        saida = self._saida
+        estado = 0
+
+        for posicao, caractere in enumerate(texto):
+            estado = delta[estado].get(caractere, 0)
+            if saida[estado]:
+                for indice in saida[estado]:
+                    yield posicao, indice
@@ -0,0 +1,74 @@
+"""
+Barramento em processo (publicação/assinatura) das alterações de eventos
+"""
+
+import queue
+import threading
+from typing import List, Set, Tuple
+
+
+class Assinatura:
+    """Fila de mensagens de um assinante.
+
+    Um assinante lento não bloqueia os demais: com a fila cheia ele é
+    marcado como atrasado e deve se ressincronizar pelo journal.
+    """
+
+    def __init__(self, capacidade: int):
+        self.fila: "queue.Queue[Tuple[int, str]]" = queue.Queue(maxsize=capacidade)
+        self.atrasada = False
+
+
+class BarramentoEventos:
+    """Distribui as alterações de eventos aos assinantes do processo.
+
+    Quem grava eventos (carga do ETL, rotas de escrita da API) chama
+    sinalizar(); o leitor do journal acorda, lê as alterações novas e as
+    publica já formatadas, uma única vez para todos os assinantes.
+    """
+
+    def __init__(self, capacidade: int = 1000):
+        self.capacidade = capacidade
+        self._assinaturas: Set[Assinatura] = set()
+        self._lock = threading.Lock()
+        self._sinal = threading.Event()
+
+    def assinar(self) -> Assinatura:
+        assinatura = Assinatura(self.capacidade)
+        with self._lock:
+            self._assinaturas.add(assinatura)
+        return assinatura
+
+    def cancelar(self, assinatura: Assinatura):
+        with self._lock:
+            self._assinaturas.discard(assinatura)
+
+    @property
+    def assinantes(self) -> int:
+        return len(self._assinaturas)
+
+    def publicar(self, mensagens: List[Tuple[int, str]]):
+        """Entrega (id, mensagem) a todos os assinantes"""
+        with self._lock:
+            assinaturas = list(self._assinaturas)
+        for assinatura in assinaturas:
+            for mensagem in mensagens:
+                try:
+                    assinatura.fila.put_nowait(mensagem)
+                except queue.Full:
+                    assinatura.atrasada = True
+                    break
+
+    def sinalizar(self):
+        """Avisa que há alterações novas no journal"""
+        self._sinal.set()
+
+    def aguardar_sinal(self, timeout: float) -> bool:
+        """Espera um sinal por até timeout segundos"""
+        sinalizado = self._sinal.wait(timeout)
+        self._sinal.clear()
+        return sinalizado
+
+
+# Instância do processo, compartilhada pelo ETL e pela API
+barramento = BarramentoEventos()
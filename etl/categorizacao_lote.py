@@ -0,0 +1,102 @@
+"""
+Categorização vetorizada de lotes de eventos sobre uma matriz esparsa documento × termo
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Pesos dos níveis de correspondência em décimos, para somas inteiras exatas
+PESOS_DECIMOS = {1: 10, 0.8: 8, 0.5: 5}
+
+
+class MotorCategorizacaoLote:
+    """Calcula os scores de um lote inteiro com um único produto matricial.
+
+    Cada linha da matriz esparsa (CSR) é um texto do lote e cada coluna um
+    termo (palavra-chave distinta), com o peso da correspondência em
+    décimos. A matriz termo × área contém quantas vezes cada termo aparece
+    nas palavras-chave da área, de modo que o produto dá, por área, a soma
+    dos pesos usada no score do categorizador.
+    """
+
+    def __init__(self, modelo):
+        self.modelo = modelo
+        regras_areas = modelo.regras_areas
+        self.areas = [nome for nome, _, _ in regras_areas]
+
+        self.pesos_areas = np.zeros((len(modelo.termos), len(regras_areas)), dtype=np.int64)
+        for coluna, (_, _, termos_area) in enumerate(regras_areas):
+            for termo in termos_area:
+                self.pesos_areas[termo, coluna] += 1
+
+        # Score mínimo em décimos por área: soma / (10 * total) >= mínimo
+        totais = np.array([total for _, total, _ in regras_areas], dtype=np.float64)
+        self.limiares = totais * 10 * modelo.score_minimo
+        self.divisores = totais * 10
+
+    def matriz_documentos(self, textos: List[str]):
+        """Monta a matriz esparsa documento × termo em formato CSR (indptr, indices, dados)"""
+        indptr = [0]
+        indices = []
+        dados = []
+        for texto in textos:
+            for termo, peso in self.modelo.pesos_termos(texto).items():
+                indices.append(termo)
+                dados.append(PESOS_DECIMOS[peso])
+            indptr.append(len(indices))
+
+        return (np.array(indptr, dtype=np.int64),
+                np.array(indices, dtype=np.int64),
+                np.array(dados, dtype=np.int64))
+
+    def pontuar(self, textos: List[str]) -> np.ndarray:
+        """Retorna a matriz texto × área com as somas de pesos em décimos"""
+        indptr, indices, dados = self.matriz_documentos(textos)
+        somas = np.zeros((len(textos), len(self.areas)), dtype=np.int64)
+        if not len(dados):
+            return somas
+
+        # Produto CSR × denso: contribuições por não-zero somadas por linha
+        contribuicoes = dados[:, None] * self.pesos_areas[indices]
+        inicios = indptr[:-1]
+        nao_vazias = inicios < indptr[1:]
+        somas[nao_vazias] = np.add.reduceat(contribuicoes, inicios[nao_vazias], axis=0)
+        return somas
+
+    def avaliar(self, textos: List[str], top_k: int = 0) -> List[Tuple[Optional[str], float, Tuple]]:
+        """(área de maior score, score, top-k) por texto.
+
+        A área é None quando nenhuma atinge o score mínimo; o top-k traz as
+        top_k áreas com score positivo como pares (área, score), em ordem
+        decrescente.
+        """
+        if not textos or not self.areas:
+            return [(None, 0.0, ())] * len(textos)
+
+        somas = self.pontuar(textos)
+        scores = somas / self.divisores
+        melhores = np.argmax(scores, axis=1)
+        linhas = np.arange(len(textos))
+        atingiu = (somas[linhas, melhores] >= self.limiares[melhores]) & (somas[linhas, melhores] > 0)
+        maiores = scores[linhas, melhores]
+
+        tops = [()] * len(textos)
+        if top_k:
+            ordem = np.argsort(-scores, axis=1, kind='stable')[:, :top_k]
+            tops = [
+                tuple((self.areas[coluna], round(float(scores[linha, coluna]), 4))
+                      for coluna in ordem[linha] if somas[linha, coluna] > 0)
+                for linha in range(len(textos))
+            ]
+
+        return [(self.areas[coluna] if ok else None, float(score), top)
+                for coluna, ok, score, top in zip(melhores, atingiu, maiores, tops)]
+
+    def melhores_areas(self, textos: List[str]) -> List[Tuple[Optional[str], float]]:
+        """(área de maior score, score) por texto; área None quando nenhuma atinge o score mínimo"""
+        return [(area, score) for area, score, _ in self.avaliar(textos)]
+
+    def categorizar_textos(self, textos: List[str]) -> List[Optional[str]]:
+        """Área de maior score por texto, ou None quando nenhuma atinge o score mínimo"""
+        return [area for area, _ in self.melhores_areas(textos)]
@@ -0,0 +1,73 @@
+"""
+Categorização paralela de lotes grandes em um pool de processos
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from etl.modelo_palavras_chave import ModeloPalavrasChave
+
+# Modelo recebido por cada processo do pool na inicialização
+_modelo_worker: Optional[ModeloPalavrasChave] = None
+
+
+def _inicializar_worker(modelo: ModeloPalavrasChave):
+    """Guarda o modelo compilado no processo; é enviado uma vez, não a cada tarefa"""
+    global _modelo_worker
+    _modelo_worker = modelo
+
+
+def _avaliar_shard(textos: List[str]) -> List[Tuple[Optional[str], float, Tuple]]:
+    """Avalia um shard de textos com o modelo do processo"""
+    return _modelo_worker.motor_lote.avaliar(textos, _modelo_worker.top_k)
+
+
+class AvaliadorParalelo:
+    """Distribui a avaliação de textos entre processos, preservando a ordem.
+
+    O pool é criado sob demanda para um modelo e recriado quando o modelo
+    muda. Lotes abaixo do limiar são avaliados no próprio processo, onde o
+    custo de serializar textos e resultados não compensa.
+    """
+
+    def __init__(self, workers: int = None, limiar: int = 20000, tamanho_shard: int = 2000):
+        self.workers = workers or os.cpu_count() or 1
+        self.limiar = limiar
+        self.tamanho_shard = tamanho_shard
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._modelo: Optional[ModeloPalavrasChave] = None
+
+    def avaliar(self, modelo: ModeloPalavrasChave, textos: List[str]) -> List[Tuple[Optional[str], float, Tuple]]:
+        """(área, score, top-k) de cada texto, na ordem de entrada"""
+        if self.workers <= 1 or len(textos) < self.limiar:
+            return modelo.motor_lote.avaliar(textos, modelo.top_k)
+
+        executor = self._executor_para(modelo)
+        # Ao menos um shard por processo; shards menores equilibram melhor a carga
+        tamanho = max(1, min(self.tamanho_shard, -(-len(textos) // self.workers)))
+        shards = [textos[inicio:inicio + tamanho] for inicio in range(0, len(textos), tamanho)]
+
+        resultado = []
+        for parcial in executor.map(_avaliar_shard, shards):
+            resultado.extend(parcial)
+        return resultado
+
+    def _executor_para(self, modelo: ModeloPalavrasChave) -> ProcessPoolExecutor:
+        """Pool cujos processos já receberam este modelo"""
+        if self._executor is None or self._modelo is not modelo:
+            self.fechar()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_inicializar_worker,
+                initargs=(modelo,)
+            )
+            self._modelo = modelo
+        return self._executor
+
+    def fechar(self):
+        """Encerra o pool de processos, se houver"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            self._modelo = None
@@ -0,0 +1,98 @@
+"""
+Categorização automática de proposições pela ementa e pelo eixo temático
+"""
+
+import hashlib
+from typing import Dict, List
+
+from etl.categorizador import CategorizadorEventos
+from etl.database_manager import DatabaseManager
+
+
+def texto_proposicao(proposicao: Dict) -> str:
+    """Texto analisado de uma proposição: ementa e eixo temático"""
+    return ' '.join(parte for parte in (proposicao.get('ementa'), proposicao.get('eixo_tematico')) if parte)
+
+
+class CategorizadorProposicoes:
+    """Sugere a área técnica das proposições com o motor do categorizador de eventos.
+
+    A sugestão fica em area_sugerida/score_sugerido; area_tecnica, digitada
+    pela equipe, só é preenchida quando está vazia. hash_sugestao guarda o
+    hash do texto e a versão das palavras-chave usadas, de modo que ementas
+    inalteradas não são pontuadas de novo.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, categorizador: CategorizadorEventos,
+                 tamanho_lote: int = 500):
+        self.db_manager = db_manager
+        self.categorizador = categorizador
+        self.tamanho_lote = tamanho_lote
+
+    def _hash(self, texto: str) -> str:
+        """Hash do texto normalizado"""
+        normalizado = ' '.join(texto.lower().split())
+        return hashlib.sha1(f"proposicao\x1f{normalizado}".encode('utf-8')).hexdigest()
+
+    def sugerir(self, proposicao: Dict) -> Dict:
+        """Sugestão para uma proposição nova: área, score, top-k e hash_sugestao"""
+        # Palavras-chave alteradas desde a última recarga valem já para esta sugestão
+        modelo = self.categorizador.recarregar_modelo()
+        texto = texto_proposicao(proposicao)
+        sugestao = self.categorizador.pontuar_texto(texto, modelo)
+        sugestao['hash_sugestao'] = f"{self._hash(texto)}:{modelo.versao}"
+        return sugestao
+
+    def executar(self, todas: bool = False) -> Dict:
+        """Pontua as proposições cuja ementa ou palavras-chave mudaram; todas=True ignora o hash"""
+        modelo = self.categorizador.recarregar_modelo()
+        total = self.db_manager.contar_proposicoes()
+        pontuadas = 0
+        cache_acertos = 0
+        processadas = 0
+
+        for proposicoes in self.db_manager.iterar_proposicoes(self.tamanho_lote):
+            processadas += len(proposicoes)
+            pendentes = []
+            for proposicao in proposicoes:
+                texto = texto_proposicao(proposicao)
+                hash_texto = self._hash(texto)
+                if todas or proposicao.get('hash_sugestao') != f"{hash_texto}:{modelo.versao}":
+                    pendentes.append((proposicao, texto, hash_texto))
+
+            if pendentes:
+                resultados = self._pontuar(pendentes, modelo)
+                cache_acertos += resultados.pop('_acertos')
+                self.db_manager.salvar_sugestoes_proposicoes([
+                    (proposicao['id'], *resultados[hash_texto], f"{hash_texto}:{modelo.versao}")
+                    for proposicao, _, hash_texto in pendentes
+                ])
+                pontuadas += len(pendentes)
+
+            print(f"Proposições: {processadas}/{total} verificadas, {pontuadas} pontuadas")
+
+        self.db_manager.log_atualizacao(
+            tipo="CATEGORIZACAO_PROPOSICOES",
+            status="SUCESSO",
+            eventos_atualizados=pontuadas,
+            detalhes=f"{pontuadas} de {processadas} proposições pontuadas ({cache_acertos} do cache)"
+        )
+        return {'verificadas': processadas, 'pontuadas': pontuadas, 'cache_acertos': cache_acertos}
+
+    def _pontuar(self, pendentes: List[tuple], modelo) -> Dict:
+        """(área, score) por hash de texto, usando o cache de categorização compartilhado"""
+        textos = {hash_texto: texto for _, texto, hash_texto in pendentes}
+        cache = self.db_manager.get_cache_categorizacao(list(textos), modelo.versao)
+        resultados = {hash_texto: (area, round(score, 4)) for hash_texto, (area, score, _) in cache.items()}
+        resultados['_acertos'] = len(cache)
+
+        faltantes = [hash_texto for hash_texto in textos if hash_texto not in cache]
+        if faltantes:
+            avaliados = self.categorizador.pontuar_textos([textos[h] for h in faltantes])
+            novos = []
+            for hash_texto, (area, score, top) in zip(faltantes, avaliados):
+                resultados[hash_texto] = (area, round(score, 4))
+                novos.append((hash_texto, area, score, top))
+            self.db_manager.salvar_cache_categorizacao(novos, modelo.versao)
+
+        return resultados
@@ -1,15 +1,94 @@
+import hashlib
 import re
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+from config import CATEGORIZACAO_CONFIG
+from etl.categorizacao_paralela import AvaliadorParalelo
 from etl.database_manager import DatabaseManager
+from etl.indice_termos import CAMPOS_ANALISE
+from etl.modelo_palavras_chave import PALAVRAS_RELACIONADAS, ModeloPalavrasChave, obter_modelo
+from etl.texto import remover_acentos
+
+# Score mínimo para categorização por palavras-chave (reduzido de 0.3 para 0.1)
+SCORE_MINIMO = 0.1
+
+
+def _compilar_temas(temas: Dict[str, List[str]]) -> Tuple[Tuple[str, 're.Pattern'], ...]:
+    """Compila as palavras de cada área em uma expressão de busca por substring"""
+    return tuple(
+        (area, re.compile('|'.join(re.escape(palavra) for palavra in palavras)))
+        for area, palavras in temas.items()
+    )
+
+
+# Temas usados para categorizar audiências públicas sem área identificada
+TEMAS_AUDIENCIA = _compilar_temas({
+    'Educação': ['educação', 'escola', 'universidade', 'ensino'],
+    'Saúde': ['saúde', 'hospital', 'medicamento', 'vacina'],
+    'Meio Ambiente e Saneamento': ['meio ambiente', 'saneamento', 'água', 'esgoto'],
+    'Transporte e Mobilidade': ['transporte', 'mobilidade', 'trânsito'],
+    'Finanças': ['finanças', 'orçamento', 'imposto', 'tributo'],
+    'Jurídico': ['jurídico', 'legislação', 'lei', 'direito']
+})
+
+# Áreas das comissões, identificadas pelo nome
+COMISSOES_AREAS = _compilar_temas({
+    'Educação': ['educação', 'cultura', 'esporte'],
+    'Saúde': ['saúde', 'previdência'],
+    'Meio Ambiente e Saneamento': ['meio ambiente', 'agricultura'],
+    'Finanças': ['finanças', 'orçamento', 'tributação'],
+    'Jurídico': ['constituição', 'justiça', 'cidadania'],
+    'Transporte e Mobilidade': ['transporte', 'infraestrutura']
+})
 
 class CategorizadorEventos:
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, indice: str = None):
         self.db_manager = db_manager
-        self.areas_tecnicas = self._carregar_areas_tecnicas()
+        self.tipo_indice = indice or CATEGORIZACAO_CONFIG['indice']
+        self.score_minimo = SCORE_MINIMO
+        self.top_k = CATEGORIZACAO_CONFIG['top_k_areas']
+        self.avaliador = AvaliadorParalelo(
+            workers=CATEGORIZACAO_CONFIG['workers'],
+            limiar=CATEGORIZACAO_CONFIG['limiar_paralelo']
+        )
+        self.modelo: ModeloPalavrasChave = None
+        self.cache_acertos = 0
+        self.cache_falhas = 0
+        self.recarregar_modelo()
+    
+    def recarregar_modelo(self) -> ModeloPalavrasChave:
+        """Troca o modelo de palavras-chave se o banco tiver uma versão mais nova.
+        
+        Chamado uma vez por lote; no caso comum custa só a leitura do contador
+        de alterações de areas_tecnicas.
+        """
+        modelo = obter_modelo(self.db_manager, self.tipo_indice, self.score_minimo, self.top_k)
+        if modelo is not self.modelo:
+            if self.modelo is not None:
+                print(f"Palavras-chave atualizadas: modelo {self.modelo.versao} -> {modelo.versao}")
+            # Entradas de versões anteriores das palavras-chave não serão mais consultadas
+            self.db_manager.limpar_cache_categorizacao(modelo.versao)
+            self.modelo = modelo
+        return modelo
+    
+    @property
+    def areas_tecnicas(self) -> Tuple[Dict, ...]:
+        return self.modelo.areas_tecnicas
+    
+    @property
+    def versao_palavras_chave(self) -> str:
+        return self.modelo.versao
+    
+    def _pesos_termos(self, texto: str) -> Dict[int, float]:
+        """Peso de cada termo encontrado no texto (exata 1, variação 0.8, relacionada 0.5)"""
+        return self.modelo.pesos_termos(texto)
     
-    def _carregar_areas_tecnicas(self) -> List[Dict]:
-        """Carrega áreas técnicas do banco de dados"""
-        return self.db_manager.get_areas_tecnicas()
+    def _calcular_scores_areas(self, texto: str) -> List[Tuple[str, float]]:
+        """Calcula o score de todas as áreas em uma consulta ao índice.
+        
+        Com o índice 'substring' produz os mesmos valores de
+        _calcular_score_area aplicado a cada área.
+        """
+        return self.modelo.calcular_scores_areas(texto)
     
     def categorizar_evento(self, evento: Dict) -> Optional[str]:
         """Categoriza um evento em uma área técnica baseado no conteúdo"""
@@ -20,14 +99,13 @@ class CategorizadorEventos:
         melhor_area = None
         melhor_score = 0
         
-        for area in self.areas_tecnicas:
-            score = self._calcular_score_area(texto_analise, area)
+        for nome, score in self._calcular_scores_areas(texto_analise):
             if score > melhor_score:
                 melhor_score = score
-                melhor_area = area['nome']
+                melhor_area = nome
         
         # Reduzir threshold para categorizar mais eventos
-        if melhor_score >= 0.1:  # Reduzido de 0.3 para 0.1
+        if melhor_score >= self.score_minimo:
             return melhor_area
         
         # Se não encontrou área específica, tentar categorização por contexto
@@ -37,21 +115,66 @@ class CategorizadorEventos:
         
         return None
     
+    def pontuar_texto(self, texto: str, modelo: ModeloPalavrasChave = None) -> Dict:
+        """Pontua um texto qualquer: área sugerida, seu score e as áreas de maior score"""
+        modelo = modelo or self.modelo
+        scores = sorted(modelo.calcular_scores_areas(texto.lower()), key=lambda item: -item[1])
+        melhor_area, melhor_score = scores[0] if scores else (None, 0)
+        return {
+            'area_tecnica': melhor_area if melhor_score > 0 and melhor_score >= self.score_minimo else None,
+            'score': round(melhor_score, 4),
+            'areas': [(nome, round(score, 4)) for nome, score in scores[:self.top_k] if score > 0]
+        }
+    
+    def pre_visualizar(self, evento: Dict, modelo: ModeloPalavrasChave = None, top_k: int = None) -> Dict:
+        """Área que seria atribuída ao evento, com as áreas de maior score e os termos encontrados.
+        
+        Não grava nada; a categorização por contexto só é tentada para eventos
+        com nome, como em categorizar_evento.
+        """
+        modelo = modelo or self.modelo
+        areas = modelo.explicar(self._preparar_texto_analise(evento), top_k or max(self.top_k, 1))
+        
+        area, origem = None, None
+        if areas and areas[0]['score'] >= self.score_minimo:
+            area, origem = areas[0]['area'], 'palavras_chave'
+        elif evento.get('nome'):
+            area = self._categorizar_por_contexto(evento)
+            origem = 'contexto' if area else None
+        
+        return {
+            'area_tecnica': area,
+            'score': areas[0]['score'] if areas else 0,
+            'origem': origem,
+            'areas': areas
+        }
+    
+    def pontuar_textos(self, textos: List[str]) -> List[Tuple[Optional[str], float, Tuple]]:
+        """(área, score, top-k) de vários textos pelo motor vetorizado, sem categorização por contexto"""
+        return self.avaliador.avaliar(self.modelo, [texto.lower() for texto in textos])
+    
+    def _campos_analise(self, evento: Dict) -> List[str]:
+        """Campos do evento considerados na categorização"""
+        return [evento.get(campo, '') for campo in CAMPOS_ANALISE]
+    
     def _preparar_texto_analise(self, evento: Dict) -> str:
         """Prepara texto para análise combinando diferentes campos"""
-        campos = [
-            evento.get('nome', ''),
-            evento.get('tema', ''),
-            evento.get('tipo_evento', ''),
-            evento.get('local_evento', ''),
-            evento.get('fonte', '')  # Adicionar fonte como contexto
-        ]
-        
+        campos = self._campos_analise(evento)
         texto = ' '.join([campo for campo in campos if campo])
         return texto.lower()
     
+    def _hash_texto(self, evento: Dict) -> str:
+        """Hash do texto normalizado (minúsculas, espaços colapsados) de cada campo analisado"""
+        normalizado = '\x1f'.join(' '.join((campo or '').lower().split())
+                                  for campo in self._campos_analise(evento))
+        return hashlib.sha1(normalizado.encode('utf-8')).hexdigest()
+    
     def _calcular_score_area(self, texto: str, area: Dict) -> float:
-        """Calcula score de relevância para uma área técnica"""
+        """Calcula score de relevância para uma área técnica.
+        
+        Implementação de referência por substring; a categorização usa
+        _calcular_scores_areas sobre o índice configurado.
+        """
         palavras_chave = area.get('palavras_chave', '').split(',')
         score = 0
         total_palavras = len(palavras_chave)
@@ -93,20 +216,8 @@ class CategorizadorEventos:
     
     def _buscar_palavras_relacionadas(self, palavra: str, texto: str) -> bool:
         """Busca por palavras relacionadas"""
-        palavras_relacionadas = {
-            'educação': ['escola', 'universidade', 'ensino', 'aluno', 'professor'],
-            'saúde': ['hospital', 'medicamento', 'vacina', 'doença', 'tratamento'],
-            'meio ambiente': ['sustentabilidade', 'poluição', 'natureza', 'ecologia'],
-            'economia': ['finanças', 'orçamento', 'imposto', 'dinheiro', 'mercado'],
-            'segurança': ['polícia', 'crime', 'violência', 'proteção'],
-            'infraestrutura': ['obra', 'construção', 'transporte', 'estrada'],
-            'cultura': ['arte', 'teatro', 'museu', 'patrimônio'],
-            'esporte': ['atividade física', 'competição', 'treino'],
-            'tecnologia': ['digital', 'inovação', 'software', 'internet']
-        }
-        
-        if palavra in palavras_relacionadas:
-            for palavra_rel in palavras_relacionadas[palavra]:
+        if palavra in PALAVRAS_RELACIONADAS:
+            for palavra_rel in PALAVRAS_RELACIONADAS[palavra]:
                 if palavra_rel in texto:
                     return True
         
@@ -143,17 +254,8 @@ class CategorizadorEventos:
     
     def _categorizar_audiencia_publica(self, texto: str) -> str:
         """Categoriza audiência pública por tema"""
-        temas_audiencia = {
-            'Educação': ['educação', 'escola', 'universidade', 'ensino'],
-            'Saúde': ['saúde', 'hospital', 'medicamento', 'vacina'],
-            'Meio Ambiente e Saneamento': ['meio ambiente', 'saneamento', 'água', 'esgoto'],
-            'Transporte e Mobilidade': ['transporte', 'mobilidade', 'trânsito'],
-            'Finanças': ['finanças', 'orçamento', 'imposto', 'tributo'],
-            'Jurídico': ['jurídico', 'legislação', 'lei', 'direito']
-        }
-        
-        for area, keywords in temas_audiencia.items():
-            if any(keyword in texto for keyword in keywords):
+        for area, padrao in TEMAS_AUDIENCIA:
+            if padrao.search(texto):
                 return area
         
         return 'Jurídico'  # Default para audiências públicas
@@ -165,17 +267,8 @@ class CategorizadorEventos:
     def _categorizar_reuniao_comissao(self, texto: str) -> str:
         """Categoriza reunião de comissão"""
         # Tentar identificar área da comissão
-        comissoes_areas = {
-            'Educação': ['educação', 'cultura', 'esporte'],
-            'Saúde': ['saúde', 'previdência'],
-            'Meio Ambiente e Saneamento': ['meio ambiente', 'agricultura'],
-            'Finanças': ['finanças', 'orçamento', 'tributação'],
-            'Jurídico': ['constituição', 'justiça', 'cidadania'],
-            'Transporte e Mobilidade': ['transporte', 'infraestrutura']
-        }
-        
-        for area, keywords in comissoes_areas.items():
-            if any(keyword in texto for keyword in keywords):
+        for area, padrao in COMISSOES_AREAS:
+            if padrao.search(texto):
                 return area
         
         return 'Jurídico'  # Default para comissões
@@ -201,24 +294,90 @@ class CategorizadorEventos:
     
     def _remover_acentos(self, texto: str) -> str:
         """Remove acentos do texto"""
-        import unicodedata
-        return ''.join(
-            c for c in unicodedata.normalize('NFD', texto)
-            if not unicodedata.combining(c)
-        )
+        return remover_acentos(texto)
     
     def categorizar_lote(self, eventos: List[Dict]) -> List[Dict]:
-        """Categoriza uma lista de eventos"""
+        """Categoriza uma lista de eventos, reaproveitando o resultado de eventos com o mesmo texto analisado"""
         eventos_categorizados = []
+        self.recarregar_modelo()
         
-        for evento in eventos:
-            area_tecnica = self.categorizar_evento(evento)
+        # Só textos idênticos em todos os campos analisados compartilham o resultado
+        hashes = [self._hash_texto(evento) for evento in eventos]
+        representantes = {}
+        for hash_texto, evento in zip(hashes, eventos):
+            representantes.setdefault(hash_texto, evento)
+        
+        resultados = self._categorizar_com_cache(representantes, self.modelo)
+        
+        for hash_texto, evento in zip(hashes, eventos):
+            area_tecnica, _, scores_areas = resultados[hash_texto]
             if area_tecnica:
                 evento['area_tecnica'] = area_tecnica
+            evento['scores_areas'] = list(scores_areas)
             eventos_categorizados.append(evento)
         
         return eventos_categorizados
     
+    def categorizar_com_scores(self, eventos: List[Dict],
+                               modelo: ModeloPalavrasChave = None) -> List[Tuple[Optional[str], float, Tuple]]:
+        """(área, maior score por palavras-chave, top-k de áreas) de cada evento.
+        
+        A área aplica o fallback por contexto; o top-k traz as áreas de maior
+        score como pares (área, score).
+        """
+        modelo = modelo or self.modelo
+        posicoes = [i for i, evento in enumerate(eventos) if evento.get('nome')]
+        resultado: List[Tuple[Optional[str], float, Tuple]] = [(None, 0.0, ())] * len(eventos)
+        
+        # Textos repetidos no lote passam pelo índice uma única vez
+        textos = [self._preparar_texto_analise(eventos[i]) for i in posicoes]
+        distintos = list(dict.fromkeys(textos))
+        areas_texto = dict(zip(distintos, self.avaliador.avaliar(modelo, distintos)))
+        
+        for i, texto in zip(posicoes, textos):
+            area, score, top = areas_texto[texto]
+            if area is None:
+                area = self._categorizar_por_contexto(eventos[i])
+            resultado[i] = (area, score, top)
+        
+        return resultado
+    
+    def _categorizar_com_cache(self, representantes: Dict[str, Dict],
+                               modelo: ModeloPalavrasChave) -> Dict[str, Tuple]:
+        """(área, score, top-k) por hash do texto, consultando o cache persistente antes do motor vetorizado"""
+        cache = self.db_manager.get_cache_categorizacao(list(representantes), modelo.versao)
+        
+        areas_por_hash = {}
+        faltantes = {}
+        for hash_texto, evento in representantes.items():
+            if hash_texto in cache:
+                areas_por_hash[hash_texto] = cache[hash_texto]
+            else:
+                faltantes[hash_texto] = evento
+        
+        self.cache_acertos += len(areas_por_hash)
+        self.cache_falhas += len(faltantes)
+        if not faltantes:
+            return areas_por_hash
+        
+        # Scores dos eventos fora do cache calculados de uma vez pelo motor vetorizado
+        resultados = self.categorizar_com_scores(list(faltantes.values()), modelo)
+        novos = []
+        for hash_texto, (area, score, top) in zip(faltantes, resultados):
+            areas_por_hash[hash_texto] = (area, score, top)
+            novos.append((hash_texto, area, score, top))
+        self.db_manager.salvar_cache_categorizacao(novos, modelo.versao)
+        
+        return areas_por_hash
+    
+    def estatisticas_cache(self, zerar: bool = False) -> Dict[str, int]:
+        """Acertos e falhas do cache de categorização desde o início (ou último zeramento)"""
+        estatisticas = {'acertos': self.cache_acertos, 'falhas': self.cache_falhas}
+        if zerar:
+            self.cache_acertos = 0
+            self.cache_falhas = 0
+        return estatisticas
+    
     def atualizar_categorizacao_evento(self, evento_id: str, area_tecnica: str) -> bool:
         """Atualiza a categorização de um evento específico"""
         try:
@@ -1,15 +1,83 @@
 import sqlite3
 import os
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+
+from etl.deduplicacao import gerar_fingerprint_evento
+from etl.indice_termos import CAMPOS_ANALISE, radicais_evento
+
+# Tipos de log que registram uma execução do ETL (agendada ou `etl_main.py uma-vez`)
+TIPOS_EXECUCAO_ETL = ('ETL_COMPLETO', 'ETL_UMA_VEZ')
+
+# Tabelas cujas alterações são contadas em contadores_alteracao (caches e ETags da API)
+TABELAS_MONITORADAS = ('areas_tecnicas', 'eventos', 'proposicoes', 'logs_atualizacao', 'registros_rejeitados')
+
+def erro_bloqueio(erro: Exception) -> bool:
+    """Se o erro é de banco ocupado/travado (SQLITE_BUSY / SQLITE_LOCKED)"""
+    return isinstance(erro, sqlite3.OperationalError) and ('locked' in str(erro) or 'busy' in str(erro))
 
 class DatabaseManager:
     def __init__(self, db_path: str = "database/agenda_congresso.db"):
         self.db_path = db_path
+        self._colunas_extras_verificadas = False
+        # Instantes das falhas por banco ocupado/travado (health check e métricas)
+        self._falhas_bloqueio = deque(maxlen=1000)
+        self.falhas_bloqueio_total = 0
+        self._lock_falhas = threading.Lock()
+        # Conexão do processo que lê contadores_alteracao só quando o banco muda (get_versao_tabela)
+        self._lock_versoes = threading.Lock()
+        self._conn_versoes: Optional[sqlite3.Connection] = None
+        self._pid_versoes = None
+        self._data_version = None
+        self._versoes_tabelas: Dict[str, int] = {}
         self._ensure_database_exists()
         self._initialize_schema()
+        self._ensure_eventos_extra_columns()
         self._populate_areas_tecnicas()
 
+    def _registrar_falha(self, erro: Exception):
+        """Conta falhas de banco ocupado/travado (SQLITE_BUSY / SQLITE_LOCKED)"""
+        if erro_bloqueio(erro):
+            with self._lock_falhas:
+                self._falhas_bloqueio.append(time.monotonic())
+                self.falhas_bloqueio_total += 1
+
+    def falhas_bloqueio_recentes(self, janela: float = 300) -> int:
+        """Falhas por banco ocupado/travado nos últimos janela segundos"""
+        limite = time.monotonic() - janela
+        with self._lock_falhas:
+            return sum(1 for instante in self._falhas_bloqueio if instante >= limite)
+
+    def verificar_saude(self, integridade: bool = False, timeout: float = 1.0) -> Dict:
+        """Tempo de uma leitura trivial (e de PRAGMA quick_check, se pedido), modo do journal e tamanho do WAL"""
+        saude = {'ok': False}
+        try:
+            inicio = time.perf_counter()
+            with sqlite3.connect(self.db_path, timeout=timeout) as conn:
+                conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+                saude['leitura_ms'] = round((time.perf_counter() - inicio) * 1000, 2)
+                saude['journal_mode'] = conn.execute("PRAGMA journal_mode").fetchone()[0]
+                if integridade:
+                    inicio = time.perf_counter()
+                    # Até 10 problemas; o SQLite não verifica só parte do arquivo
+                    resultado = [linha[0] for linha in conn.execute("PRAGMA quick_check(10)")]
+                    saude['integridade'] = 'ok' if resultado == ['ok'] else resultado
+                    saude['integridade_ms'] = round((time.perf_counter() - inicio) * 1000, 2)
+            saude['ok'] = True
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao verificar banco: {e}")
+            saude['erro'] = str(e)
+            saude['bloqueado'] = erro_bloqueio(e)
+        wal = f"{self.db_path}-wal"
+        saude['wal_bytes'] = os.path.getsize(wal) if os.path.exists(wal) else 0
+        return saude
+
     def _ensure_database_exists(self):
         """Garante que o diretório do banco existe"""
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
@@ -102,8 +170,180 @@ class DatabaseManager:
                 )
             """)
 
+            # Tabela de registros rejeitados (dead-letter)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS registros_rejeitados (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    fingerprint TEXT UNIQUE NOT NULL,
+                    fonte TEXT NOT NULL,
+                    etapa TEXT,
+                    tipo_erro TEXT,
+                    mensagem_erro TEXT,
+                    payload TEXT NOT NULL,
+                    ocorrencias INTEGER DEFAULT 1,
+                    primeira_ocorrencia TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    ultima_ocorrencia TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    reprocessado INTEGER DEFAULT 0,
+                    data_reprocessamento TIMESTAMP
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_rejeitados_fonte
+                ON registros_rejeitados(fonte, reprocessado)
+            """)
+
+            # Cache dos documentos de detalhamento de eventos (uriDetalhamento)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_detalhes_eventos (
+                    uri TEXT PRIMARY KEY,
+                    etag TEXT,
+                    hash_resumo TEXT,
+                    conteudo TEXT,
+                    data_atualizacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            # Contadores de alteração por tabela, incrementados por triggers
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS contadores_alteracao (
+                    tabela TEXT PRIMARY KEY,
+                    versao INTEGER NOT NULL DEFAULT 0,
+                    data_alteracao TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            colunas_contadores = {row[1] for row in conn.execute("PRAGMA table_info(contadores_alteracao)")}
+            if 'data_alteracao' not in colunas_contadores:
+                conn.execute("ALTER TABLE contadores_alteracao ADD COLUMN data_alteracao TIMESTAMP")
+            for tabela in TABELAS_MONITORADAS:
+                for operacao in ('INSERT', 'UPDATE', 'DELETE'):
+                    # Recriados para bancos com a versão anterior dos triggers (sem data_alteracao)
+                    conn.execute(f"DROP TRIGGER IF EXISTS trg_{tabela}_{operacao.lower()}")
+                    conn.execute(f"""
+                        CREATE TRIGGER trg_{tabela}_{operacao.lower()}
+                        AFTER {operacao} ON {tabela}
+                        BEGIN
+                            INSERT INTO contadores_alteracao (tabela, versao, data_alteracao)
+                            VALUES ('{tabela}', 1, CURRENT_TIMESTAMP)
+                            ON CONFLICT(tabela) DO UPDATE SET
+                                versao = versao + 1, data_alteracao = CURRENT_TIMESTAMP;
+                        END
+                    """)
+
+            # Diário de alterações de eventos (stream da API com retomada por Last-Event-ID)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS journal_eventos (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    evento_id_externo TEXT NOT NULL,
+                    operacao TEXT NOT NULL,
+                    data_registro TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            self._criar_triggers_journal(conn)
+
+            # Índice invertido radical -> evento, usado na recategorização incremental
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS indice_tokens_eventos (
+                    token TEXT NOT NULL,
+                    evento_id_externo TEXT NOT NULL,
+                    PRIMARY KEY (token, evento_id_externo)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_indice_tokens_evento
+                ON indice_tokens_eventos(evento_id_externo)
+            """)
+
+            # Palavras-chave com que os eventos armazenados foram categorizados
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS categorizacao_aplicada (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    versao TEXT NOT NULL,
+                    areas TEXT NOT NULL,
+                    data_atualizacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            # Cache de categorização por hash do texto e versão das palavras-chave
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_categorizacao (
+                    hash_texto TEXT NOT NULL,
+                    versao_palavras_chave TEXT NOT NULL,
+                    area_tecnica TEXT,
+                    score REAL,
+                    scores_areas TEXT,
+                    data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (hash_texto, versao_palavras_chave)
+                )
+            """)
+            colunas_cache = {row[1] for row in conn.execute("PRAGMA table_info(cache_categorizacao)")}
+            if 'scores_areas' not in colunas_cache:
+                conn.execute("ALTER TABLE cache_categorizacao ADD COLUMN scores_areas TEXT")
+
+            # Áreas de maior score de cada evento (top-k), para consultas por score mínimo
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS scores_areas_eventos (
+                    evento_id_externo TEXT NOT NULL,
+                    area_tecnica TEXT NOT NULL,
+                    score REAL NOT NULL,
+                    PRIMARY KEY (evento_id_externo, area_tecnica)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_scores_area_score
+                ON scores_areas_eventos(area_tecnica, score)
+            """)
+
+            # Área sugerida pela categorização automática da ementa
+            colunas_proposicoes = {row[1] for row in conn.execute("PRAGMA table_info(proposicoes)")}
+            if 'area_sugerida' not in colunas_proposicoes:
+                conn.execute("ALTER TABLE proposicoes ADD COLUMN area_sugerida TEXT")
+            if 'score_sugerido' not in colunas_proposicoes:
+                conn.execute("ALTER TABLE proposicoes ADD COLUMN score_sugerido REAL")
+            if 'hash_sugestao' not in colunas_proposicoes:
+                conn.execute("ALTER TABLE proposicoes ADD COLUMN hash_sugestao TEXT")
+
             conn.commit()
 
+    def _criar_triggers_journal(self, conn):
+        """Triggers que registram em journal_eventos só as alterações visíveis de eventos.
+        
+        insert_evento usa INSERT OR REPLACE: o trigger BEFORE INSERT compara
+        com a linha existente, para que regravar um evento inalterado não
+        gere registro e regravar um evento existente conte como atualização.
+        """
+        colunas = ('nome', 'data_inicio', 'data_fim', 'situacao', 'tema', 'tipo_evento', 'local_evento',
+                   'link_evento', 'area_tecnica', 'comissao', 'finalidade', 'evento_canonico')
+        iguais = ' AND '.join(f"e.{coluna} IS NEW.{coluna}" for coluna in colunas)
+        diferentes = ' OR '.join(f"OLD.{coluna} IS NOT NEW.{coluna}" for coluna in colunas)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_journal_eventos_insert
+            BEFORE INSERT ON eventos
+            WHEN NOT EXISTS (
+                SELECT 1 FROM eventos e WHERE e.evento_id_externo = NEW.evento_id_externo AND {iguais}
+            )
+            BEGIN
+                INSERT INTO journal_eventos (evento_id_externo, operacao)
+                VALUES (NEW.evento_id_externo, CASE
+                    WHEN EXISTS (SELECT 1 FROM eventos WHERE evento_id_externo = NEW.evento_id_externo)
+                    THEN 'UPDATE' ELSE 'INSERT' END);
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_journal_eventos_update
+            AFTER UPDATE ON eventos
+            WHEN {diferentes}
+            BEGIN
+                INSERT INTO journal_eventos (evento_id_externo, operacao) VALUES (NEW.evento_id_externo, 'UPDATE');
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_journal_eventos_delete
+            AFTER DELETE ON eventos
+            BEGIN
+                INSERT INTO journal_eventos (evento_id_externo, operacao) VALUES (OLD.evento_id_externo, 'DELETE');
+            END
+        """)
+
     def _populate_areas_tecnicas(self):
         """Popula as áreas técnicas com dados padrão"""
         areas_data = [
@@ -136,7 +376,9 @@ class DatabaseManager:
             conn.commit()
 
     def _ensure_eventos_extra_columns(self):
-        """Garante que colunas novas existam em eventos (comissao, finalidade)."""
+        """Garante que colunas novas existam em eventos (comissao, finalidade, deduplicação, categorização manual)."""
+        if self._colunas_extras_verificadas:
+            return
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.execute("PRAGMA table_info(eventos)")
@@ -145,22 +387,55 @@ class DatabaseManager:
                     conn.execute("ALTER TABLE eventos ADD COLUMN comissao TEXT")
                 if 'finalidade' not in cols:
                     conn.execute("ALTER TABLE eventos ADD COLUMN finalidade TEXT")
+                if 'fingerprint' not in cols:
+                    conn.execute("ALTER TABLE eventos ADD COLUMN fingerprint TEXT")
+                if 'evento_canonico' not in cols:
+                    conn.execute("ALTER TABLE eventos ADD COLUMN evento_canonico TEXT")
+                if 'categorizacao_manual' not in cols:
+                    conn.execute("ALTER TABLE eventos ADD COLUMN categorizacao_manual INTEGER DEFAULT 0")
+                    # Antes desta coluna o ETL não gravava áreas: as existentes vieram de /categorizar
+                    conn.execute("UPDATE eventos SET categorizacao_manual = 1 WHERE area_tecnica IS NOT NULL")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_eventos_fingerprint ON eventos(fingerprint)")
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_eventos_canonico ON eventos(evento_canonico)")
                 conn.commit()
+                self._colunas_extras_verificadas = True
         except Exception as e:
+            self._registrar_falha(e)
             print(f"Aviso ao ajustar colunas de eventos: {e}")
 
+    def _buscar_evento_canonico(self, conn, evento: Dict) -> Optional[str]:
+        """Procura, pelo fingerprint, um evento canônico de outra fonte"""
+        row = conn.execute("""
+            SELECT evento_id_externo FROM eventos
+            WHERE fingerprint = ? AND evento_canonico IS NULL
+              AND evento_id_externo != ? AND fonte != ?
+            LIMIT 1
+        """, (evento['fingerprint'], evento['evento_id_externo'], evento.get('fonte') or '')).fetchone()
+        return row[0] if row else None
+
     def insert_evento(self, evento: Dict) -> bool:
-        """Insere ou atualiza um evento"""
+        """Insere ou atualiza um evento, vinculando duplicatas entre fontes ao evento canônico"""
         try:
             # Garantir colunas extras
             self._ensure_eventos_extra_columns()
+            if not evento.get('fingerprint'):
+                evento['fingerprint'] = gerar_fingerprint_evento(evento)
             with sqlite3.connect(self.db_path) as conn:
+                evento_canonico = self._buscar_evento_canonico(conn, evento)
+                # Categorização manual prevalece sobre a automática
+                manual = conn.execute("""
+                    SELECT area_tecnica FROM eventos
+                    WHERE evento_id_externo = ? AND categorizacao_manual = 1
+                """, (evento['evento_id_externo'],)).fetchone()
+                if manual:
+                    evento['area_tecnica'] = manual[0]
                 conn.execute("""
                     INSERT OR REPLACE INTO eventos (
                         evento_id_externo, nome, data_inicio, data_fim, situacao,
                         tema, tipo_evento, local_evento, link_evento, area_tecnica,
-                        fonte, comissao, finalidade, data_atualizacao
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        fonte, comissao, finalidade, fingerprint, evento_canonico,
+                        categorizacao_manual, data_atualizacao
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, (
                     evento['evento_id_externo'],
                     evento['nome'],
@@ -175,48 +450,158 @@ class DatabaseManager:
                     evento.get('fonte'),
                     evento.get('comissao'),
                     evento.get('finalidade'),
+                    evento['fingerprint'],
+                    evento_canonico,
+                    1 if manual else 0,
                     datetime.now().isoformat()
                 ))
+                self._indexar_tokens_evento(conn, evento)
+                if 'scores_areas' in evento:
+                    self._salvar_scores_evento(conn, evento['evento_id_externo'], evento['scores_areas'])
                 conn.commit()
                 return True
         except Exception as e:
+            self._registrar_falha(e)
             print(f"Erro ao inserir evento: {e}")
             return False
 
-    def get_eventos_por_area(self, area_tecnica: str = None, limit: int = 100) -> List[Dict]:
-        """Retorna eventos, opcionalmente filtrados por área"""
+    def _indexar_tokens_evento(self, conn, evento: Dict):
+        """Atualiza as entradas do evento no índice invertido de radicais"""
+        conn.execute("DELETE FROM indice_tokens_eventos WHERE evento_id_externo = ?",
+                     (evento['evento_id_externo'],))
+        conn.executemany("""
+            INSERT OR IGNORE INTO indice_tokens_eventos (token, evento_id_externo) VALUES (?, ?)
+        """, [(token, evento['evento_id_externo']) for token in radicais_evento(evento)])
+
+    def _salvar_scores_evento(self, conn, evento_id_externo: str, scores_areas):
+        """Substitui o top-k de (área, score) do evento"""
+        conn.execute("DELETE FROM scores_areas_eventos WHERE evento_id_externo = ?", (evento_id_externo,))
+        conn.executemany("""
+            INSERT INTO scores_areas_eventos (evento_id_externo, area_tecnica, score) VALUES (?, ?, ?)
+        """, [(evento_id_externo, area, score) for area, score in scores_areas])
+
+    @contextmanager
+    def leitura_consistente(self):
+        """Conexão em uma transação de leitura: as consultas feitas nela veem o mesmo estado do banco"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("BEGIN")
+            yield conn
+        finally:
+            conn.rollback()
+            conn.close()
+
+    def get_eventos_por_area(self, area_tecnica: str = None, limit: int = 100,
+                             expandir_duplicados: bool = False, conn: sqlite3.Connection = None) -> List[Dict]:
+        """Retorna eventos canônicos, opcionalmente filtrados por área (na conexão informada, se houver)"""
+        try:
+            if conn is None:
+                with sqlite3.connect(self.db_path) as conn:
+                    return self.get_eventos_por_area(area_tecnica, limit, expandir_duplicados, conn)
+            
+            if area_tecnica:
+                cursor = conn.execute("""
+                    SELECT * FROM eventos 
+                    WHERE area_tecnica = ? AND evento_canonico IS NULL
+                    ORDER BY data_inicio DESC
+                    LIMIT ?
+                """, (area_tecnica, limit))
+            else:
+                cursor = conn.execute("""
+                    SELECT * FROM eventos 
+                    WHERE evento_canonico IS NULL
+                    ORDER BY data_inicio DESC
+                    LIMIT ?
+                """, (limit,))
+            
+            eventos = []
+            for row in cursor.fetchall():
+                eventos.append(dict(zip([col[0] for col in cursor.description], row)))
+            
+            if expandir_duplicados:
+                self._anexar_duplicados(conn, eventos)
+            
+            return eventos
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao buscar eventos: {e}")
+            return []
+
+    def get_contadores_eventos_area(self, area_tecnica: str, conn: sqlite3.Connection = None) -> Dict:
+        """Total de eventos canônicos da área e quantos estão em andamento ou encerrados"""
+        try:
+            if conn is None:
+                with sqlite3.connect(self.db_path) as conn:
+                    return self.get_contadores_eventos_area(area_tecnica, conn)
+            
+            total, em_andamento, encerrados = conn.execute("""
+                SELECT COUNT(*),
+                       SUM(CASE WHEN situacao = 'Em Andamento' THEN 1 ELSE 0 END),
+                       SUM(CASE WHEN situacao = 'Encerrada' THEN 1 ELSE 0 END)
+                FROM eventos
+                WHERE area_tecnica = ? AND evento_canonico IS NULL
+            """, (area_tecnica,)).fetchone()
+            return {'eventos': total, 'em_andamento': em_andamento or 0, 'encerrados': encerrados or 0}
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao contar eventos: {e}")
+            return {'eventos': 0, 'em_andamento': 0, 'encerrados': 0}
+
+    def get_eventos_por_score(self, area_tecnica: str, min_score: float, limit: int = 100,
+                              expandir_duplicados: bool = False) -> List[Dict]:
+        """Eventos canônicos com score na área de pelo menos min_score, inclusive como área secundária"""
         try:
             with sqlite3.connect(self.db_path) as conn:
-                if area_tecnica:
-                    cursor = conn.execute("""
-                        SELECT * FROM eventos 
-                        WHERE area_tecnica = ?
-                        ORDER BY data_inicio DESC
-                        LIMIT ?
-                    """, (area_tecnica, limit))
-                else:
-                    cursor = conn.execute("""
-                        SELECT * FROM eventos 
-                        ORDER BY data_inicio DESC
-                        LIMIT ?
-                    """, (limit,))
+                cursor = conn.execute("""
+                    SELECT e.*, s.score AS score_area FROM scores_areas_eventos s
+                    JOIN eventos e ON e.evento_id_externo = s.evento_id_externo
+                    WHERE s.area_tecnica = ? AND s.score >= ? AND e.evento_canonico IS NULL
+                    ORDER BY s.score DESC, e.data_inicio DESC
+                    LIMIT ?
+                """, (area_tecnica, min_score, limit))
                 
                 eventos = []
                 for row in cursor.fetchall():
-                    eventos.append(dict(zip([col[0] for col in cursor.description], row)))
+                    evento = dict(zip([col[0] for col in cursor.description], row))
+                    evento['area_secundaria'] = evento['area_tecnica'] != area_tecnica
+                    eventos.append(evento)
+                
+                if expandir_duplicados:
+                    self._anexar_duplicados(conn, eventos)
                 
                 return eventos
         except Exception as e:
-            print(f"Erro ao buscar eventos: {e}")
+            self._registrar_falha(e)
+            print(f"Erro ao buscar eventos por score: {e}")
             return []
 
+    def _anexar_duplicados(self, conn, eventos: List[Dict]):
+        """Anexa a cada evento canônico a lista de duplicatas vinculadas a ele"""
+        por_id = {evento['evento_id_externo']: evento for evento in eventos}
+        for evento in eventos:
+            evento['duplicados'] = []
+        
+        ids = list(por_id.keys())
+        # Consultas em blocos para respeitar o limite de parâmetros do SQLite
+        for inicio in range(0, len(ids), 500):
+            bloco = ids[inicio:inicio + 500]
+            cursor = conn.execute(f"""
+                SELECT * FROM eventos
+                WHERE evento_canonico IN ({','.join('?' * len(bloco))})
+            """, bloco)
+            colunas = [col[0] for col in cursor.description]
+            for row in cursor.fetchall():
+                duplicado = dict(zip(colunas, row))
+                por_id[duplicado['evento_canonico']]['duplicados'].append(duplicado)
+
     def get_eventos_nao_categorizados(self, limit: int = 100) -> List[Dict]:
-        """Retorna eventos não categorizados"""
+        """Retorna eventos canônicos não categorizados"""
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.execute("""
                     SELECT * FROM eventos 
-                    WHERE area_tecnica IS NULL OR area_tecnica = ''
+                    WHERE (area_tecnica IS NULL OR area_tecnica = '')
+                      AND evento_canonico IS NULL
                     ORDER BY data_inicio DESC
                     LIMIT ?
                 """, (limit,))
@@ -227,6 +612,7 @@ class DatabaseManager:
                 
                 return eventos
         except Exception as e:
+            self._registrar_falha(e)
             print(f"Erro ao buscar eventos não categorizados: {e}")
             return []
 
@@ -242,9 +628,21 @@ class DatabaseManager:
                 
                 return areas
         except Exception as e:
+            self._registrar_falha(e)
             print(f"Erro ao buscar áreas técnicas: {e}")
             return []
 
+    def evento_existe(self, evento_id_externo: str) -> bool:
+        """Indica se o evento já está no banco, canônico ou vinculado a outro"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                return conn.execute("SELECT 1 FROM eventos WHERE evento_id_externo = ?",
+                                    (evento_id_externo,)).fetchone() is not None
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao verificar evento: {e}")
+            return False
+
     def update_evento_situacao(self, evento_id_externo: str, situacao: str) -> bool:
         """Atualiza a situação de um evento"""
         try:
@@ -257,6 +655,7 @@ class DatabaseManager:
                 conn.commit()
                 return True
         except Exception as e:
+            self._registrar_falha(e)
             print(f"Erro ao atualizar situação do evento: {e}")
             return False
 
@@ -266,12 +665,13 @@ class DatabaseManager:
             with sqlite3.connect(self.db_path) as conn:
                 conn.execute("""
                     UPDATE eventos 
-                    SET area_tecnica = ?, data_atualizacao = ?
+                    SET area_tecnica = ?, categorizacao_manual = 1, data_atualizacao = ?
                     WHERE evento_id_externo = ?
                 """, (area_tecnica, datetime.now().isoformat(), evento_id))
                 conn.commit()
                 return True
         except Exception as e:
+            self._registrar_falha(e)
             print(f"Erro ao atualizar área técnica do evento: {e}")
             return False
 
@@ -291,6 +691,8 @@ class DatabaseManager:
                     return False
                 
                 set_clause = ', '.join([f"{campo} = ?" for campo in campos_para_atualizar.keys()])
+                if 'area_tecnica' in campos_para_atualizar:
+                    set_clause += ", categorizacao_manual = 1"
                 valores = list(campos_para_atualizar.values()) + [datetime.now().isoformat(), evento_id]
                 
                 conn.execute(f"""
@@ -298,19 +700,27 @@ class DatabaseManager:
                     SET {set_clause}, data_atualizacao = ?
                     WHERE evento_id_externo = ?
                 """, valores)
+                
+                if any(campo in CAMPOS_ANALISE for campo in campos_para_atualizar):
+                    cursor = conn.execute("SELECT * FROM eventos WHERE evento_id_externo = ?", (evento_id,))
+                    row = cursor.fetchone()
+                    if row:
+                        self._indexar_tokens_evento(conn, dict(zip([col[0] for col in cursor.description], row)))
                 conn.commit()
                 return True
         except Exception as e:
+            self._registrar_falha(e)
             print(f"Erro ao atualizar evento: {e}")
             return False
 
     def buscar_eventos(self, termo: str) -> List[Dict]:
-        """Busca eventos por termo"""
+        """Busca eventos canônicos por termo"""
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.execute("""
                     SELECT * FROM eventos 
-                    WHERE nome LIKE ? OR tema LIKE ? OR tipo_evento LIKE ?
+                    WHERE (nome LIKE ? OR tema LIKE ? OR tipo_evento LIKE ?)
+                      AND evento_canonico IS NULL
                     ORDER BY data_inicio DESC
                     LIMIT 50
                 """, (f'%{termo}%', f'%{termo}%', f'%{termo}%'))
@@ -321,6 +731,7 @@ class DatabaseManager:
                 
                 return eventos
         except Exception as e:
+            self._registrar_falha(e)
             print(f"Erro ao buscar eventos: {e}")
             return []
 
@@ -335,8 +746,28 @@ class DatabaseManager:
                 """, (tipo, status, eventos_novos, eventos_atualizados, detalhes))
                 conn.commit()
         except Exception as e:
+            self._registrar_falha(e)
             print(f"Erro ao registrar log: {e}")
 
+    def get_ultima_atualizacao(self, tipos: Tuple[str, ...] = TIPOS_EXECUCAO_ETL,
+                               status: str = 'SUCESSO') -> Optional[Dict]:
+        """Último log de atualização de um dos tipos com o status, com a idade em segundos"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                row = conn.execute(f"""
+                    SELECT *, (julianday('now') - julianday(data_atualizacao)) * 86400 AS idade_segundos
+                    FROM logs_atualizacao
+                    WHERE tipo_atualizacao IN ({','.join('?' * len(tipos))}) AND status = ?
+                    ORDER BY id DESC
+                    LIMIT 1
+                """, (*tipos, status)).fetchone()
+                return dict(row) if row else None
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao buscar última atualização: {e}")
+            return None
+
     def get_proposicoes_por_area(self, area_tecnica: str) -> List[Dict]:
         """Retorna proposições de uma área técnica específica"""
         try:
@@ -353,6 +784,7 @@ class DatabaseManager:
                 
                 return proposicoes
         except Exception as e:
+            self._registrar_falha(e)
             print(f"Erro ao buscar proposições: {e}")
             return []
 
@@ -365,8 +797,9 @@ class DatabaseManager:
                         numero_projeto, ementa, casa_iniciadora, forma_apreciacao,
                         eixo_tematico, situacao, cabe_analise, prazo_analise,
                         analise_realizada, documento_analise, posicionamento_cnm,
-                        prioridade, observacao, area_tecnica
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        prioridade, observacao, area_tecnica,
+                        area_sugerida, score_sugerido, hash_sugestao
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, (
                     proposicao['numero_projeto'],
                     proposicao['ementa'],
@@ -381,12 +814,16 @@ class DatabaseManager:
                     proposicao['posicionamento_cnm'],
                     proposicao['prioridade'],
                     proposicao.get('observacao', ''),
-                    proposicao['area_tecnica']
+                    proposicao.get('area_tecnica') or proposicao.get('area_sugerida') or '',
+                    proposicao.get('area_sugerida'),
+                    proposicao.get('score_sugerido'),
+                    proposicao.get('hash_sugestao')
                 ))
                 
                 conn.commit()
                 return cursor.lastrowid
         except Exception as e:
+            self._registrar_falha(e)
             print(f"Erro ao inserir proposição: {e}")
             raise
 
@@ -422,6 +859,7 @@ class DatabaseManager:
                 conn.commit()
                 return True
         except Exception as e:
+            self._registrar_falha(e)
             print(f"Erro ao atualizar proposição: {e}")
             return False
 
@@ -433,9 +871,125 @@ class DatabaseManager:
                 conn.commit()
                 return True
         except Exception as e:
+            self._registrar_falha(e)
             print(f"Erro ao excluir proposição: {e}")
             return False
 
+    def contar_proposicoes(self) -> int:
+        """Total de proposições cadastradas"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                return conn.execute("SELECT COUNT(*) FROM proposicoes").fetchone()[0]
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao contar proposições: {e}")
+            return 0
+
+    def iterar_proposicoes(self, tamanho_lote: int = 500):
+        """Percorre as proposições em lotes (id, ementa, eixo temático e hash da sugestão)"""
+        ultimo_id = 0
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                while True:
+                    lote = conn.execute("""
+                        SELECT id, ementa, eixo_tematico, hash_sugestao FROM proposicoes
+                        WHERE id > ?
+                        ORDER BY id
+                        LIMIT ?
+                    """, (ultimo_id, tamanho_lote)).fetchall()
+                    if not lote:
+                        break
+                    ultimo_id = lote[-1]['id']
+                    yield [dict(row) for row in lote]
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao buscar proposições: {e}")
+
+    def _iterar_exportacao(self, tabela: str, chave: str, inicio, condicoes: List[str],
+                           parametros: List, tamanho_lote: int):
+        """Lotes de linhas completas da tabela, em ordem da chave (paginação por chave).
+        
+        Cada lote é uma consulta curta: entre um lote e outro nenhuma trava de
+        leitura fica aberta, por mais lento que seja o cliente, e a memória
+        usada não depende do tamanho da tabela.
+        """
+        filtro = ' AND '.join([f"{chave} > ?"] + condicoes)
+        ultimo = inicio
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                while True:
+                    lote = conn.execute(
+                        f"SELECT * FROM {tabela} WHERE {filtro} ORDER BY {chave} LIMIT ?",
+                        [ultimo] + parametros + [tamanho_lote]
+                    ).fetchall()
+                    if not lote:
+                        break
+                    ultimo = lote[-1][chave]
+                    yield [dict(row) for row in lote]
+        except sqlite3.Error as e:
+            self._registrar_falha(e)
+            print(f"Erro ao exportar {tabela}: {e}")
+            # Interromper a exportação: o cliente não deve receber um arquivo truncado como completo
+            raise
+
+    def iterar_eventos_exportacao(self, area_tecnica: str = None, fonte: str = None, situacao: str = None,
+                                  incluir_duplicados: bool = False, tamanho_lote: int = 500):
+        """Percorre eventos em lotes para exportação, por evento_id_externo.
+        
+        A chave externa (e não o id) garante que um evento regravado durante a
+        exportação, que recebe outro id, não saia duas vezes.
+        """
+        condicoes = []
+        parametros = []
+        for coluna, valor in (('area_tecnica', area_tecnica), ('fonte', fonte), ('situacao', situacao)):
+            if valor:
+                condicoes.append(f"{coluna} = ?")
+                parametros.append(valor)
+        if not incluir_duplicados:
+            condicoes.append("evento_canonico IS NULL")
+        return self._iterar_exportacao('eventos', 'evento_id_externo', '', condicoes, parametros, tamanho_lote)
+
+    def iterar_proposicoes_exportacao(self, area_tecnica: str = None, situacao: str = None,
+                                      casa_iniciadora: str = None, prioridade: str = None,
+                                      tamanho_lote: int = 500):
+        """Percorre proposições em lotes para exportação, por id"""
+        condicoes = []
+        parametros = []
+        for coluna, valor in (('area_tecnica', area_tecnica), ('situacao', situacao),
+                              ('casa_iniciadora', casa_iniciadora), ('prioridade', prioridade)):
+            if valor:
+                condicoes.append(f"{coluna} = ?")
+                parametros.append(valor)
+        return self._iterar_exportacao('proposicoes', 'id', 0, condicoes, parametros, tamanho_lote)
+
+    def salvar_sugestoes_proposicoes(self, sugestoes: List[tuple]) -> int:
+        """Grava (id, área sugerida, score, hash_sugestao) em uma transação.
+        
+        area_tecnica só é preenchida com a sugestão quando está vazia.
+        """
+        if not sugestoes:
+            return 0
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany("""
+                    UPDATE proposicoes SET
+                        area_sugerida = ?, score_sugerido = ?, hash_sugestao = ?,
+                        area_tecnica = CASE
+                            WHEN COALESCE(area_tecnica, '') = '' THEN COALESCE(?, '')
+                            ELSE area_tecnica
+                        END
+                    WHERE id = ?
+                """, [(area, score, hash_sugestao, area, proposicao_id)
+                      for proposicao_id, area, score, hash_sugestao in sugestoes])
+                conn.commit()
+                return len(sugestoes)
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao salvar sugestões de proposições: {e}")
+            return 0
+
     def get_estatisticas_proposicoes(self, area_tecnica: str) -> Dict:
         """Retorna estatísticas de proposições por área técnica"""
         try:
@@ -490,6 +1044,7 @@ class DatabaseManager:
                         'presidencia_cnm_neutro': 0
                     }
         except Exception as e:
+            self._registrar_falha(e)
             print(f"Erro ao buscar estatísticas: {e}")
             return {
                 'cnm_favoravel': 0,
@@ -505,3 +1060,440 @@ class DatabaseManager:
                 'presidencia_cnm_desfavoravel': 0,
                 'presidencia_cnm_neutro': 0
             }
+
+    def registrar_rejeitados(self, registros: List[Dict], ignorados: List[str] = None) -> int:
+        """Persiste registros rejeitados e atualiza a última ocorrência dos já conhecidos"""
+        if not registros and not ignorados:
+            return 0
+
+        agora = datetime.now().isoformat()
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany("""
+                    INSERT INTO registros_rejeitados (
+                        fingerprint, fonte, etapa, tipo_erro, mensagem_erro, payload,
+                        primeira_ocorrencia, ultima_ocorrencia
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(fingerprint) DO UPDATE SET
+                        etapa = excluded.etapa,
+                        tipo_erro = excluded.tipo_erro,
+                        mensagem_erro = excluded.mensagem_erro,
+                        ocorrencias = ocorrencias + 1,
+                        ultima_ocorrencia = excluded.ultima_ocorrencia,
+                        reprocessado = 0
+                """, [(
+                    r['fingerprint'], r['fonte'], r.get('etapa'), r.get('tipo_erro'),
+                    r.get('mensagem_erro'), r['payload'], agora, agora
+                ) for r in registros or []])
+
+                conn.executemany("""
+                    UPDATE registros_rejeitados
+                    SET ocorrencias = ocorrencias + 1, ultima_ocorrencia = ?
+                    WHERE fingerprint = ?
+                """, [(agora, fingerprint) for fingerprint in ignorados or []])
+                conn.commit()
+                return len(registros or [])
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao registrar rejeitados: {e}")
+            return 0
+
+    def get_fingerprints_rejeitados(self, fonte: str) -> set:
+        """Retorna fingerprints rejeitados ainda não reprocessados de uma fonte"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.execute("""
+                    SELECT fingerprint FROM registros_rejeitados
+                    WHERE fonte = ? AND reprocessado = 0
+                """, (fonte,))
+                return {row[0] for row in cursor.fetchall()}
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao buscar fingerprints rejeitados: {e}")
+            return set()
+
+    def get_registros_rejeitados(self, fonte: str = None, incluir_reprocessados: bool = False,
+                                 limit: int = 100) -> List[Dict]:
+        """Retorna registros rejeitados, opcionalmente filtrados por fonte"""
+        try:
+            condicoes = []
+            parametros = []
+            if fonte:
+                condicoes.append("fonte = ?")
+                parametros.append(fonte)
+            if not incluir_reprocessados:
+                condicoes.append("reprocessado = 0")
+
+            where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.execute(f"""
+                    SELECT * FROM registros_rejeitados
+                    {where}
+                    ORDER BY ultima_ocorrencia DESC
+                    LIMIT ?
+                """, parametros + [limit])
+
+                registros = []
+                for row in cursor.fetchall():
+                    registros.append(dict(zip([col[0] for col in cursor.description], row)))
+
+                return registros
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao buscar registros rejeitados: {e}")
+            return []
+
+    def marcar_rejeitado_reprocessado(self, fingerprint: str) -> bool:
+        """Marca um registro rejeitado como reprocessado com sucesso"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.execute("""
+                    UPDATE registros_rejeitados
+                    SET reprocessado = 1, data_reprocessamento = ?
+                    WHERE fingerprint = ?
+                """, (datetime.now().isoformat(), fingerprint))
+                conn.commit()
+                return cursor.rowcount > 0
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao marcar rejeitado como reprocessado: {e}")
+            return False
+
+    def get_cache_detalhes(self, uris: List[str]) -> Dict[str, Dict]:
+        """Retorna as entradas do cache de detalhamento para as URIs informadas"""
+        cache = {}
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                # Consultas em blocos para respeitar o limite de parâmetros do SQLite
+                for inicio in range(0, len(uris), 500):
+                    bloco = uris[inicio:inicio + 500]
+                    cursor = conn.execute(f"""
+                        SELECT uri, etag, hash_resumo, conteudo FROM cache_detalhes_eventos
+                        WHERE uri IN ({','.join('?' * len(bloco))})
+                    """, bloco)
+                    for uri, etag, hash_resumo, conteudo in cursor.fetchall():
+                        cache[uri] = {'etag': etag, 'hash_resumo': hash_resumo, 'conteudo': conteudo}
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao buscar cache de detalhes: {e}")
+        return cache
+
+    def salvar_cache_detalhes(self, registros: List[Dict]) -> int:
+        """Grava entradas no cache de detalhamento (uri, etag, hash_resumo, conteudo)"""
+        if not registros:
+            return 0
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany("""
+                    INSERT OR REPLACE INTO cache_detalhes_eventos (
+                        uri, etag, hash_resumo, conteudo, data_atualizacao
+                    ) VALUES (?, ?, ?, ?, ?)
+                """, [(
+                    r['uri'], r.get('etag'), r['hash_resumo'], r['conteudo'], datetime.now().isoformat()
+                ) for r in registros])
+                conn.commit()
+                return len(registros)
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao salvar cache de detalhes: {e}")
+            return 0
+
+    def get_versao_tabela(self, tabela: str) -> int:
+        """Retorna o contador de alterações de uma tabela (0 se nunca alterada).
+
+        Consultado a cada requisição que usa o modelo de palavras-chave. Uma
+        conexão dedicada do processo consulta PRAGMA data_version, que muda
+        quando outra conexão grava no banco; só então os contadores são
+        relidos. No caso comum a verificação não abre conexão nem faz E/S.
+        """
+        try:
+            with self._lock_versoes:
+                if self._conn_versoes is None or self._pid_versoes != os.getpid():
+                    # Conexões SQLite não sobrevivem ao fork: cada processo abre a sua
+                    self._conn_versoes = sqlite3.connect(self.db_path, check_same_thread=False)
+                    self._pid_versoes = os.getpid()
+                    self._data_version = None
+                data_version = self._conn_versoes.execute("PRAGMA data_version").fetchone()[0]
+                if data_version != self._data_version:
+                    self._versoes_tabelas = dict(self._conn_versoes.execute(
+                        "SELECT tabela, versao FROM contadores_alteracao"
+                    ).fetchall())
+                    self._data_version = data_version
+                return self._versoes_tabelas.get(tabela, 0)
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao buscar versão da tabela {tabela}: {e}")
+            self._conn_versoes = None
+            return 0
+
+    def get_journal_eventos(self, apos_id: int, limite: int = 500) -> List[Dict]:
+        """Alterações de eventos com id maior que apos_id, com o estado atual do evento"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                linhas = conn.execute("""
+                    SELECT j.id AS journal_id, j.operacao, j.evento_id_externo AS journal_evento, e.*
+                    FROM journal_eventos j
+                    LEFT JOIN eventos e ON e.evento_id_externo = j.evento_id_externo
+                    WHERE j.id > ?
+                    ORDER BY j.id
+                    LIMIT ?
+                """, (apos_id, limite)).fetchall()
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao ler journal de eventos: {e}")
+            return []
+
+        alteracoes = []
+        for linha in linhas:
+            evento = dict(linha)
+            journal_id = evento.pop('journal_id')
+            operacao = evento.pop('operacao')
+            evento_id_externo = evento.pop('journal_evento')
+            alteracoes.append({
+                'id': journal_id,
+                'operacao': operacao,
+                'evento_id_externo': evento_id_externo,
+                'evento': evento if evento.get('evento_id_externo') else None
+            })
+        return alteracoes
+
+    def get_limites_journal_eventos(self) -> tuple:
+        """(menor, maior) id presentes em journal_eventos; (0, 0) se vazio"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                minimo, maximo = conn.execute("SELECT MIN(id), MAX(id) FROM journal_eventos").fetchone()
+                return minimo or 0, maximo or 0
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao ler journal de eventos: {e}")
+            return 0, 0
+
+    def podar_journal_eventos(self, dias: int = 7) -> int:
+        """Remove do journal as alterações mais antigas que o número de dias"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.execute("""
+                    DELETE FROM journal_eventos WHERE data_registro < datetime('now', ?)
+                """, (f"-{dias} days",))
+                conn.commit()
+                return cursor.rowcount
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao podar journal de eventos: {e}")
+            return 0
+
+    def get_versoes_tabelas(self) -> Dict[str, int]:
+        """Contadores de alteração de todas as tabelas monitoradas"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                return dict(conn.execute("SELECT tabela, versao FROM contadores_alteracao").fetchall())
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao buscar versões das tabelas: {e}")
+            return {}
+
+    def marcar_alteracao(self, *tabelas: str) -> bool:
+        """Incrementa o contador de alteração das tabelas, para mudanças que os triggers não veem"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany("""
+                    INSERT INTO contadores_alteracao (tabela, versao, data_alteracao)
+                    VALUES (?, 1, CURRENT_TIMESTAMP)
+                    ON CONFLICT(tabela) DO UPDATE SET
+                        versao = versao + 1, data_alteracao = CURRENT_TIMESTAMP
+                """, [(tabela,) for tabela in tabelas])
+                conn.commit()
+                return True
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao marcar alteração: {e}")
+            return False
+
+    def get_cache_categorizacao(self, hashes: List[str], versao: str) -> Dict[str, tuple]:
+        """Retorna (área, score, top-k) em cache para os hashes de texto na versão de palavras-chave"""
+        cache = {}
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                for inicio in range(0, len(hashes), 500):
+                    bloco = hashes[inicio:inicio + 500]
+                    cursor = conn.execute(f"""
+                        SELECT hash_texto, area_tecnica, score, scores_areas FROM cache_categorizacao
+                        WHERE versao_palavras_chave = ? AND hash_texto IN ({','.join('?' * len(bloco))})
+                    """, [versao] + bloco)
+                    for hash_texto, area_tecnica, score, scores_areas in cursor.fetchall():
+                        top = tuple(tuple(par) for par in json.loads(scores_areas or '[]'))
+                        cache[hash_texto] = (area_tecnica, score, top)
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao buscar cache de categorização: {e}")
+        return cache
+
+    def salvar_cache_categorizacao(self, registros: List[tuple], versao: str) -> int:
+        """Grava (hash_texto, área, score, top-k) no cache de categorização da versão informada"""
+        if not registros:
+            return 0
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany("""
+                    INSERT OR REPLACE INTO cache_categorizacao (
+                        hash_texto, versao_palavras_chave, area_tecnica, score, scores_areas, data_criacao
+                    ) VALUES (?, ?, ?, ?, ?, ?)
+                """, [(hash_texto, versao, area, score, json.dumps(top, ensure_ascii=False),
+                       datetime.now().isoformat())
+                      for hash_texto, area, score, top in registros])
+                conn.commit()
+                return len(registros)
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao salvar cache de categorização: {e}")
+            return 0
+
+    def limpar_cache_categorizacao(self, versao_atual: str) -> int:
+        """Remove entradas do cache calculadas com outras versões das palavras-chave"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.execute("""
+                    DELETE FROM cache_categorizacao WHERE versao_palavras_chave != ?
+                """, (versao_atual,))
+                conn.commit()
+                return cursor.rowcount
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao limpar cache de categorização: {e}")
+            return 0
+
+    def indexar_eventos_pendentes(self, tamanho_lote: int = 1000) -> int:
+        """Inclui no índice invertido os eventos gravados antes de ele existir"""
+        total = 0
+        ultimo_id = 0
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                # Avança por id para não revisitar eventos sem nenhum token
+                while True:
+                    eventos = conn.execute("""
+                        SELECT * FROM eventos e
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM indice_tokens_eventos i
+                            WHERE i.evento_id_externo = e.evento_id_externo
+                        ) AND e.id > ?
+                        ORDER BY e.id
+                        LIMIT ?
+                    """, (ultimo_id, tamanho_lote)).fetchall()
+                    if not eventos:
+                        break
+                    for evento in eventos:
+                        self._indexar_tokens_evento(conn, dict(evento))
+                    conn.commit()
+                    ultimo_id = eventos[-1]['id']
+                    total += len(eventos)
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao indexar eventos: {e}")
+        return total
+
+    def get_ids_eventos_por_tokens(self, tokens: List[str]) -> List[str]:
+        """IDs externos dos eventos categorizados automaticamente que contêm algum dos radicais"""
+        ids = set()
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                for inicio in range(0, len(tokens), 500):
+                    bloco = tokens[inicio:inicio + 500]
+                    cursor = conn.execute(f"""
+                        SELECT DISTINCT i.evento_id_externo
+                        FROM indice_tokens_eventos i
+                        JOIN eventos e ON e.evento_id_externo = i.evento_id_externo
+                        WHERE i.token IN ({','.join('?' * len(bloco))})
+                          AND COALESCE(e.categorizacao_manual, 0) = 0
+                    """, bloco)
+                    ids.update(row[0] for row in cursor.fetchall())
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao consultar índice de tokens: {e}")
+        return sorted(ids)
+
+    def get_ids_eventos_automaticos(self) -> List[str]:
+        """IDs externos de todos os eventos categorizados automaticamente"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.execute("""
+                    SELECT evento_id_externo FROM eventos
+                    WHERE COALESCE(categorizacao_manual, 0) = 0
+                    ORDER BY id
+                """)
+                return [row[0] for row in cursor.fetchall()]
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao buscar eventos: {e}")
+            return []
+
+    def get_eventos_por_ids(self, ids: List[str]) -> List[Dict]:
+        """Retorna os eventos com os IDs externos informados"""
+        eventos = []
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                for inicio in range(0, len(ids), 500):
+                    bloco = ids[inicio:inicio + 500]
+                    cursor = conn.execute(f"""
+                        SELECT * FROM eventos
+                        WHERE evento_id_externo IN ({','.join('?' * len(bloco))})
+                    """, bloco)
+                    eventos.extend(dict(row) for row in cursor.fetchall())
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao buscar eventos: {e}")
+        return eventos
+
+    def atualizar_areas_eventos(self, areas: List[tuple], scores: Dict[str, tuple] = None) -> int:
+        """Grava (evento_id_externo, área) e o top-k de scores em uma transação.
+        
+        Categorizações manuais são preservadas; retorna quantas áreas mudaram.
+        """
+        if not areas and not scores:
+            return 0
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                agora = datetime.now().isoformat()
+                cursor = conn.executemany("""
+                    UPDATE eventos
+                    SET area_tecnica = ?, data_atualizacao = ?
+                    WHERE evento_id_externo = ? AND COALESCE(categorizacao_manual, 0) = 0
+                """, [(area, agora, evento_id) for evento_id, area in areas])
+                alterados = cursor.rowcount
+                for evento_id, scores_areas in (scores or {}).items():
+                    self._salvar_scores_evento(conn, evento_id, scores_areas)
+                conn.commit()
+                return alterados
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao atualizar áreas dos eventos: {e}")
+            return 0
+
+    def get_palavras_chave_aplicadas(self) -> Optional[Dict]:
+        """Versão e palavras-chave por área com que os eventos armazenados foram categorizados"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                row = conn.execute("SELECT versao, areas FROM categorizacao_aplicada WHERE id = 1").fetchone()
+                if row:
+                    return {'versao': row[0], 'areas': json.loads(row[1])}
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao buscar palavras-chave aplicadas: {e}")
+        return None
+
+    def salvar_palavras_chave_aplicadas(self, versao: str, areas: Dict[str, str]) -> bool:
+        """Registra a versão das palavras-chave aplicada aos eventos armazenados"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO categorizacao_aplicada (id, versao, areas, data_atualizacao)
+                    VALUES (1, ?, ?, ?)
+                """, (versao, json.dumps(areas, ensure_ascii=False), datetime.now().isoformat()))
+                conn.commit()
+                return True
+        except Exception as e:
+            self._registrar_falha(e)
+            print(f"Erro ao salvar palavras-chave aplicadas: {e}")
+            return False
@@ -0,0 +1,72 @@
+"""
+Fingerprint normalizado para deduplicação de eventos entre Câmara e Senado
+"""
+
+import hashlib
+from datetime import date, datetime
+from typing import Dict, Optional
+
+from etl.texto import STOPWORDS, tokenizar
+
+# Tokens que identificam a casa e não o evento em si
+TOKENS_CASA = frozenset({
+    'camara', 'deputados', 'senado', 'federal', 'congresso', 'nacional'
+})
+
+FORMATOS_DATA = (
+    "%d/%m/%Y às %H:%M",
+    "%d/%m/%Y %H:%M",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M",
+    "%Y-%m-%d %H:%M:%S",
+    "%d/%m/%Y",
+    "%Y-%m-%d",
+)
+
+
+def parse_data(valor) -> Optional[datetime]:
+    """Converte as representações de data usadas pelas fontes em datetime"""
+    if isinstance(valor, datetime):
+        return valor
+    if isinstance(valor, date):
+        return datetime(valor.year, valor.month, valor.day)
+    if not valor:
+        return None
+
+    texto = str(valor).strip().replace("Z", "")
+    for formato in FORMATOS_DATA:
+        try:
+            return datetime.strptime(texto, formato)
+        except ValueError:
+            continue
+    return None
+
+
+def _bucket_data(valor) -> str:
+    """Data do evento com o período do dia (manhã/tarde/noite) quando houver horário"""
+    dt = parse_data(valor)
+    if not dt:
+        return ""
+    if dt.hour == 0 and dt.minute == 0:
+        return dt.strftime("%Y-%m-%d")
+    periodo = "m" if dt.hour < 12 else ("t" if dt.hour < 18 else "n")
+    return f"{dt.strftime('%Y-%m-%d')}{periodo}"
+
+
+def _tokens_normalizados(texto: str, ignorar=frozenset()) -> str:
+    """Tokens distintos e ordenados, sem stopwords"""
+    tokens = {
+        t for t in tokenizar(texto or "")
+        if t not in STOPWORDS and t not in ignorar
+    }
+    return " ".join(sorted(tokens))
+
+
+def gerar_fingerprint_evento(evento: Dict) -> str:
+    """Gera o fingerprint de deduplicação a partir de data, local e título"""
+    partes = [
+        _bucket_data(evento.get('data_inicio')),
+        _tokens_normalizados(evento.get('local_evento'), TOKENS_CASA),
+        _tokens_normalizados(evento.get('nome'), TOKENS_CASA)
+    ]
+    return hashlib.sha1("|".join(partes).encode('utf-8')).hexdigest()[:20]
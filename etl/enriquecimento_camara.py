@@ -0,0 +1,133 @@
+"""
+Enriquecimento dos eventos da Câmara com o documento de detalhamento (uriDetalhamento)
+"""
+
+import hashlib
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from config import EXTERNAL_APIS
+from etl.database_manager import DatabaseManager
+
+
+class EnriquecedorCamara:
+    """Busca os detalhes dos eventos em paralelo, com cache por URI e ETag"""
+
+    def __init__(self, db_manager: DatabaseManager, max_workers: int = None,
+                 max_conexoes_por_host: int = None):
+        config = EXTERNAL_APIS['camara']
+        self.db_manager = db_manager
+        self.max_workers = max_workers or config['detalhes_workers']
+        self.max_conexoes_por_host = max_conexoes_por_host or config['max_conexoes_por_host']
+        self.timeout = config['timeout']
+        self.user_agent = config['user_agent']
+        self._local = threading.local()
+        self._semaforos = {}
+        self._lock = threading.Lock()
+
+    def enriquecer(self, eventos: List[Dict]) -> List[Dict]:
+        """Preenche comissão e finalidade dos eventos da Câmara a partir do detalhamento"""
+        candidatos = [e for e in eventos if e.get('fonte') == 'camara' and e.get('link_evento')]
+        if not candidatos:
+            return eventos
+
+        cache = self.db_manager.get_cache_detalhes(list({e['link_evento'] for e in candidatos}))
+
+        # Eventos cujo resumo não mudou usam o detalhamento em cache sem ir à rede
+        para_buscar = []
+        for evento in candidatos:
+            hash_resumo = self._hash_resumo(evento)
+            em_cache = cache.get(evento['link_evento'])
+            if em_cache and em_cache['hash_resumo'] == hash_resumo:
+                self._aplicar_detalhes(evento, json.loads(em_cache['conteudo']))
+            else:
+                para_buscar.append((evento, hash_resumo, em_cache))
+
+        if not para_buscar:
+            print(f"Detalhamento Câmara: {len(candidatos)} eventos em cache")
+            return eventos
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            resultados = list(executor.map(self._buscar_detalhe, para_buscar))
+
+        atualizacoes = []
+        nao_modificados = 0
+        for (evento, hash_resumo, em_cache), resultado in zip(para_buscar, resultados):
+            if resultado is None:
+                continue
+            etag, dados, modificado = resultado
+            if not modificado:
+                nao_modificados += 1
+            self._aplicar_detalhes(evento, dados)
+            atualizacoes.append({
+                'uri': evento['link_evento'],
+                'etag': etag,
+                'hash_resumo': hash_resumo,
+                'conteudo': json.dumps(dados, ensure_ascii=False)
+            })
+
+        self.db_manager.salvar_cache_detalhes(atualizacoes)
+        print(f"Detalhamento Câmara: {len(candidatos) - len(para_buscar)} em cache, "
+              f"{len(para_buscar)} consultados ({nao_modificados} não modificados)")
+        return eventos
+
+    def _hash_resumo(self, evento: Dict) -> str:
+        """Hash dos campos do resumo que indicam mudança no evento"""
+        campos = ('nome', 'data_inicio', 'data_fim', 'situacao', 'tipo_evento', 'local_evento')
+        resumo = "|".join(str(evento.get(campo) or '') for campo in campos)
+        return hashlib.sha1(resumo.encode('utf-8')).hexdigest()
+
+    def _sessao(self) -> requests.Session:
+        """Sessão HTTP por thread"""
+        sessao = getattr(self._local, 'sessao', None)
+        if sessao is None:
+            sessao = requests.Session()
+            sessao.headers.update({"User-Agent": self.user_agent})
+            self._local.sessao = sessao
+        return sessao
+
+    def _semaforo(self, uri: str) -> threading.BoundedSemaphore:
+        """Semáforo que limita as conexões simultâneas por host"""
+        host = urlparse(uri).netloc
+        with self._lock:
+            if host not in self._semaforos:
+                self._semaforos[host] = threading.BoundedSemaphore(self.max_conexoes_por_host)
+            return self._semaforos[host]
+
+    def _buscar_detalhe(self, item: Tuple[Dict, str, Optional[Dict]]) -> Optional[Tuple[str, Dict, bool]]:
+        """Busca o detalhamento de um evento; retorna (etag, dados, modificado)"""
+        evento, _, em_cache = item
+        uri = evento['link_evento']
+        headers = {}
+        if em_cache and em_cache.get('etag'):
+            headers['If-None-Match'] = em_cache['etag']
+
+        try:
+            with self._semaforo(uri):
+                response = self._sessao().get(uri, headers=headers, timeout=self.timeout)
+
+            if response.status_code == 304 and em_cache:
+                return em_cache['etag'], json.loads(em_cache['conteudo']), False
+
+            response.raise_for_status()
+            return response.headers.get('ETag'), response.json().get('dados', {}), True
+        except Exception as e:
+            print(f"Erro ao buscar detalhamento {uri}: {e}")
+            return None
+
+    def _aplicar_detalhes(self, evento: Dict, dados: Dict):
+        """Preenche comissão e finalidade com órgãos, descrição e requerimentos do detalhamento"""
+        orgaos = dados.get('orgaos') or []
+        if orgaos and not evento.get('comissao'):
+            evento['comissao'] = orgaos[0].get('nome') or orgaos[0].get('sigla')
+
+        partes = [dados.get('descricao')]
+        partes += [req.get('titulo') for req in dados.get('requerimentos') or []]
+        finalidade = ' '.join(parte for parte in partes if parte)
+        if finalidade and not evento.get('finalidade'):
+            evento['finalidade'] = finalidade
@@ -1,5 +1,6 @@
 import schedule
 import time
+import json
 from datetime import datetime, timedelta
 from typing import List, Dict
 import sys
@@ -9,20 +10,52 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from etl.database_manager import DatabaseManager
+from etl.deduplicacao import parse_data
 from etl.extractor_camara import CamaraEventos
 from etl.extractor_senado import SenadoAPI
+from etl.enriquecimento_camara import EnriquecedorCamara
 from etl.categorizador import CategorizadorEventos
+from etl.recategorizacao import RecategorizadorIncremental
+from etl.categorizacao_proposicoes import CategorizadorProposicoes
+from etl.barramento_eventos import barramento
+from etl.rejeitados import ColetorRejeitados
 
 class ETLAgendaCongresso:
     def __init__(self):
         self.db_manager = DatabaseManager()
         self.camara_extractor = CamaraEventos()
         self.senado_extractor = SenadoAPI()
+        self.enriquecedor_camara = EnriquecedorCamara(self.db_manager)
         self.categorizador = CategorizadorEventos(self.db_manager)
+        self.recategorizador = RecategorizadorIncremental(self.db_manager, self.categorizador)
+        self.categorizador_proposicoes = CategorizadorProposicoes(self.db_manager, self.categorizador)
+        self.rejeitados_situacao = ColetorRejeitados("eventos")
+    
+    def _coletores_rejeitados(self) -> List[ColetorRejeitados]:
+        """Retorna os coletores de dead-letter de todas as etapas"""
+        return [
+            self.camara_extractor.rejeitados,
+            self.senado_extractor.rejeitados,
+            self.rejeitados_situacao
+        ]
+    
+    def _carregar_rejeitados(self):
+        """Carrega fingerprints já rejeitados para ignorá-los nesta execução"""
+        for coletor in self._coletores_rejeitados():
+            coletor.carregar_conhecidos(self.db_manager.get_fingerprints_rejeitados(coletor.fonte))
+    
+    def _persistir_rejeitados(self):
+        """Grava no dead-letter os registros rejeitados durante a execução"""
+        for coletor in self._coletores_rejeitados():
+            pendentes, ignorados = coletor.descarregar()
+            if pendentes or ignorados:
+                self.db_manager.registrar_rejeitados(pendentes, ignorados)
+                print(f"Dead-letter {coletor.fonte}: {len(pendentes)} novos, {len(ignorados)} ignorados")
     
     def executar_etl_completo(self):
         """Executa o processo ETL completo"""
         print(f"Iniciando ETL - {datetime.now()}")
+        self._carregar_rejeitados()
         
         try:
             # Extrair dados da Câmara
@@ -36,8 +69,11 @@ class ETLAgendaCongresso:
             # Combinar eventos
             todos_eventos = eventos_camara + eventos_senado
             
-            # Categorizar eventos
+            # Categorizar eventos (textos já vistos vêm do cache de categorização)
+            self.categorizador.estatisticas_cache(zerar=True)
             eventos_categorizados = self.categorizador.categorizar_lote(todos_eventos)
+            cache = self.categorizador.estatisticas_cache()
+            print(f"Cache de categorização: {cache['acertos']} acertos, {cache['falhas']} falhas")
             
             # Salvar no banco
             eventos_novos, eventos_atualizados = self._salvar_eventos(eventos_categorizados)
@@ -48,10 +84,15 @@ class ETLAgendaCongresso:
                 status="SUCESSO",
                 eventos_novos=eventos_novos,
                 eventos_atualizados=eventos_atualizados,
-                detalhes=f"Processados {len(todos_eventos)} eventos total"
+                detalhes=(f"Processados {len(todos_eventos)} eventos total; cache de categorização: "
+                          f"{cache['acertos']} acertos, {cache['falhas']} falhas")
             )
             
             print(f"ETL concluído - {eventos_novos} novos, {eventos_atualizados} atualizados")
+            self.db_manager.podar_journal_eventos()
+            
+            # Eventos já armazenados acompanham mudanças nas palavras-chave
+            self.recategorizador.executar()
             
         except Exception as e:
             print(f"Erro no ETL: {e}")
@@ -60,19 +101,20 @@ class ETLAgendaCongresso:
                 status="ERRO",
                 detalhes=str(e)
             )
+        finally:
+            self._persistir_rejeitados()
     
     def _extrair_dados_camara(self) -> List[Dict]:
         """Extrai dados da Câmara dos Deputados"""
         eventos = []
         
         try:
-            # Eventos das comissões
-            eventos_comissoes = self.camara_extractor.get_eventos_comissoes()
-            eventos.extend(eventos_comissoes)
+            # Eventos de comissões e plenário no período
+            eventos_periodo = self.camara_extractor.get_eventos_periodo()
+            eventos.extend(eventos_periodo)
             
-            # Sessões do plenário
-            eventos_plenario = self.camara_extractor.get_sessoes_plenario()
-            eventos.extend(eventos_plenario)
+            # Comissão e finalidade vêm do documento de detalhamento
+            self.enriquecedor_camara.enriquecer(eventos)
             
         except Exception as e:
             print(f"Erro ao extrair dados da Câmara: {e}")
@@ -84,8 +126,8 @@ class ETLAgendaCongresso:
         eventos = []
         
         try:
-            # Usar o novo método que captura agenda legislativa
-            eventos_senado = self.senado_extractor.get_agenda_legislativa()
+            # Agenda das comissões do Senado
+            eventos_senado = self.senado_extractor.get_comissoes_agenda()
             eventos.extend(eventos_senado)
             
         except Exception as e:
@@ -100,17 +142,17 @@ class ETLAgendaCongresso:
         
         for evento in eventos:
             try:
-                # Verificar se evento já existe
-                eventos_existentes = self.db_manager.get_eventos_por_area()
-                evento_existe = any(e['evento_id_externo'] == evento['evento_id_externo'] 
-                                  for e in eventos_existentes)
-                
-                if evento_existe:
-                    # Atualizar situação se necessário
-                    self.db_manager.update_evento_situacao(
-                        evento['evento_id_externo'], 
-                        evento['situacao']
-                    )
+                # Verificar se evento já existe (inclusive duplicatas vinculadas a um canônico)
+                if self.db_manager.evento_existe(evento['evento_id_externo']):
+                    if self._detalhes_alterados(evento):
+                        # Comissão/finalidade novas: regrava o evento com a categorização do texto enriquecido
+                        self.db_manager.insert_evento(evento)
+                    else:
+                        # Atualizar situação se necessário
+                        self.db_manager.update_evento_situacao(
+                            evento['evento_id_externo'], 
+                            evento['situacao']
+                        )
                     eventos_atualizados += 1
                 else:
                     # Inserir novo evento
@@ -120,11 +162,27 @@ class ETLAgendaCongresso:
             except Exception as e:
                 print(f"Erro ao salvar evento {evento.get('evento_id_externo')}: {e}")
         
+        # Acorda o stream de eventos deste processo; a API em outro processo
+        # percebe as alterações pelo contador de eventos
+        barramento.sinalizar()
         return eventos_novos, eventos_atualizados
     
+    def _detalhes_alterados(self, evento: Dict) -> bool:
+        """Se o enriquecimento trouxe comissão ou finalidade diferentes das gravadas"""
+        campos = [campo for campo in ('comissao', 'finalidade') if evento.get(campo)]
+        if not campos:
+            return False
+        gravados = self.db_manager.get_eventos_por_ids([evento['evento_id_externo']])
+        if not gravados:
+            return False
+        return any(evento[campo] != gravados[0].get(campo) for campo in campos)
+    
     def atualizar_situacoes(self):
         """Atualiza situações dos eventos existentes"""
         print(f"Atualizando situações - {datetime.now()}")
+        self.rejeitados_situacao.carregar_conhecidos(
+            self.db_manager.get_fingerprints_rejeitados(self.rejeitados_situacao.fonte)
+        )
         
         try:
             # Buscar eventos em andamento
@@ -134,6 +192,8 @@ class ETLAgendaCongresso:
             eventos_atualizados = 0
             
             for evento in eventos_para_atualizar:
+                if self.rejeitados_situacao.deve_ignorar(self._payload_situacao(evento)):
+                    continue
                 nova_situacao = self._verificar_situacao_evento(evento)
                 if nova_situacao != evento['situacao']:
                     self.db_manager.update_evento_situacao(evento['evento_id_externo'], nova_situacao)
@@ -143,6 +203,16 @@ class ETLAgendaCongresso:
             
         except Exception as e:
             print(f"Erro ao atualizar situações: {e}")
+        finally:
+            self._persistir_rejeitados()
+    
+    def _payload_situacao(self, evento: Dict) -> Dict:
+        """Campos do evento relevantes para a verificação de situação"""
+        return {
+            'evento_id_externo': evento.get('evento_id_externo'),
+            'data_inicio': evento.get('data_inicio'),
+            'situacao': evento.get('situacao')
+        }
     
     def _verificar_situacao_evento(self, evento: Dict) -> str:
         """Verifica situação atual de um evento"""
@@ -152,32 +222,30 @@ class ETLAgendaCongresso:
         data_inicio = evento.get('data_inicio', '')
         if data_inicio:
             try:
-                # Tentar parsear data
-                data_parts = data_inicio.split(' ')
-                if len(data_parts) >= 1:
-                    data_str = data_parts[0]
-                    data_evento = datetime.strptime(data_str, "%d/%m/%Y")
-                    
-                    # Se passou da data, marcar como encerrada
-                    if data_evento.date() < datetime.now().date():
-                        return "Encerrada"
-            except:
-                pass
+                # Senado grava dd/mm/yyyy às HH:MM; Câmara, yyyy-mm-dd
+                data_evento = parse_data(data_inicio)
+                if data_evento is None:
+                    raise ValueError(f"data de início em formato desconhecido: {data_inicio!r}")
+                
+                # Se passou da data, marcar como encerrada
+                if data_evento.date() < datetime.now().date():
+                    return "Encerrada"
+            except Exception as e:
+                self.rejeitados_situacao.registrar(
+                    self._payload_situacao(evento), e, etapa="verificar_situacao"
+                )
         
         return evento['situacao']
     
     def executar_uma_vez(self):
         """Executa o ETL uma única vez"""
         eventos_total = []
+        self._carregar_rejeitados()
         
         # Extrair dados reais
-        try:
-            senado = SenadoAPI()
-            eventos_senado = senado.get_agenda_legislativa(dias=7)
-            eventos_total.extend(eventos_senado)
-            print(f"Extraídos {len(eventos_senado)} eventos do Senado")
-        except Exception as e:
-            print(f"Falha ao extrair Senado: {e}")
+        eventos_senado = self._extrair_dados_senado()
+        eventos_total.extend(eventos_senado)
+        print(f"Extraídos {len(eventos_senado)} eventos do Senado")
         
         # Extrair dados da Câmara
         eventos_camara = self._extrair_dados_camara()
@@ -191,16 +259,85 @@ class ETLAgendaCongresso:
             eventos_total = get_sample_eventos()
             print(f"Carregados {len(eventos_total)} eventos de exemplo")
         
+        # Categorizar antes de persistir, para gravar a área técnica
+        self.categorizador.categorizar_lote(eventos_total)
+        
         # Persistir
-        for ev in eventos_total:
-            self.db_manager.insert_evento(ev)
+        gravados = sum(1 for ev in eventos_total if self.db_manager.insert_evento(ev))
+        barramento.sinalizar()
         
-        # Categorizar
-        self.categorizador.categorizar_lote(eventos_total)
+        # Conta como execução com sucesso para o health check e as métricas
+        self.db_manager.log_atualizacao(
+            tipo="ETL_UMA_VEZ",
+            status="SUCESSO",
+            eventos_atualizados=gravados,
+            detalhes=f"{gravados} de {len(eventos_total)} eventos inseridos ou atualizados"
+        )
+        
+        self.recategorizador.executar()
+        self._persistir_rejeitados()
         
         print(f"ETL concluído: {len(eventos_total)} eventos processados")
         return len(eventos_total)
     
+    def reprocessar_rejeitados(self, fonte: str = None):
+        """Reprocessa registros do dead-letter com os parsers atuais"""
+        registros = self.db_manager.get_registros_rejeitados(fonte=fonte, limit=10000)
+        print(f"Reprocessando {len(registros)} registros rejeitados")
+        
+        recuperados = 0
+        for registro in registros:
+            payload = json.loads(registro['payload'])
+            try:
+                self._reprocessar_registro(registro['fonte'], payload)
+            except Exception as e:
+                print(f"Registro {registro['fingerprint'][:12]} ainda inválido: {e}")
+                continue
+            
+            self.db_manager.marcar_rejeitado_reprocessado(registro['fingerprint'])
+            recuperados += 1
+        
+        self.db_manager.log_atualizacao(
+            tipo="REPROCESSAMENTO_REJEITADOS",
+            status="SUCESSO",
+            eventos_atualizados=recuperados,
+            detalhes=f"{recuperados} de {len(registros)} registros rejeitados recuperados"
+        )
+        print(f"Reprocessamento concluído: {recuperados} de {len(registros)} recuperados")
+        return recuperados
+    
+    def _reprocessar_registro(self, fonte: str, payload: Dict):
+        """Reaplica o parser correspondente à fonte; lança exceção se ainda falhar"""
+        if fonte == self.rejeitados_situacao.fonte:
+            nova_situacao = self._verificar_situacao_evento(payload)
+            self._verificar_novas_falhas(self.rejeitados_situacao)
+            if nova_situacao != payload.get('situacao'):
+                self.db_manager.update_evento_situacao(payload['evento_id_externo'], nova_situacao)
+            return
+        
+        extratores = {
+            self.camara_extractor.rejeitados.fonte: self.camara_extractor,
+            self.senado_extractor.rejeitados.fonte: self.senado_extractor
+        }
+        extrator = extratores.get(fonte)
+        if not extrator:
+            raise ValueError(f"Fonte desconhecida: {fonte}")
+        
+        evento = extrator._parse_evento(payload)
+        self._verificar_novas_falhas(extrator.rejeitados)
+        if not evento:
+            raise ValueError("Registro sem dados suficientes para gerar evento")
+        
+        self.categorizador.categorizar_lote([evento])
+        if not self.db_manager.insert_evento(evento):
+            raise ValueError("Falha ao inserir evento reprocessado")
+    
+    def _verificar_novas_falhas(self, coletor: ColetorRejeitados):
+        """Lança exceção se o parser registrou nova rejeição durante o reprocessamento"""
+        pendentes, _ = coletor.descarregar()
+        if pendentes:
+            raise ValueError(pendentes[0]['mensagem_erro'])
+    
     def agendar_execucao(self):
         """Agenda execução automática do ETL"""
         # Executar a cada hora
@@ -225,8 +362,15 @@ def main():
             etl.executar_uma_vez()
         elif sys.argv[1] == "agendar":
             etl.agendar_execucao()
+        elif sys.argv[1] == "reprocessar-rejeitados":
+            fonte = sys.argv[2] if len(sys.argv) > 2 else None
+            etl.reprocessar_rejeitados(fonte)
+        elif sys.argv[1] == "recategorizar":
+            etl.recategorizador.executar(completo="--completo" in sys.argv[2:])
+        elif sys.argv[1] == "categorizar-proposicoes":
+            etl.categorizador_proposicoes.executar(todas="--todas" in sys.argv[2:])
         else:
-            print("Uso: python etl_main.py [uma-vez|agendar]")
+            print("Uso: python etl_main.py [uma-vez|agendar|reprocessar-rejeitados [fonte]|recategorizar [--completo]|categorizar-proposicoes [--todas]]")
     else:
         # Execução padrão: uma vez
         etl.executar_uma_vez()
@@ -2,6 +2,9 @@ import requests
 from datetime import datetime, timedelta
 from typing import List, Dict
 
+from etl.deduplicacao import gerar_fingerprint_evento
+from etl.rejeitados import ColetorRejeitados
+
 
 class CamaraEventos:
 
@@ -11,6 +14,7 @@ class CamaraEventos:
         self.session.headers.update({
             "User-Agent": "ETL-Agenda-Camara/1.0"
         })
+        self.rejeitados = ColetorRejeitados("camara")
 
     def get_eventos_periodo(self, dias_a_frente: int = 30, area_tecnica: str = None) -> List[Dict]:
         """
@@ -28,34 +32,49 @@ class CamaraEventos:
         eventos_filtrados = []
 
         for evt in eventos_raw:
-            try:
-                data_inicio_str = evt.get("dataInicio") or evt.get("data")
-                if not data_inicio_str:
-                    continue
-
-                data_inicio = datetime.fromisoformat(data_inicio_str.replace("Z", "")).date()
-
-                # filtra pela data
-                if not (hoje <= data_inicio <= limite):
-                    continue
-
-                data_fim = evt.get("dataFim")
-
-                eventos_filtrados.append({
-                    "evento_id_externo": f"camara::{evt.get('id', '')}",
-                    "nome": evt.get("titulo") or evt.get("descricao", "Evento da Câmara"),
-                    "data_inicio": data_inicio,
-                    "data_fim": data_fim,
-                    "situacao": evt.get("situacao", ""),
-                    "tema": evt.get("tema", ""),
-                    "tipo_evento": evt.get("eventoTipo", ""),
-                    "local_evento": evt.get("local", ""),
-                    "link_evento": evt.get("uriDetalhamento", ""),
-                    "area_tecnica": area_tecnica,
-                    "fonte": "camara"
-                })
+            # Registros já conhecidos como inválidos não são reprocessados
+            if self.rejeitados.deve_ignorar(evt):
+                continue
 
+            try:
+                evento = self._parse_evento(evt, area_tecnica)
             except Exception as e:
                 print(f"Erro ao processar evento: {e}")
+                self.rejeitados.registrar(evt, e, etapa="extracao")
+                continue
+
+            # filtra pela data
+            if not (hoje <= evento["data_inicio"] <= limite):
+                continue
+
+            eventos_filtrados.append(evento)
 
         return eventos_filtrados
+
+    def _parse_evento(self, evt: Dict, area_tecnica: str = None) -> Dict:
+        """
+        Normaliza evento da Câmara em formato padrão.
+        Lança ValueError para eventos sem data de início (vão para o dead-letter).
+        """
+        data_inicio_str = evt.get("dataInicio") or evt.get("data")
+        if not data_inicio_str:
+            raise ValueError("evento sem data de início")
+
+        inicio = datetime.fromisoformat(data_inicio_str.replace("Z", ""))
+
+        evento = {
+            "evento_id_externo": f"camara::{evt.get('id', '')}",
+            "nome": evt.get("titulo") or evt.get("descricao", "Evento da Câmara"),
+            "data_inicio": inicio.date(),
+            "data_fim": evt.get("dataFim"),
+            "situacao": evt.get("situacao", ""),
+            "tema": evt.get("tema", ""),
+            "tipo_evento": evt.get("eventoTipo", ""),
+            "local_evento": evt.get("local", ""),
+            "link_evento": evt.get("uriDetalhamento", ""),
+            "area_tecnica": area_tecnica,
+            "fonte": "camara"
+        }
+        # data_inicio guarda só o dia; o fingerprint usa o horário, como o do Senado
+        evento["fingerprint"] = gerar_fingerprint_evento(dict(evento, data_inicio=inicio))
+        return evento
@@ -2,6 +2,8 @@ import requests
 from datetime import datetime, timedelta
 from typing import List, Dict
 
+from etl.rejeitados import ColetorRejeitados
+
 
 class SenadoAPI:
     BASE_URL = "https://legis.senado.leg.br/dadosabertos"
@@ -11,6 +13,7 @@ class SenadoAPI:
         self.session.headers.update({
             "User-Agent": "ETL-Agenda-Congresso/1.0"
         })
+        self.rejeitados = ColetorRejeitados("senado")
 
     def get_comissoes_agenda(self, data_inicio: str = None, data_fim: str = None) -> List[Dict]:
         """
@@ -28,11 +31,24 @@ class SenadoAPI:
         dados = resp.json()
         eventos_raw = dados.get("AgendaComissoes", {}).get("Eventos", {}).get("Evento", [])
 
-        return [self._parse_evento(evt) for evt in eventos_raw]
+        eventos = []
+        for evt in eventos_raw:
+            # Registros já conhecidos como inválidos não são reprocessados
+            if self.rejeitados.deve_ignorar(evt):
+                continue
+
+            try:
+                eventos.append(self._parse_evento(evt))
+            except Exception as e:
+                print(f"Erro ao processar evento do Senado: {e}")
+                self.rejeitados.registrar(evt, e, etapa="extracao")
+
+        return eventos
 
     def _parse_evento(self, evt: Dict) -> Dict:
         """
         Normaliza evento de comissão em formato padrão.
+        Lança ValueError para datas inválidas (o evento vai para o dead-letter).
         """
         return {
             "evento_id_externo": f"senado::{evt.get('Codigo')}",
@@ -51,11 +67,12 @@ class SenadoAPI:
     def _formatar_data(self, data_str: str) -> str:
         """
         Converte datas do Senado para padrão dd/mm/yyyy HH:MM.
+        Lança ValueError para datas inválidas.
         """
         if not data_str:
             return ""
         try:
             dt = datetime.fromisoformat(data_str.replace("Z", ""))
-            return dt.strftime("%d/%m/%Y às %H:%M")
-        except Exception:
-            return data_str
+        except (TypeError, ValueError):
+            raise ValueError(f"data inválida: {data_str!r}")
+        return dt.strftime("%d/%m/%Y às %H:%M")
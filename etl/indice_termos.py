@@ -0,0 +1,187 @@
+"""
+Índices de palavras-chave usados pelo categorizador para encontrar termos em um texto
+
+Os dois índices recebem a mesma lista de termos (palavra-chave e palavras
+relacionadas) e retornam, para um texto, o peso de cada termo encontrado:
+1 para correspondência exata, 0.8 para variação e 0.5 para palavra
+relacionada.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+from etl.aho_corasick import AhoCorasick
+from etl.stemmer_rslp import radical
+from etl.texto import remover_acentos
+
+PESO_EXATA = 1
+PESO_VARIACAO = 0.8
+PESO_RELACIONADA = 0.5
+
+# Segmentos do texto combinado analisado pelo autômato
+SEGMENTO_ORIGINAL = 0
+SEGMENTO_SEM_ACENTO = 1
+
+Termo = Tuple[str, Sequence[str]]
+
+# Campos do evento que compõem o texto analisado na categorização
+CAMPOS_ANALISE = ('nome', 'tema', 'tipo_evento', 'local_evento', 'fonte', 'comissao', 'finalidade')
+
+_PADRAO_TOKEN = re.compile(r'\w+')
+
+
+@lru_cache(maxsize=65536)
+def radical_token(token: str) -> str:
+    """Radical de um token minúsculo, após a remoção dos acentos"""
+    if token.isdigit():
+        return token
+    return radical(remover_acentos(token))
+
+
+def radicais_texto(texto: str) -> List[str]:
+    """Radicais dos tokens de um texto, na ordem em que aparecem"""
+    return [radical_token(token) for token in _PADRAO_TOKEN.findall(texto.lower())]
+
+
+def radicais_evento(evento: Dict) -> set:
+    """Radicais distintos dos campos analisados de um evento, para o índice invertido"""
+    return set(radicais_texto(' '.join(evento.get(campo) or '' for campo in CAMPOS_ANALISE)))
+
+
+def _maior_peso(pesos: Dict[int, float], ocorrencias: List[Tuple[int, float]]):
+    """Mantém para cada termo o maior peso encontrado (exata > variação > relacionada)"""
+    for termo, peso in ocorrencias:
+        if peso > pesos.get(termo, 0):
+            pesos[termo] = peso
+
+
+class IndiceTokens:
+    """Casa palavras-chave por tokens inteiros e radicais (RSLP).
+
+    O texto é quebrado em tokens uma única vez; cada palavra-chave é uma
+    sequência de tokens procurada em tabelas hash: pelos tokens originais
+    (exata) e pelos radicais sem acento (variação). Palavras relacionadas
+    também casam pelo radical. O custo é proporcional ao número de tokens e
+    só há correspondência em fronteiras de palavra.
+    """
+
+    def __init__(self, termos: Sequence[Termo]):
+        self._exatas: Dict[str, List[Tuple[int, float]]] = {}
+        self._radicais: Dict[str, List[Tuple[int, float]]] = {}
+        # Primeiro token das palavras-chave compostas, para só montar n-gramas onde podem casar
+        self._inicios_exatas = set()
+        self._inicios_radicais = set()
+        self.max_tokens = 1
+
+        for termo, (palavra, relacionadas) in enumerate(termos):
+            self._indexar(self._exatas, self._inicios_exatas,
+                          _PADRAO_TOKEN.findall(palavra), termo, PESO_EXATA)
+            self._indexar(self._radicais, self._inicios_radicais,
+                          radicais_texto(palavra), termo, PESO_VARIACAO)
+            for palavra_rel in relacionadas:
+                self._indexar(self._radicais, self._inicios_radicais,
+                              radicais_texto(palavra_rel), termo, PESO_RELACIONADA)
+
+    def _indexar(self, indice: Dict, inicios: set, tokens: List[str], termo: int, peso: float):
+        if not tokens:
+            return
+        if len(tokens) > 1:
+            inicios.add(tokens[0])
+            self.max_tokens = max(self.max_tokens, len(tokens))
+        ocorrencias = indice.setdefault(' '.join(tokens), [])
+        if (termo, peso) not in ocorrencias:
+            ocorrencias.append((termo, peso))
+
+    def pesos_termos(self, texto: str) -> Dict[int, float]:
+        """Peso de cada termo encontrado no texto"""
+        tokens = _PADRAO_TOKEN.findall(texto.lower())
+        radicais = [radical_token(token) for token in tokens]
+        exatas = self._exatas
+        por_radical = self._radicais
+        pesos = {}
+
+        for token in tokens:
+            if token in exatas:
+                _maior_peso(pesos, exatas[token])
+        for token in radicais:
+            if token in por_radical:
+                _maior_peso(pesos, por_radical[token])
+
+        # Palavras-chave compostas ("meio ambiente") casam por n-gramas de tokens
+        if self.max_tokens > 1:
+            self._buscar_compostas(tokens, exatas, self._inicios_exatas, pesos)
+            self._buscar_compostas(radicais, por_radical, self._inicios_radicais, pesos)
+
+        return pesos
+
+    def _buscar_compostas(self, tokens: List[str], indice: Dict, inicios: set, pesos: Dict[int, float]):
+        """Procura os n-gramas que começam em um token inicial de palavra-chave composta"""
+        for posicao, token in enumerate(tokens):
+            if token not in inicios:
+                continue
+            for tamanho in range(2, self.max_tokens + 1):
+                chave = ' '.join(tokens[posicao:posicao + tamanho])
+                if chave in indice:
+                    _maior_peso(pesos, indice[chave])
+
+
+class IndiceSubstring:
+    """Casa palavras-chave por substring, como a implementação original.
+
+    Compila em um único autômato de Aho-Corasick a palavra exata (texto
+    original), a palavra sem acentos e seus quatro primeiros caracteres
+    (texto sem acentos) e as palavras relacionadas (texto original).
+    """
+
+    def __init__(self, termos: Sequence[Termo]):
+        padroes = {}
+
+        def _padrao(segmento: int, texto: str) -> int:
+            return padroes.setdefault((segmento, texto), len(padroes))
+
+        regras = []
+        for palavra, relacionadas in termos:
+            palavra_sem_acento = remover_acentos(palavra)
+            variacoes = []
+            if palavra_sem_acento:
+                variacoes.append(_padrao(SEGMENTO_SEM_ACENTO, palavra_sem_acento))
+            prefixo = palavra_sem_acento[:4]
+            if len(prefixo) >= 3:
+                variacoes.append(_padrao(SEGMENTO_SEM_ACENTO, prefixo))
+            regras.append((
+                (_padrao(SEGMENTO_ORIGINAL, palavra),),
+                variacoes,
+                [_padrao(SEGMENTO_ORIGINAL, palavra_rel) for palavra_rel in relacionadas]
+            ))
+
+        self._termos_padrao = [[] for _ in padroes]
+        for termo, (exata, variacoes, relacionadas) in enumerate(regras):
+            for indices, peso in ((exata, PESO_EXATA), (variacoes, PESO_VARIACAO),
+                                  (relacionadas, PESO_RELACIONADA)):
+                for indice in indices:
+                    self._termos_padrao[indice].append((termo, peso))
+        self._segmento_padrao = [segmento for segmento, _ in padroes]
+        self._automato = AhoCorasick(texto for _, texto in padroes)
+
+    def pesos_termos(self, texto: str) -> Dict[int, float]:
+        """Peso de cada termo encontrado no texto"""
+        limite = len(texto)
+        segmento_padrao = self._segmento_padrao
+        encontrados = set()
+
+        # Texto original e sem acentos separados por um caractere que não ocorre nos padrões
+        for fim, indice in self._automato.buscar(texto + '\0' + remover_acentos(texto)):
+            if (fim < limite) == (segmento_padrao[indice] == SEGMENTO_ORIGINAL):
+                encontrados.add(indice)
+
+        pesos = {}
+        for indice in encontrados:
+            _maior_peso(pesos, self._termos_padrao[indice])
+        return pesos
+
+
+INDICES = {
+    'tokens': IndiceTokens,
+    'substring': IndiceSubstring,
+}
@@ -0,0 +1,137 @@
+"""
+Modelo compilado de palavras-chave das áreas técnicas, versionado e recarregável
+
+O modelo é imutável depois de construído: índice de termos, regras por área
+e motor vetorizado. Quando as palavras-chave mudam no banco, um novo modelo é
+compilado e substitui o anterior de forma atômica; quem já tem uma referência
+ao modelo antigo continua usando-o até terminar o lote.
+"""
+
+import hashlib
+import json
+import threading
+from typing import Dict, List, Tuple
+
+from etl.categorizacao_lote import MotorCategorizacaoLote
+from etl.database_manager import DatabaseManager
+from etl.indice_termos import INDICES
+
+PALAVRAS_RELACIONADAS = {
+    'educação': ['escola', 'universidade', 'ensino', 'aluno', 'professor'],
+    'saúde': ['hospital', 'medicamento', 'vacina', 'doença', 'tratamento'],
+    'meio ambiente': ['sustentabilidade', 'poluição', 'natureza', 'ecologia'],
+    'economia': ['finanças', 'orçamento', 'imposto', 'dinheiro', 'mercado'],
+    'segurança': ['polícia', 'crime', 'violência', 'proteção'],
+    'infraestrutura': ['obra', 'construção', 'transporte', 'estrada'],
+    'cultura': ['arte', 'teatro', 'museu', 'patrimônio'],
+    'esporte': ['atividade física', 'competição', 'treino'],
+    'tecnologia': ['digital', 'inovação', 'software', 'internet']
+}
+
+
+class ModeloPalavrasChave:
+    """Palavras-chave compiladas de uma versão das áreas técnicas"""
+
+    def __init__(self, areas_tecnicas: List[Dict], tipo_indice: str, score_minimo: float,
+                 versao_banco: int = 0, top_k: int = 0):
+        self.areas_tecnicas = tuple(dict(area) for area in areas_tecnicas)
+        self.tipo_indice = tipo_indice
+        self.score_minimo = score_minimo
+        self.top_k = top_k
+        self.versao_banco = versao_banco
+
+        termos = {}
+        regras_areas = []
+        for area in self.areas_tecnicas:
+            palavras_chave = (area.get('palavras_chave') or '').split(',')
+            termos_area = []
+            for palavra in palavras_chave:
+                palavra = palavra.strip().lower()
+                if not palavra:
+                    continue
+                termos_area.append(termos.setdefault(palavra, len(termos)))
+
+            regras_areas.append((area['nome'], len(palavras_chave), tuple(termos_area)))
+
+        self.regras_areas: Tuple[Tuple[str, int, Tuple[int, ...]], ...] = tuple(regras_areas)
+        self.termos: Tuple[str, ...] = tuple(termos)
+        self.indice = INDICES[tipo_indice](
+            [(palavra, PALAVRAS_RELACIONADAS.get(palavra, [])) for palavra in self.termos]
+        )
+        self.versao = self._calcular_versao()
+        self.motor_lote = MotorCategorizacaoLote(self)
+
+    def _calcular_versao(self) -> str:
+        """Hash das palavras-chave das áreas e dos parâmetros que afetam o resultado"""
+        conteudo = json.dumps({
+            'indice': self.tipo_indice,
+            'score_minimo': self.score_minimo,
+            'top_k': self.top_k,
+            'areas': sorted((area['nome'], area.get('palavras_chave') or '') for area in self.areas_tecnicas)
+        }, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha1(conteudo.encode('utf-8')).hexdigest()[:16]
+
+    def pesos_termos(self, texto: str) -> Dict[int, float]:
+        """Peso de cada termo encontrado no texto (exata 1, variação 0.8, relacionada 0.5)"""
+        return self.indice.pesos_termos(texto)
+
+    def calcular_scores_areas(self, texto: str) -> List[Tuple[str, float]]:
+        """Score de todas as áreas em uma consulta ao índice"""
+        pesos = self.indice.pesos_termos(texto)
+
+        scores = []
+        for nome, total_palavras, termos_area in self.regras_areas:
+            score = 0
+            for termo in termos_area:
+                if termo in pesos:
+                    score += pesos[termo]
+            scores.append((nome, score / total_palavras))
+
+        return scores
+
+    def explicar(self, texto: str, top_k: int = 3) -> List[Dict]:
+        """Áreas de maior score no texto, com os termos encontrados e seus pesos"""
+        pesos = self.indice.pesos_termos(texto)
+
+        areas = []
+        for nome, total_palavras, termos_area in self.regras_areas:
+            encontrados = [(self.termos[termo], pesos[termo]) for termo in termos_area if termo in pesos]
+            if encontrados:
+                score = sum(peso for _, peso in encontrados) / total_palavras
+                areas.append((score, nome, encontrados))
+
+        # Ordenação estável: empates ficam na ordem das áreas, como em categorizar_evento
+        areas.sort(key=lambda item: -item[0])
+        return [
+            {'area': nome, 'score': round(score, 4),
+             'termos': [{'termo': termo, 'peso': peso} for termo, peso in encontrados]}
+            for score, nome, encontrados in areas[:top_k]
+        ]
+
+
+_modelos: Dict[Tuple[str, str, float, int], ModeloPalavrasChave] = {}
+_lock = threading.Lock()
+
+
+def obter_modelo(db_manager: DatabaseManager, tipo_indice: str, score_minimo: float,
+                 top_k: int = 0) -> ModeloPalavrasChave:
+    """Retorna o modelo vigente do banco, recompilando-o se as palavras-chave mudaram.
+
+    Os modelos são compartilhados por todos os categorizadores do processo
+    (ETL e API) que usam o mesmo banco e parâmetros. O custo no caso comum é
+    um PRAGMA data_version em conexão já aberta (get_versao_tabela), cerca de 5 µs.
+    """
+    chave = (db_manager.db_path, tipo_indice, score_minimo, top_k)
+    versao_banco = db_manager.get_versao_tabela('areas_tecnicas')
+
+    modelo = _modelos.get(chave)
+    if modelo is not None and modelo.versao_banco == versao_banco:
+        return modelo
+
+    with _lock:
+        modelo = _modelos.get(chave)
+        if modelo is None or modelo.versao_banco != versao_banco:
+            modelo = ModeloPalavrasChave(db_manager.get_areas_tecnicas(), tipo_indice,
+                                         score_minimo, versao_banco, top_k)
+            _modelos[chave] = modelo
+        return modelo
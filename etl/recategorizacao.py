@@ -0,0 +1,97 @@
+"""
+Recategorização incremental dos eventos armazenados quando as palavras-chave mudam
+"""
+
+from typing import Dict, List
+
+from etl.categorizador import CategorizadorEventos
+from etl.database_manager import DatabaseManager
+from etl.indice_termos import radicais_texto
+from etl.modelo_palavras_chave import PALAVRAS_RELACIONADAS
+
+
+class RecategorizadorIncremental:
+    """Reaplica a categorização só aos eventos afetados pela mudança de palavras-chave.
+
+    Compara as palavras-chave com que os eventos foram categorizados com as
+    atuais. Como o score de uma área é normalizado pelo número de
+    palavras-chave dela, qualquer alteração em uma área afeta os eventos que
+    contêm algum termo dessa área (antigo ou novo); esses eventos são
+    localizados pelo índice invertido de radicais e recalculados em lotes.
+    Eventos categorizados manualmente não são alterados.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, categorizador: CategorizadorEventos,
+                 tamanho_lote: int = 500):
+        self.db_manager = db_manager
+        self.categorizador = categorizador
+        self.tamanho_lote = tamanho_lote
+
+    def executar(self, completo: bool = False) -> Dict:
+        """Recategoriza os eventos afetados; com completo=True, todos os automáticos"""
+        modelo = self.categorizador.recarregar_modelo()
+        aplicada = self.db_manager.get_palavras_chave_aplicadas()
+        atuais = {area['nome']: area.get('palavras_chave') or '' for area in modelo.areas_tecnicas}
+
+        if aplicada and aplicada['versao'] == modelo.versao and not completo:
+            return {'versao': modelo.versao, 'candidatos': 0, 'alterados': 0}
+
+        self.db_manager.indexar_eventos_pendentes()
+
+        # Sem histórico, com outro índice ou outros parâmetros de score, não há diff por termos
+        if completo or not aplicada or modelo.tipo_indice != 'tokens' or aplicada['areas'] == atuais:
+            ids = self.db_manager.get_ids_eventos_automaticos()
+            print(f"Recategorização completa: {len(ids)} eventos")
+        else:
+            radicais = self._radicais_afetados(aplicada['areas'], atuais)
+            ids = self.db_manager.get_ids_eventos_por_tokens(radicais)
+            print(f"Recategorização incremental: {len(ids)} eventos com {len(radicais)} radicais afetados")
+
+        alterados = 0
+        for inicio in range(0, len(ids), self.tamanho_lote):
+            eventos = self.db_manager.get_eventos_por_ids(ids[inicio:inicio + self.tamanho_lote])
+            resultados = self.categorizador.categorizar_com_scores(eventos, modelo)
+            mudancas = [
+                (evento['evento_id_externo'], area)
+                for evento, (area, _, _) in zip(eventos, resultados)
+                if area != evento.get('area_tecnica')
+            ]
+            scores = {evento['evento_id_externo']: top for evento, (_, _, top) in zip(eventos, resultados)}
+            alterados += self.db_manager.atualizar_areas_eventos(mudancas, scores)
+
+            processados = min(inicio + self.tamanho_lote, len(ids))
+            print(f"Recategorização: {processados}/{len(ids)} eventos "
+                  f"({processados * 100 // len(ids)}%), {alterados} alterados")
+
+        self.db_manager.salvar_palavras_chave_aplicadas(modelo.versao, atuais)
+        # Scores top-k podem mudar sem mudar a área (os triggers de eventos não os veem)
+        if ids:
+            self.db_manager.marcar_alteracao('eventos')
+        self.db_manager.log_atualizacao(
+            tipo="RECATEGORIZACAO",
+            status="SUCESSO",
+            eventos_atualizados=alterados,
+            detalhes=f"Modelo {modelo.versao}: {len(ids)} eventos reavaliados, {alterados} alterados"
+        )
+        return {'versao': modelo.versao, 'candidatos': len(ids), 'alterados': alterados}
+
+    def _radicais_afetados(self, antigas: Dict[str, str], novas: Dict[str, str]) -> List[str]:
+        """Primeiro radical de cada termo (e palavra relacionada) das áreas alteradas.
+
+        Todo evento em que um termo casa contém o radical do primeiro token
+        do termo, então essa lista basta para encontrar os candidatos.
+        """
+        radicais = set()
+        for nome in set(antigas) | set(novas):
+            if antigas.get(nome) == novas.get(nome):
+                continue
+            palavras = f"{antigas.get(nome) or ''},{novas.get(nome) or ''}".split(',')
+            for palavra in palavras:
+                palavra = palavra.strip().lower()
+                if not palavra:
+                    continue
+                for texto in [palavra] + PALAVRAS_RELACIONADAS.get(palavra, []):
+                    tokens = radicais_texto(texto)
+                    if tokens:
+                        radicais.add(tokens[0])
+        return sorted(radicais)
@@ -0,0 +1,61 @@
+"""
+Dead-letter de registros brutos rejeitados pelas extrações
+"""
+
+import hashlib
+import json
+from typing import Dict, Iterable, List, Set
+
+
+def fingerprint_registro(fonte: str, payload) -> str:
+    """Gera um fingerprint estável para o payload bruto de uma fonte"""
+    conteudo = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(f"{fonte}|{conteudo}".encode('utf-8')).hexdigest()
+
+
+class ColetorRejeitados:
+    """Acumula registros rejeitados de uma fonte durante uma extração"""
+
+    def __init__(self, fonte: str):
+        self.fonte = fonte
+        self.fingerprints_conhecidos: Set[str] = set()
+        self.pendentes: List[Dict] = []
+        self.ignorados: List[str] = []
+
+    def carregar_conhecidos(self, fingerprints: Iterable[str]):
+        """Define os fingerprints já registrados como rejeitados"""
+        self.fingerprints_conhecidos = set(fingerprints)
+
+    def deve_ignorar(self, payload) -> bool:
+        """Indica se o payload já é conhecido como rejeitado"""
+        if not self.fingerprints_conhecidos:
+            return False
+
+        fingerprint = fingerprint_registro(self.fonte, payload)
+        if fingerprint in self.fingerprints_conhecidos:
+            self.ignorados.append(fingerprint)
+            return True
+        return False
+
+    def registrar(self, payload, erro: Exception, etapa: str):
+        """Registra um payload que falhou no parsing"""
+        fingerprint = fingerprint_registro(self.fonte, payload)
+        if any(p['fingerprint'] == fingerprint for p in self.pendentes):
+            return
+
+        self.fingerprints_conhecidos.add(fingerprint)
+        self.pendentes.append({
+            'fingerprint': fingerprint,
+            'fonte': self.fonte,
+            'etapa': etapa,
+            'tipo_erro': type(erro).__name__,
+            'mensagem_erro': str(erro),
+            'payload': json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        })
+
+    def descarregar(self) -> tuple:
+        """Retorna (pendentes, ignorados) e limpa o estado acumulado"""
+        pendentes, ignorados = self.pendentes, self.ignorados
+        self.pendentes = []
+        self.ignorados = []
+        return pendentes, ignorados
@@ -0,0 +1,211 @@
+"""
+Stemmer para português no estilo RSLP (Removedor de Sufixos da Língua Portuguesa)
+
+Implementa as etapas do algoritmo de Orengo & Huyck (plural, feminino,
+advérbio, aumentativo/diminutivo, sufixos nominais, sufixos verbais e
+vogal temática) sobre tokens já sem acentos. Cada regra é
+(sufixo, tamanho mínimo do radical, substituição, exceções).
+"""
+
+from functools import lru_cache
+from typing import Sequence, Tuple
+
+Regra = Tuple[str, int, str, frozenset]
+
+
+def _regras(*regras) -> Tuple[Regra, ...]:
+    """Normaliza as regras e as ordena do sufixo mais longo para o mais curto"""
+    normalizadas = [
+        (sufixo, minimo, substituicao, frozenset(excecoes[0]) if excecoes else frozenset())
+        for sufixo, minimo, substituicao, *excecoes in regras
+    ]
+    return tuple(sorted(normalizadas, key=lambda regra: len(regra[0]), reverse=True))
+
+
+REGRAS_PLURAL = _regras(
+    ("ns", 1, "m"),
+    ("oes", 3, "ao"),
+    ("aes", 1, "ao", ["maes"]),
+    ("ais", 1, "al", ["cais", "mais"]),
+    ("eis", 2, "el"),
+    ("ois", 2, "ol"),
+    ("is", 2, "il", ["lapis", "cais", "mais", "crucis", "biquinis", "pois", "depois", "dois", "leis"]),
+    ("les", 3, "l"),
+    ("res", 3, "r", ["arvores"]),
+    ("s", 2, "", ["alias", "pires", "lapis", "cais", "mais", "mas", "menos", "ferias", "fezes",
+                  "pesames", "crucis", "gas", "atras", "moises", "atraves", "conves", "es",
+                  "pais", "apos", "ambas", "ambos", "messias", "onibus", "virus", "bonus"]),
+)
+
+REGRAS_FEMININO = _regras(
+    ("ona", 3, "ao", ["abandona", "lona", "iona", "cortisona", "monotona", "maratona", "acetona",
+                      "detona", "carona"]),
+    ("ora", 3, "or"),
+    ("na", 4, "no", ["carona", "abandona", "lona", "iona", "cortisona", "monotona", "maratona",
+                     "acetona", "detona", "guiana", "campana", "grana", "caravana", "banana",
+                     "paisana"]),
+    ("inha", 3, "inho", ["rainha", "linha", "minha"]),
+    ("esa", 3, "es", ["mesa", "obesa", "princesa", "turquesa", "ilesa", "pesa", "presa", "despesa"]),
+    ("osa", 3, "oso", ["mucosa", "prosa"]),
+    ("iaca", 3, "iaco"),
+    ("ica", 3, "ico", ["dica"]),
+    ("ada", 2, "ado", ["pitada"]),
+    ("ida", 3, "ido", ["vida", "duvida"]),
+    ("ima", 3, "imo", ["vitima"]),
+    ("iva", 3, "ivo", ["saliva", "oliva"]),
+    ("eira", 3, "eiro", ["beira", "cadeira", "frigideira", "bandeira", "feira", "capoeira",
+                         "barreira", "fronteira", "besteira", "poeira"]),
+)
+
+REGRAS_ADVERBIO = _regras(
+    ("mente", 4, "", ["experimente"]),
+)
+
+REGRAS_AUMENTATIVO = _regras(
+    ("dissimo", 5, ""),
+    ("abilissimo", 5, ""),
+    ("issimo", 3, ""),
+    ("esimo", 3, ""),
+    ("errimo", 4, ""),
+    ("zinho", 2, ""),
+    ("quinho", 4, "c"),
+    ("uinho", 4, ""),
+    ("adinho", 3, ""),
+    ("inho", 3, "", ["caminho", "cominho"]),
+    ("alhao", 4, ""),
+    ("uca", 4, ""),
+    ("aco", 4, "", ["antebraco"]),
+    ("adao", 4, ""),
+    ("idao", 4, ""),
+    ("azio", 3, "", ["topazio"]),
+    ("arraz", 4, ""),
+    ("zarrao", 3, ""),
+    ("arrao", 4, ""),
+    ("zao", 2, "", ["coalizao"]),
+)
+
+REGRAS_NOMINAIS = _regras(
+    ("encialista", 4, ""),
+    ("amentario", 3, ""),
+    ("amentaria", 3, ""),
+    ("enciario", 3, ""),
+    ("enciaria", 3, ""),
+    ("acional", 3, ""),
+    ("istico", 3, ""),
+    ("adoria", 3, ""),
+    ("alista", 5, ""),
+    ("agem", 3, "", ["coragem", "chantagem", "vantagem", "carruagem"]),
+    ("iamento", 4, ""),
+    ("amento", 3, "", ["firmamento", "fundamento", "departamento"]),
+    ("imento", 3, ""),
+    ("mento", 6, "", ["firmamento", "elemento", "complemento", "instrumento", "departamento"]),
+    ("alizado", 4, ""),
+    ("atizado", 4, ""),
+    ("tizado", 4, "", ["alfabetizado"]),
+    ("izado", 5, "", ["organizado", "pulverizado"]),
+    ("ativo", 4, "", ["pejorativo", "relativo"]),
+    ("tivo", 4, "", ["relativo"]),
+    ("ivo", 4, "", ["passivo", "possessivo", "pejorativo", "positivo"]),
+    ("ado", 2, "", ["grado"]),
+    ("ido", 3, "", ["candido", "consolido", "rapido", "decido", "timido", "duvido", "marido"]),
+    ("ador", 3, ""),
+    ("edor", 3, ""),
+    ("idor", 4, "", ["ouvidor"]),
+    ("dor", 4, "", ["ouvidor"]),
+    ("sor", 4, "", ["assessor"]),
+    ("atoria", 5, ""),
+    ("tor", 3, "", ["benfeitor", "leitor", "editor", "pastor", "produtor", "promotor", "consultor"]),
+    ("ior", 2, "", ["superior", "inferior", "interior", "exterior", "anterior", "posterior"]),
+    ("ancia", 4, ""),
+    ("encia", 3, ""),
+    ("aria", 4, ""),
+    ("ario", 3, "", ["voluntario", "salario", "aniversario", "diario", "lionario", "armario"]),
+    ("anca", 4, ""),
+    ("enca", 4, ""),
+    ("eza", 3, ""),
+    ("ista", 4, ""),
+    ("ismo", 3, ""),
+    ("idade", 4, ""),
+    ("icao", 3, ""),
+    ("acao", 3, ""),
+    ("ucao", 3, ""),
+    ("cao", 3, ""),
+    ("avel", 2, "", ["movel"]),
+    ("ivel", 3, ""),
+    ("ico", 4, ""),
+    ("ica", 4, ""),
+    ("ical", 3, ""),
+    ("al", 4, ""),
+    ("ente", 4, ""),
+    ("oso", 3, ""),
+    ("ento", 3, ""),
+)
+
+REGRAS_VERBAIS = _regras(
+    ("ariamos", 2, ""), ("eriamos", 2, ""), ("iriamos", 3, ""),
+    ("assemos", 2, ""), ("essemos", 2, ""), ("issemos", 3, ""),
+    ("aremos", 2, ""), ("eremos", 2, ""), ("iremos", 3, ""),
+    ("avamos", 2, ""), ("aramos", 2, ""), ("eramos", 2, ""), ("iramos", 3, ""),
+    ("arieis", 2, ""), ("erieis", 2, ""), ("irieis", 3, ""),
+    ("armos", 2, ""), ("ermos", 2, ""), ("irmos", 3, ""),
+    ("ariam", 2, ""), ("eriam", 2, ""), ("iriam", 3, ""),
+    ("assem", 2, ""), ("essem", 2, ""), ("issem", 3, ""),
+    ("arao", 2, ""), ("erao", 2, ""), ("irao", 3, ""),
+    ("avam", 2, ""), ("aram", 2, ""), ("eram", 2, ""), ("iram", 3, ""),
+    ("ando", 2, ""), ("endo", 3, ""), ("indo", 3, ""), ("ondo", 3, ""),
+    ("asse", 2, ""), ("esse", 2, ""), ("isse", 3, ""),
+    ("aria", 2, ""), ("eria", 2, ""), ("iria", 3, ""),
+    ("ava", 2, ""), ("ara", 2, ""), ("era", 2, ""), ("ira", 3, ""),
+    ("ado", 2, ""), ("ido", 3, ""),
+    ("ar", 2, ""), ("er", 2, ""), ("ir", 3, ""),
+    ("am", 2, ""), ("em", 2, ""),
+    ("ei", 3, ""), ("ou", 3, ""), ("eu", 3, ""), ("iu", 3, ""),
+)
+
+REGRAS_VOGAL = _regras(
+    ("a", 3, ""),
+    ("e", 3, ""),
+    ("o", 3, ""),
+)
+
+
+_SUFIXOS = {}
+
+
+def _aplicar(palavra: str, regras: Sequence[Regra]) -> Tuple[str, bool]:
+    """Aplica a primeira regra cujo sufixo casa com a palavra"""
+    sufixos = _SUFIXOS.get(id(regras))
+    if sufixos is None:
+        sufixos = _SUFIXOS[id(regras)] = tuple(regra[0] for regra in regras)
+    # Teste único com todos os sufixos antes de percorrer as regras
+    if not palavra.endswith(sufixos):
+        return palavra, False
+
+    for sufixo, minimo, substituicao, excecoes in regras:
+        if palavra.endswith(sufixo):
+            if palavra in excecoes or len(palavra) - len(sufixo) < minimo:
+                return palavra, False
+            return palavra[:-len(sufixo)] + substituicao, True
+    return palavra, False
+
+
+@lru_cache(maxsize=65536)
+def radical(palavra: str) -> str:
+    """Retorna o radical de um token minúsculo e sem acentos"""
+    if len(palavra) < 3:
+        return palavra
+
+    if palavra.endswith("s"):
+        palavra, _ = _aplicar(palavra, REGRAS_PLURAL)
+    if palavra.endswith("a"):
+        palavra, _ = _aplicar(palavra, REGRAS_FEMININO)
+    palavra, _ = _aplicar(palavra, REGRAS_ADVERBIO)
+    palavra, _ = _aplicar(palavra, REGRAS_AUMENTATIVO)
+
+    palavra, removeu = _aplicar(palavra, REGRAS_NOMINAIS)
+    if not removeu:
+        palavra, removeu = _aplicar(palavra, REGRAS_VERBAIS)
+    if not removeu:
+        palavra, _ = _aplicar(palavra, REGRAS_VOGAL)
+
+    return palavra
@@ -0,0 +1,42 @@
+"""
+Funções de normalização de texto compartilhadas pelo ETL
+"""
+
+import re
+import unicodedata
+from typing import List
+
+_RE_TOKEN = re.compile(r"\w+")
+
+STOPWORDS = frozenset({
+    'a', 'à', 'ao', 'aos', 'as', 'às', 'com', 'da', 'das', 'de', 'do', 'dos',
+    'e', 'em', 'na', 'nas', 'no', 'nos', 'o', 'os', 'para', 'pela', 'pelo',
+    'por', 'sobre', 'um', 'uma'
+})
+
+
+class _TabelaSemAcento(dict):
+    """Tabela de str.translate que decompõe cada caractere na primeira vez em que aparece"""
+
+    def __missing__(self, codigo: int) -> str:
+        caractere = ''.join(
+            c for c in unicodedata.normalize('NFD', chr(codigo))
+            if not unicodedata.combining(c)
+        )
+        self[codigo] = caractere
+        return caractere
+
+
+_TABELA_SEM_ACENTO = _TabelaSemAcento()
+
+
+def remover_acentos(texto: str) -> str:
+    """Remove acentos do texto"""
+    if texto.isascii():
+        return texto
+    return texto.translate(_TABELA_SEM_ACENTO)
+
+
+def tokenizar(texto: str) -> List[str]:
+    """Quebra o texto em tokens minúsculos sem acentos"""
+    return _RE_TOKEN.findall(remover_acentos(texto.lower()))
@@ -8,6 +8,8 @@ import sys
 import time
 import os
 
+from config import API_CONFIG
+
 def main():
     print("🚀 Iniciando sistema completo...")
     
@@ -29,14 +31,14 @@ def main():
     print("🚀 Iniciando API...")
     try:
         api_process = subprocess.Popen([
-            sys.executable, "api/app.py"
-        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            sys.executable, "api/servidor.py"
+        ])
         
         # Aguardar API inicializar
         time.sleep(3)
         
         if api_process.poll() is None:
-            print("✅ API iniciada com sucesso (porta 5000)")
+            print(f"✅ API iniciada com sucesso (porta {API_CONFIG['port']})")
         else:
             print("❌ Erro ao iniciar API")
             return
@@ -72,8 +74,8 @@ def main():
         print(f"❌ Erro ao abrir dashboard: {e}")
     
     print("\n✅ Sistema iniciado com sucesso!")
-    print("📊 Dashboard: http://localhost:5000")
-    print("🔌 API: http://localhost:5000/api")
+    print(f"📊 Dashboard: http://localhost:{API_CONFIG['port']}")
+    print(f"🔌 API: http://localhost:{API_CONFIG['port']}/api")
     print("\n⏹️  Pressione Ctrl+C para parar...")
     
     try:
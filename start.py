@@ -11,6 +11,8 @@ import time
 import threading
 from pathlib import Path
 
+from config import API_CONFIG
+
 def print_banner():
     """Exibe banner do sistema"""
     print("""
@@ -62,14 +64,14 @@ def start_api():
     try:
         # Iniciar API em thread separada
         api_process = subprocess.Popen([
-            sys.executable, "api/app.py"
-        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            sys.executable, "api/servidor.py"
+        ])
         
         # Aguardar um pouco para a API inicializar
         time.sleep(3)
         
         if api_process.poll() is None:
-            print("✅ API iniciada com sucesso (porta 5000)")
+            print(f"✅ API iniciada com sucesso (porta {API_CONFIG['port']})")
             return api_process
         else:
             print("❌ Erro ao iniciar API")
@@ -149,8 +151,8 @@ def main():
         open_dashboard()
         
         print("\n✅ Sistema iniciado com sucesso!")
-        print("📊 Dashboard: http://localhost:5000")
-        print("🔌 API: http://localhost:5000/api")
+        print(f"📊 Dashboard: http://localhost:{API_CONFIG['port']}")
+        print(f"🔌 API: http://localhost:{API_CONFIG['port']}/api")
         print("\n⏹️  Pressione Ctrl+C para parar...")
         
         try:
@@ -170,7 +172,7 @@ def main():
         api_process = start_api()
         if api_process:
             print("\n✅ API iniciada!")
-            print("🔌 Endpoint: http://localhost:5000/api")
+            print(f"🔌 Endpoint: http://localhost:{API_CONFIG['port']}/api")
             print("\n⏹️  Pressione Ctrl+C para parar...")
             
             try:
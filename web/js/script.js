@@ -4,6 +4,8 @@ let currentArea = null;
 let allEvents = [];
 let filteredEvents = [];
 let updateInterval = null;
+let eventStream = null;
+let streamRefreshTimeout = null;
 let currentDateFilter = {
     startDate: null,
     endDate: null
@@ -212,31 +214,16 @@ async function selectArea(areaName) {
     }
 }
 
-// Carregar dados da área
+// Carregar dados da área (eventos, estatísticas, proposições e contadores em uma requisição)
 async function loadAreaData(areaName) {
     try {
-        // Carregar eventos
-        const eventsResponse = await fetch(`${API_BASE_URL}/eventos?area=${encodeURIComponent(areaName)}`);
-        if (!eventsResponse.ok) {
-            throw new Error(`HTTP error! status: ${eventsResponse.status}`);
-        }
-        const events = await eventsResponse.json();
-        
-        // Carregar estatísticas
-        const statsResponse = await fetch(`${API_BASE_URL}/estatisticas?area=${encodeURIComponent(areaName)}`);
-        if (!statsResponse.ok) {
-            throw new Error(`HTTP error! status: ${statsResponse.status}`);
-        }
-        const stats = await statsResponse.json();
-        
-        // Carregar proposições
-        const proposicoesResponse = await fetch(`${API_BASE_URL}/proposicoes?area=${encodeURIComponent(areaName)}`);
-        if (!proposicoesResponse.ok) {
-            throw new Error(`HTTP error! status: ${proposicoesResponse.status}`);
+        const response = await fetch(`${API_BASE_URL}/areas/${encodeURIComponent(areaName)}/dashboard`);
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
         }
-        const proposicoes = await proposicoesResponse.json();
+        const dashboard = await response.json();
         
-        updateDashboard(areaName, events, stats, proposicoes);
+        updateDashboard(areaName, dashboard.eventos, dashboard.estatisticas, dashboard.proposicoes, dashboard.contadores);
         
     } catch (error) {
         console.error('Erro ao carregar dados da área:', error);
@@ -245,17 +232,17 @@ async function loadAreaData(areaName) {
 }
 
 // Atualizar dashboard
-function updateDashboard(areaName, events, stats, proposicoes) {
+function updateDashboard(areaName, events, stats, proposicoes, counters) {
     // Atualizar título
     const titleElement = document.getElementById('currentAreaTitle');
     if (titleElement) {
         titleElement.textContent = areaName;
     }
     
-    // Atualizar estatísticas de eventos
-    const totalEvents = events.length;
-    const ongoingEvents = events.filter(e => e.situacao === 'Em Andamento').length;
-    const completedEvents = events.filter(e => e.situacao === 'Encerrada').length;
+    // Atualizar estatísticas de eventos (contadores do servidor incluem eventos além do limite da lista)
+    const totalEvents = counters ? counters.eventos : events.length;
+    const ongoingEvents = counters ? counters.em_andamento : events.filter(e => e.situacao === 'Em Andamento').length;
+    const completedEvents = counters ? counters.encerrados : events.filter(e => e.situacao === 'Encerrada').length;
     
     const totalElement = document.getElementById('totalEvents');
     const ongoingElement = document.getElementById('ongoingEvents');
@@ -553,8 +540,12 @@ async function showUncategorizedEvents() {
             
             events.forEach(event => {
                 const eventCard = createEventCard(event);
+                eventCard.dataset.eventoId = event.evento_id_externo;
                 eventsGrid.appendChild(eventCard);
             });
+            
+            // Sugestões carregadas em segundo plano, sem atrasar a listagem
+            loadCategorizationSuggestions(events, eventsGrid);
         }
         
         const areaSelection = document.querySelector('.area-selection');
@@ -573,6 +564,86 @@ async function showUncategorizedEvents() {
     }
 }
 
+// Sugerir áreas para os eventos não categorizados (preview, sem gravar)
+async function loadCategorizationSuggestions(events, eventsGrid) {
+    const batchSize = 100;
+    
+    for (let start = 0; start < events.length; start += batchSize) {
+        const batch = events.slice(start, start + batchSize);
+        try {
+            const response = await fetch(`${API_BASE_URL}/categorizar/preview`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ eventos: batch })
+            });
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}`);
+            }
+            const data = await response.json();
+            
+            data.resultados.forEach(resultado => {
+                const card = eventsGrid.querySelector(`[data-evento-id="${CSS.escape(resultado.evento_id_externo)}"]`);
+                if (card) card.appendChild(createSuggestionElement(resultado));
+            });
+        } catch (error) {
+            console.error('Erro ao carregar sugestões de categorização:', error);
+            return;
+        }
+    }
+}
+
+// Criar bloco de sugestão de área de um evento
+function createSuggestionElement(resultado) {
+    const element = document.createElement('div');
+    element.className = 'event-suggestion';
+    
+    if (!resultado.areas.length && !resultado.area_tecnica) {
+        element.innerHTML = '<i class="fas fa-lightbulb"></i> <span>Nenhuma área sugerida</span>';
+        return element;
+    }
+    
+    const areas = resultado.areas.map(area => {
+        const termos = area.termos.map(t => t.termo).join(', ');
+        return `<li><strong>${area.area}</strong> (${area.score.toFixed(2)}) <span class="suggestion-terms">${termos}</span></li>`;
+    }).join('');
+    
+    element.innerHTML = `
+        <div><i class="fas fa-lightbulb"></i> <strong>Sugestão:</strong> ${resultado.area_tecnica || 'abaixo do score mínimo'}
+            ${resultado.origem === 'contexto' ? '<span class="suggestion-terms">(por contexto)</span>' : ''}</div>
+        ${areas ? `<ul>${areas}</ul>` : ''}
+    `;
+    
+    if (resultado.area_tecnica) {
+        const button = document.createElement('button');
+        button.className = 'btn-apply-suggestion';
+        button.textContent = 'Aplicar sugestão';
+        button.addEventListener('click', () => applySuggestion(resultado.evento_id_externo, resultado.area_tecnica));
+        element.appendChild(button);
+    }
+    
+    return element;
+}
+
+// Categorizar o evento com a área sugerida
+async function applySuggestion(eventoId, areaTecnica) {
+    try {
+        const response = await fetch(`${API_BASE_URL}/eventos/${encodeURIComponent(eventoId)}/categorizar`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ area_tecnica: areaTecnica })
+        });
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        showSuccess(`Evento categorizado em ${areaTecnica}`);
+        await showUncategorizedEvents();
+        await updateEventCounts();
+    } catch (error) {
+        console.error('Erro ao categorizar evento:', error);
+        showError('Erro ao categorizar evento.');
+    }
+}
+
 // Carregar eventos não categorizados
 async function loadUncategorizedEvents() {
     try {
@@ -616,10 +687,41 @@ async function refreshData() {
 
 // Configurar atualização automática
 function setupAutoUpdate() {
-    // Atualizar a cada hora
-    updateInterval = setInterval(async () => {
-        await checkForNewEvents();
-    }, 3600000); // 1 hora
+    // Navegadores sem Server-Sent Events continuam consultando a cada hora
+    if (typeof EventSource === 'undefined') {
+        updateInterval = setInterval(async () => {
+            await checkForNewEvents();
+        }, 3600000); // 1 hora
+        return;
+    }
+    
+    // O navegador reconecta sozinho e envia Last-Event-ID para retomar o stream
+    eventStream = new EventSource(`${API_BASE_URL}/eventos/stream`);
+    
+    eventStream.addEventListener('novo', (message) => {
+        const data = JSON.parse(message.data);
+        if (data.evento && !data.evento.evento_canonico) {
+            showNewEventNotification(data.evento);
+        }
+        scheduleStreamRefresh();
+    });
+    eventStream.addEventListener('atualizado', scheduleStreamRefresh);
+    eventStream.addEventListener('removido', scheduleStreamRefresh);
+    
+    // Alterações perdidas (journal podado ou conexão lenta): recarregar tudo
+    eventStream.addEventListener('reset', () => refreshData());
+}
+
+// Agrupar alterações recebidas em sequência em uma única atualização da tela
+function scheduleStreamRefresh() {
+    clearTimeout(streamRefreshTimeout);
+    streamRefreshTimeout = setTimeout(async () => {
+        await updateEventCounts();
+        if (currentArea) {
+            await loadAreaData(currentArea);
+        }
+        updateLastUpdateTime();
+    }, 2000);
 }
 
 // Verificar novos eventos
@@ -809,9 +911,12 @@ function showSuccess(message) {
     alert('Sucesso: ' + message);
 }
 
-// Limpar intervalo ao sair da página
+// Limpar intervalo e stream ao sair da página
 window.addEventListener('beforeunload', () => {
     if (updateInterval) {
         clearInterval(updateInterval);
     }
+    if (eventStream) {
+        eventStream.close();
+    }
 });